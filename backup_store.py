@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+from game_store import JsonFileBackend, write_file_atomic
+from metrics import METRICS
+
+BACKUP_DIR = os.path.join('data', 'backups')
+
+
+class BackupStore:
+    """데이터 스냅샷을 내용 해시로 압축 저장하는 백업 저장소
+
+    objects/<sha256>.json.gz 에 스냅샷을 한 번만 저장하고(같은 내용이면 재사용),
+    index.jsonl 에는 백업 시각/버전/해시를 한 줄씩 기록한다.
+    백업은 별도 스레드에서 처리하므로 저장 요청의 응답 시간에 영향을 주지 않는다.
+    """
+
+    def __init__(self, backup_dir=BACKUP_DIR, keep_recent=10, keep_hourly=24, keep_daily=14, keep_weekly=8):
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, 'objects')
+        self.index_file = os.path.join(backup_dir, 'index.jsonl')
+        # 보존 정책: 최근 N개 + 시간/일/주 단위로 각 구간의 가장 최신 백업 하나씩
+        self.keep_recent = keep_recent
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def start(self):
+        """백업 작업 스레드 시작"""
+        self.thread = threading.Thread(target=self.run, name='backup-store')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def submit(self, data_bytes):
+        """백업할 스냅샷 바이트를 작업 큐에 넣고 바로 반환"""
+        self.queue.put((time.time(), data_bytes))
+
+    def close(self, timeout=5):
+        """남은 백업을 처리하고 작업 스레드 종료"""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            created, data_bytes = item
+            try:
+                with METRICS.time('sync_backup_duration_seconds'):
+                    self.backup(data_bytes, created)
+                    self.prune()
+            except Exception as e:
+                print(f"백업 생성 중 오류: {e}")
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, f'{digest}.json.gz')
+
+    def backup(self, data_bytes, created=None):
+        """스냅샷 한 개 저장. 같은 내용의 객체가 이미 있으면 목록에만 추가"""
+        created = created or time.time()
+        digest = hashlib.sha256(data_bytes).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            write_file_atomic(path, gzip.compress(data_bytes), target='backup')
+            stored = os.path.getsize(path)
+            print(f"백업 생성: {digest[:12]} ({len(data_bytes)} → {stored} bytes)")
+        else:
+            print(f"백업 생성: {digest[:12]} (같은 내용 재사용)")
+
+        try:
+            data = json.loads(data_bytes.decode('utf-8'))
+        except ValueError:
+            data = {}
+        entry = {
+            'created': created,
+            'version': data.get('dataVersion'),
+            'lastUpdated': data.get('lastUpdated', ''),
+            'games': len(data.get('games', [])),
+            'hash': digest,
+            'size': len(data_bytes)
+        }
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return entry
+
+    def list_entries(self):
+        """백업 목록 (오래된 순)"""
+        entries = []
+        if not os.path.exists(self.index_file):
+            return entries
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # 기록 도중 멈춘 마지막 줄은 무시
+                    continue
+        return entries
+
+    def retained(self, entries):
+        """보존 정책에 따라 남길 백업 선택"""
+        newest_first = sorted(entries, key=lambda entry: entry['created'], reverse=True)
+        keep = set(range(min(self.keep_recent, len(newest_first))))
+
+        buckets = [
+            (self.keep_hourly, lambda t: int(t // 3600)),
+            (self.keep_daily, lambda t: datetime.fromtimestamp(t).date()),
+            (self.keep_weekly, lambda t: datetime.fromtimestamp(t).isocalendar()[:2]),
+        ]
+        for limit, bucket_of in buckets:
+            seen = set()
+            for i, entry in enumerate(newest_first):
+                if len(seen) >= limit:
+                    break
+                bucket = bucket_of(entry['created'])
+                if bucket not in seen:
+                    seen.add(bucket)
+                    keep.add(i)
+
+        return sorted((newest_first[i] for i in keep), key=lambda entry: entry['created'])
+
+    def prune(self):
+        """보존 정책에서 벗어난 백업을 목록에서 빼고, 더 이상 참조되지 않는 객체 삭제"""
+        entries = self.list_entries()
+        kept = self.retained(entries)
+        if len(kept) == len(entries):
+            return 0
+
+        lines = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in kept)
+        write_file_atomic(self.index_file, lines.encode('utf-8'), target='backup')
+
+        referenced = {entry['hash'] for entry in kept}
+        removed = 0
+        for name in os.listdir(self.objects_dir):
+            if name.endswith('.json.gz') and name[:-len('.json.gz')] not in referenced:
+                os.remove(os.path.join(self.objects_dir, name))
+                removed += 1
+        print(f"오래된 백업 정리: 목록 {len(entries) - len(kept)}개, 파일 {removed}개 삭제")
+        return removed
+
+    def find(self, target):
+        """'latest', 데이터 버전 번호, 해시 앞부분 중 하나로 백업 찾기 (가장 최근 것 우선)"""
+        entries = self.list_entries()
+        if target == 'latest':
+            return entries[-1] if entries else None
+        for entry in reversed(entries):
+            if target.isdigit() and entry.get('version') == int(target):
+                return entry
+            if len(target) >= 6 and entry['hash'].startswith(target):
+                return entry
+        return None
+
+    def read(self, entry):
+        """백업 스냅샷 바이트 복원 (해시로 손상 여부 확인)"""
+        with open(self.object_path(entry['hash']), 'rb') as f:
+            data_bytes = gzip.decompress(f.read())
+        if hashlib.sha256(data_bytes).hexdigest() != entry['hash']:
+            raise ValueError(f"백업 파일이 손상되었습니다: {entry['hash']}")
+        return data_bytes
+
+
+def restore(store, target, json_file=None, db_file=None):
+    """백업을 JSON 저장 파일(저널은 비움) 또는 SQLite DB로 되돌림"""
+    entry = store.find(target)
+    if entry is None:
+        print(f"❌ 백업을 찾을 수 없습니다: {target}")
+        return False
+    data = json.loads(store.read(entry).decode('utf-8'))
+
+    if db_file:
+        from sqlite_store import SqliteBackend
+        backend = SqliteBackend(db_file)
+        destination = db_file
+    else:
+        backend = JsonFileBackend(json_file)
+        destination = json_file
+
+    # 클라이언트가 되돌린 데이터를 새 변경으로 받아가도록 버전과 시각은 앞으로 진행
+    current_version = backend.load().get('dataVersion', 0) if backend.change_key() is not None else 0
+    data['dataVersion'] = max(data.get('dataVersion', 0), current_version + 1)
+    data['lastUpdated'] = datetime.now().isoformat()
+    backend.write_snapshot(data)
+    print(f"✅ 버전 {entry.get('version')} ({entry.get('lastUpdated')}) 백업을 {destination}에 복원했습니다 "
+          f"(새 버전: {data['dataVersion']})")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='테라포밍 마스 백업 도구')
+    parser.add_argument('--dir', default=BACKUP_DIR, help=f'백업 디렉토리 (기본값: {BACKUP_DIR})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='백업 목록 보기')
+
+    restore_parser = subparsers.add_parser('restore', help='백업을 저장 파일로 되돌리기')
+    restore_parser.add_argument('target', help="'latest', 데이터 버전 번호, 또는 해시 앞부분(6자 이상)")
+    restore_parser.add_argument('--json', default=os.path.join('data', 'game_data.json'))
+    restore_parser.add_argument('--db', help='sqlite 저장 방식이면 DB 파일 경로')
+
+    subparsers.add_parser('prune', help='보존 정책에 따라 오래된 백업 정리')
+
+    args = parser.parse_args()
+    store = BackupStore(args.dir)
+    if args.command == 'list':
+        entries = store.list_entries()
+        for entry in entries:
+            created = datetime.fromtimestamp(entry['created']).strftime('%Y-%m-%d %H:%M:%S')
+            print(f"{created} | 버전 {entry.get('version')} | 게임 {entry.get('games')}개 | {entry['hash'][:12]}")
+        print(f"총 {len(entries)}개 백업")
+    elif args.command == 'restore':
+        if not restore(store, args.target, args.json, args.db):
+            sys.exit(1)
+    elif args.command == 'prune':
+        store.prune()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from date_index import date_ordinal, parse_date_bound
+from game_store import JsonFileBackend, write_file_atomic
+from player_stats import PlayerStatsAggregator, RANK_FIELDS, empty_stats, finish_stats
+
+MAGIC = b'TFMCOL\x00\x01'
+# 매직, 바이트 순서(0=little, 1=big), 게임 수, 결과 수, 섹션 수
+HEADER = struct.Struct('<8sB3xIII')
+# 섹션 이름, array 타입 코드(JSON 섹션은 'j'), 시작 위치, 길이
+SECTION = struct.Struct('<24scQQ')
+ALIGNMENT = 8
+
+# 컬럼으로 저장하는 게임/결과 필드 (이 순서로 복원)
+GAME_FIELDS = ('date', 'map', 'results', 'year', 'id')
+RESULT_FIELDS = ('playerId', 'playerName', 'cubeColor', 'corporation', 'score', 'megacredits', 'rank')
+# 필드가 있는지를 나타내는 비트 (results는 항상 있음)
+GAME_BITS = {'date': 1, 'map': 2, 'year': 4, 'id': 8}
+RESULT_BITS = {field: 1 << i for i, field in enumerate(RESULT_FIELDS)}
+ALL_RESULT_BITS = (1 << len(RESULT_FIELDS)) - 1
+
+INT_RANGES = {
+    'q': (-2 ** 63, 2 ** 63 - 1),
+    'i': (-2 ** 31, 2 ** 31 - 1),
+    'h': (-2 ** 15, 2 ** 15 - 1),
+}
+# 게임 컬럼과 결과 컬럼의 타입 (문자열은 문자열 표의 번호)
+GAME_COLUMNS = {
+    'game_fields': 'B', 'game_date': 'I', 'game_ordinal': 'i', 'game_map': 'I', 'game_year': 'h',
+    'game_id': 'q', 'game_result_start': 'I', 'game_overflow': 'I', 'game_order': 'I'
+}
+RESULT_COLUMNS = {
+    'result_fields': 'B', 'result_player_id': 'q', 'result_player': 'I', 'result_color': 'I',
+    'result_corporation': 'I', 'result_score': 'i', 'result_megacredits': 'i', 'result_rank': 'h'
+}
+STRING_TABLES = ('dates', 'maps', 'players', 'colors', 'corporations')
+
+
+def is_int(value, typecode):
+    low, high = INT_RANGES[typecode]
+    return type(value) is int and low <= value <= high
+
+
+def fits_columns(game):
+    """게임을 컬럼만으로 그대로 복원할 수 있는지 (아니면 원본 JSON을 따로 보관)"""
+    if not isinstance(game, dict) or not isinstance(game.get('results'), list):
+        return False
+    if any(key not in GAME_FIELDS for key in game):
+        return False
+    if not all(isinstance(game[key], str) for key in ('date', 'map') if key in game):
+        return False
+    if 'year' in game and not is_int(game['year'], 'h'):
+        return False
+    if 'id' in game and not is_int(game['id'], 'q'):
+        return False
+    for result in game['results']:
+        if not isinstance(result, dict) or any(key not in RESULT_BITS for key in result):
+            return False
+        if not all(isinstance(result[key], str) for key in ('playerName', 'cubeColor', 'corporation') if key in result):
+            return False
+        if 'playerId' in result and not is_int(result['playerId'], 'q'):
+            return False
+        if not all(is_int(result[key], 'i') for key in ('score', 'megacredits') if key in result):
+            return False
+        if 'rank' in result and not is_int(result['rank'], 'h'):
+            return False
+    return True
+
+
+def as_int(value, typecode):
+    """컬럼에 넣을 정수 (형식이 맞지 않는 값은 0, 원본은 overflow에 보관됨)"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        low, high = INT_RANGES[typecode]
+        return min(high, max(low, int(value)))
+    return 0
+
+
+class StringTable:
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def code(self, value):
+        value = value if isinstance(value, str) else ('' if value is None else str(value))
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def encode_columnar(data):
+    """데이터셋을 컬럼형 스냅샷 바이트로 변환
+
+    플레이어의 gameIds/stats는 게임 기록으로부터 다시 계산되므로 저장하지 않는다.
+    컬럼으로 표현할 수 없는 게임(추가 필드, 숫자가 아닌 점수 등)은 컬럼에도 값을 넣되
+    원본 JSON을 overflow 섹션에 함께 보관해서 그대로 복원한다.
+    """
+    games = data.get('games', [])
+    tables = {name: StringTable() for name in STRING_TABLES}
+    columns = {name: array(typecode) for name, typecode in {**GAME_COLUMNS, **RESULT_COLUMNS}.items()}
+    overflow = []
+
+    for game in games:
+        if not isinstance(game, dict):
+            game = {'results': []}
+        fields = sum(bit for key, bit in GAME_BITS.items() if key in game)
+        columns['game_fields'].append(fields)
+        columns['game_date'].append(tables['dates'].code(game.get('date', '')))
+        columns['game_ordinal'].append(date_ordinal(game.get('date')) if isinstance(game.get('date'), str) else 0)
+        columns['game_map'].append(tables['maps'].code(game.get('map', '')))
+        columns['game_year'].append(as_int(game.get('year'), 'h'))
+        columns['game_id'].append(as_int(game.get('id'), 'q'))
+        columns['game_result_start'].append(len(columns['result_fields']))
+        if fits_columns(game):
+            columns['game_overflow'].append(0)
+        else:
+            overflow.append(game)
+            columns['game_overflow'].append(len(overflow))
+
+        results = game.get('results') if isinstance(game.get('results'), list) else []
+        for result in results:
+            if not isinstance(result, dict):
+                result = {}
+            columns['result_fields'].append(sum(bit for key, bit in RESULT_BITS.items() if key in result))
+            columns['result_player_id'].append(as_int(result.get('playerId'), 'q'))
+            columns['result_player'].append(tables['players'].code(result.get('playerName', '')))
+            columns['result_color'].append(tables['colors'].code(result.get('cubeColor', '')))
+            columns['result_corporation'].append(tables['corporations'].code(result.get('corporation', '')))
+            columns['result_score'].append(as_int(result.get('score'), 'i'))
+            columns['result_megacredits'].append(as_int(result.get('megacredits'), 'i'))
+            columns['result_rank'].append(as_int(result.get('rank'), 'h'))
+    columns['game_result_start'].append(len(columns['result_fields']))
+
+    # 날짜 순 정렬 순서 (같은 날짜는 저장 순서 유지) - 날짜 범위 조회에 사용
+    ordinals = columns['game_ordinal']
+    columns['game_order'] = array('I', sorted(range(len(games)), key=lambda i: (ordinals[i], i)))
+
+    meta = {key: value for key, value in data.items() if key != 'games'}
+    meta['players'] = [
+        {key: value for key, value in player.items() if key not in ('games', 'gameIds', 'stats')}
+        for player in data.get('players', [])
+    ]
+    sections = [
+        ('meta', 'j', json.dumps(meta, ensure_ascii=False).encode('utf-8')),
+        ('strings', 'j', json.dumps({name: tables[name].values for name in STRING_TABLES},
+                                    ensure_ascii=False).encode('utf-8')),
+        ('overflow', 'j', json.dumps(overflow, ensure_ascii=False).encode('utf-8')),
+    ]
+    sections += [(name, column.typecode, column.tobytes()) for name, column in columns.items()]
+
+    header_size = HEADER.size + SECTION.size * len(sections)
+    offset = header_size
+    directory = []
+    body = []
+    for name, typecode, payload in sections:
+        padding = -offset % ALIGNMENT
+        body.append(b'\0' * padding)
+        offset += padding
+        directory.append(SECTION.pack(name.encode('ascii'), typecode.encode('ascii'), offset, len(payload)))
+        body.append(payload)
+        offset += len(payload)
+
+    byte_order = 0 if sys.byteorder == 'little' else 1
+    header = HEADER.pack(MAGIC, byte_order, len(games), len(columns['result_fields']), len(sections))
+    return b''.join([header] + directory + body)
+
+
+def write_columnar(path, data):
+    """컬럼형 스냅샷 파일을 원자적으로 저장하고 파일 크기 반환"""
+    payload = encode_columnar(data)
+    write_file_atomic(path, payload)
+    return len(payload)
+
+
+class ColumnarSnapshot:
+    """컬럼형 스냅샷 읽기 (파일은 mmap으로 열어서 필요한 컬럼만 페이지 단위로 읽힘)
+
+    컬럼은 복사하지 않은 memoryview이고, 결과 한 건마다 dict를 만들지 않고 집계할 수 있다.
+    게임 dict가 필요하면 game(i) / iter_games() / to_data()로 만든다.
+    """
+
+    def __init__(self, buffer, closer=None):
+        self.buffer = memoryview(buffer)
+        self.closer = closer
+        magic, byte_order, self.game_count, self.result_count, section_count = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("컬럼형 스냅샷 파일이 아닙니다")
+        swap = byte_order != (0 if sys.byteorder == 'little' else 1)
+
+        self.sections = {}
+        self.columns = {}
+        for i in range(section_count):
+            name, typecode, offset, length = SECTION.unpack_from(self.buffer, HEADER.size + SECTION.size * i)
+            name = name.rstrip(b'\0').decode('ascii')
+            typecode = typecode.decode('ascii')
+            view = self.buffer[offset:offset + length]
+            if typecode == 'j':
+                self.sections[name] = view
+            elif swap:
+                # 다른 바이트 순서로 만든 파일은 이 컬럼만 복사해서 뒤집음
+                column = array(typecode, view.tobytes())
+                column.byteswap()
+                self.columns[name] = memoryview(column)
+            else:
+                self.columns[name] = view.cast(typecode)
+
+        strings = json.loads(bytes(self.sections['strings']).decode('utf-8'))
+        for name in STRING_TABLES:
+            setattr(self, name, strings[name])
+        self._meta = None
+        self._overflow = None
+
+    @classmethod
+    def open(cls, path):
+        f = open(path, 'rb')
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            f.close()
+            raise
+
+        def close():
+            mapped.close()
+            f.close()
+        return cls(mapped, close)
+
+    @classmethod
+    def from_data(cls, data):
+        """메모리 안의 데이터셋으로 만든 스냅샷 (JSON 파일을 같은 방식으로 분석할 때)"""
+        return cls(encode_columnar(data))
+
+    def close(self):
+        # mmap을 닫기 전에 그 위에 만든 memoryview를 모두 놓아야 함
+        self.columns = {}
+        self.sections = {}
+        self.buffer.release()
+        if self.closer is not None:
+            self.closer()
+            self.closer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def meta(self):
+        """게임을 제외한 나머지 필드 (players, lastUpdated, dataVersion 등)"""
+        if self._meta is None:
+            self._meta = json.loads(bytes(self.sections['meta']).decode('utf-8'))
+        return self._meta
+
+    def overflow_game(self, number):
+        if self._overflow is None:
+            self._overflow = json.loads(bytes(self.sections['overflow']).decode('utf-8'))
+        return self._overflow[number - 1]
+
+    def game(self, index):
+        """게임 한 건을 원래 모양의 dict로 만듦"""
+        columns = self.columns
+        overflow = columns['game_overflow'][index]
+        if overflow:
+            return self.overflow_game(overflow)
+
+        players, colors, corporations = self.players, self.colors, self.corporations
+        player_ids, player_codes = columns['result_player_id'], columns['result_player']
+        color_codes, corporation_codes = columns['result_color'], columns['result_corporation']
+        scores, megacredits, ranks = columns['result_score'], columns['result_megacredits'], columns['result_rank']
+        result_fields = columns['result_fields']
+
+        results = []
+        for i in range(columns['game_result_start'][index], columns['game_result_start'][index + 1]):
+            if result_fields[i] == ALL_RESULT_BITS:
+                results.append({
+                    'playerId': player_ids[i],
+                    'playerName': players[player_codes[i]],
+                    'cubeColor': colors[color_codes[i]],
+                    'corporation': corporations[corporation_codes[i]],
+                    'score': scores[i],
+                    'megacredits': megacredits[i],
+                    'rank': ranks[i]
+                })
+                continue
+            values = (player_ids[i], players[player_codes[i]], colors[color_codes[i]],
+                      corporations[corporation_codes[i]], scores[i], megacredits[i], ranks[i])
+            results.append({
+                field: value for field, value in zip(RESULT_FIELDS, values) if result_fields[i] & RESULT_BITS[field]
+            })
+
+        fields = columns['game_fields'][index]
+        values = {
+            'date': self.dates[columns['game_date'][index]],
+            'map': self.maps[columns['game_map'][index]],
+            'results': results,
+            'year': columns['game_year'][index],
+            'id': columns['game_id'][index]
+        }
+        return {field: values[field] for field in GAME_FIELDS if field == 'results' or fields & GAME_BITS[field]}
+
+    def iter_games(self, indexes=None):
+        for index in (range(self.game_count) if indexes is None else indexes):
+            yield self.game(index)
+
+    def to_data(self):
+        """전체 데이터셋 복원 (플레이어 통계와 gameIds는 게임 기록으로부터 다시 계산)"""
+        data = dict(self.meta)
+        data['players'] = [dict(player) for player in self.meta.get('players', [])]
+        data['games'] = list(self.iter_games())
+        return PlayerStatsAggregator().rebuild(data)
+
+    def iter_results(self):
+        """결과마다 (게임 번호, 플레이어, 기업, 점수, 메가크레딧, 순위) 튜플 (dict를 만들지 않음)"""
+        columns = self.columns
+        starts = columns['game_result_start']
+        players, corporations = self.players, self.corporations
+        player_codes, corporation_codes = columns['result_player'], columns['result_corporation']
+        scores, megacredits, ranks = columns['result_score'], columns['result_megacredits'], columns['result_rank']
+        for index in range(self.game_count):
+            for i in range(starts[index], starts[index + 1]):
+                yield (index, players[player_codes[i]], corporations[corporation_codes[i]],
+                       scores[i], megacredits[i], ranks[i])
+
+    def game_map(self, index):
+        return self.maps[self.columns['game_map'][index]]
+
+    def game_year(self, index):
+        return self.columns['game_year'][index] if self.columns['game_fields'][index] & GAME_BITS['year'] else None
+
+    def player_stats(self, indexes=None):
+        """결과 컬럼만으로 계산한 이름별 플레이어 통계 (player_stats.py와 같은 형식)
+
+        indexes를 주면 그 게임들의 결과만 집계한다.
+        """
+        columns = self.columns
+        starts = columns['game_result_start']
+        player_codes, scores, ranks = columns['result_player'], columns['result_score'], columns['result_rank']
+        if indexes is None:
+            positions = range(self.result_count)
+        else:
+            positions = (i for index in indexes for i in range(starts[index], starts[index + 1]))
+        stats = [empty_stats() for _ in self.players]
+        for i in positions:
+            player = stats[player_codes[i]]
+            player['totalGames'] += 1
+            player['totalScore'] += scores[i]
+            field = RANK_FIELDS.get(ranks[i])
+            if field:
+                player[field] += 1
+        for player in stats:
+            finish_stats(player)
+        return {name: player for name, player in zip(self.players, stats) if player['totalGames']}
+
+    def games_between(self, start=None, end=None):
+        """날짜 서수 범위 [start, end](양끝 포함)의 게임 번호를 날짜 순으로 반환"""
+        order = self.columns['game_order']
+        ordinals = self.columns['game_ordinal']
+        low = 0 if start is None else bisect_left(order, start, key=lambda index: ordinals[index])
+        high = len(order) if end is None else bisect_right(order, end, key=lambda index: ordinals[index])
+        return list(order[low:high])
+
+
+class ColumnarFileBackend(JsonFileBackend):
+    """컬럼형 스냅샷(game_data.tfmc) + 저널에 저장하는 방식
+
+    저널 형식과 복원 방식은 JsonFileBackend와 같고, 스냅샷 파일만 컬럼형이다.
+    """
+
+    name = 'columnar'
+
+    def __init__(self, data_file):
+        super().__init__(data_file)
+        # json 저장 방식의 game_data.journal과 섞이지 않도록 저널 이름을 따로 씀
+        self.journal_file = data_file + '.journal'
+
+    def read_snapshot(self):
+        with ColumnarSnapshot.open(self.data_file) as snapshot:
+            return snapshot.to_data()
+
+    def write_snapshot_file(self, data, data_bytes=None):
+        write_columnar(self.data_file, data)
+
+
+def format_size(size):
+    return f'{size / 1024 / 1024:.1f}MB' if size >= 1024 * 1024 else f'{size / 1024:.1f}KB'
+
+
+def build(json_file, output):
+    # 저널에 남아 있는 변경까지 반영한 데이터로 변환
+    data = JsonFileBackend(json_file).load()
+    size = write_columnar(output, data)
+    with ColumnarSnapshot.open(output) as snapshot:
+        overflow = sum(1 for i in range(snapshot.game_count) if snapshot.columns['game_overflow'][i])
+        print(f"✅ {output} 저장 완료: 게임 {snapshot.game_count}개, 결과 {snapshot.result_count}개 "
+              f"({format_size(os.path.getsize(json_file))} → {format_size(size)}, 원본 JSON 보관 게임 {overflow}개)")
+
+
+def export(columnar_file, output):
+    with ColumnarSnapshot.open(columnar_file) as snapshot:
+        data = snapshot.to_data()
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    print(f"✅ {output} 저장 완료: 게임 {len(data['games'])}개, 플레이어 {len(data['players'])}명")
+
+
+def info(columnar_file, date_from=None, date_to=None):
+    """파일 정보와 (날짜 범위 안의) 플레이어 통계. 결과 dict 없이 컬럼만으로 계산"""
+    started = time.perf_counter()
+    with ColumnarSnapshot.open(columnar_file) as snapshot:
+        opened = time.perf_counter() - started
+        print(f"📦 {columnar_file}: 게임 {snapshot.game_count}개, 결과 {snapshot.result_count}개, "
+              f"플레이어 {len(snapshot.players)}명, 기업 {len(snapshot.corporations)}개, 맵 {len(snapshot.maps)}개 "
+              f"(여는 데 {opened * 1000:.1f}ms)")
+        indexes = None
+        if date_from or date_to:
+            indexes = snapshot.games_between(
+                parse_date_bound(date_from) if date_from else None,
+                parse_date_bound(date_to) if date_to else None
+            )
+            print(f"📅 {date_from or '처음'} ~ {date_to or '끝'}: 게임 {len(indexes)}개")
+        stats = snapshot.player_stats(indexes)
+        for name, player in sorted(stats.items(), key=lambda item: (item[1]['wins'], item[1]['averageScore']), reverse=True):
+            print(f"   {name:8s} | {player['totalGames']:4d}게임 | {player['wins']:3d}승 | 평균 {player['averageScore']:5.1f}점")
+        print(f"⏱️  전체 {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='테라포밍 마스 컬럼형 스냅샷 도구')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='JSON 데이터(저장 파일, 레거시 내보내기)를 컬럼형으로 변환')
+    build_parser.add_argument('json_file')
+    build_parser.add_argument('-o', '--output', help='출력 파일 (기본값: 입력 파일 이름.tfmc)')
+
+    export_parser = subparsers.add_parser('export', help='컬럼형 스냅샷을 JSON으로 내보내기')
+    export_parser.add_argument('columnar_file')
+    export_parser.add_argument('-o', '--output', required=True)
+
+    info_parser = subparsers.add_parser('info', help='파일 정보와 플레이어 통계 (mmap으로 바로 조회)')
+    info_parser.add_argument('columnar_file')
+    info_parser.add_argument('--from', dest='date_from', help='YYYY-MM-DD')
+    info_parser.add_argument('--to', dest='date_to', help='YYYY-MM-DD')
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        build(args.json_file, args.output or os.path.splitext(args.json_file)[0] + '.tfmc')
+    elif args.command == 'export':
+        export(args.columnar_file, args.output)
+    elif args.command == 'info':
+        info(args.columnar_file, args.date_from, args.date_to)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import date
+
+from game_store import game_key, normalize_game_date
+from rankings import normalize_corporation
+
+# 날짜를 알 수 없는 게임은 가장 앞(서수 0)에 둠
+UNKNOWN_DATE = 0
+
+
+def date_ordinal(date_str):
+    """게임 날짜 문자열을 정렬 가능한 서수(date.toordinal)로 변환. 알 수 없으면 0"""
+    date_key = normalize_game_date(date_str)
+    if not date_key:
+        return UNKNOWN_DATE
+    try:
+        return date.fromisoformat(date_key).toordinal()
+    except ValueError:
+        return UNKNOWN_DATE
+
+
+def id_order(key):
+    """같은 날짜 안의 정렬 키 (숫자 id는 숫자 순, 그 외는 문자열 순으로 숫자 뒤에)"""
+    if isinstance(key, (int, float)) and not isinstance(key, bool):
+        return (0, key)
+    return (1, str(key))
+
+
+def encode_cursor(entry):
+    """페이지 커서 문자열 ("서수-n<숫자 id>" 또는 "서수-s<문자열 id>")
+
+    데이터 안의 위치 대신 게임 id를 쓰므로, 페이지 사이에 전체 저장으로 색인이 다시 만들어져도 이어서 조회할 수 있다.
+    """
+    kind, key = entry[1]
+    return f"{entry[0]}-{'n' if kind == 0 else 's'}{key}"
+
+
+def decode_cursor(cursor):
+    """커서 문자열을 (서수, id 정렬 키)로. 형식이 틀리면 ValueError"""
+    ordinal, key = cursor.split('-', 1)
+    if key.startswith('n'):
+        number = key[1:]
+        return int(ordinal), (0, int(number) if number.lstrip('-').isdigit() else float(number))
+    if key.startswith('s'):
+        return int(ordinal), (1, key[1:])
+    raise ValueError(cursor)
+
+
+def secondary_keys(game):
+    """보조 색인 키: (종류, 값) 목록"""
+    keys = {('map', game.get('map') or '')}
+    for result in game.get('results', []):
+        keys.add(('player', result.get('playerName')))
+        corporation = normalize_corporation(result.get('corporation'))
+        if corporation:
+            keys.add(('corporation', corporation))
+    return keys
+
+
+def parse_date_bound(value):
+    """쿼리의 날짜(YYYY-MM-DD 등)를 서수로 변환. 형식이 틀리면 ValueError"""
+    ordinal = date_ordinal(value)
+    if ordinal == UNKNOWN_DATE:
+        raise ValueError(value)
+    return ordinal
+
+
+class DateIndex:
+    """게임을 날짜 서수 순으로 정렬해 둔 색인 (GameStore.add_index로 등록)
+
+    날짜는 게임이 들어올 때 한 번만 해석하고, 범위 조회는 이분 탐색으로
+    O(log n + k)에 끝낸다. 같은 날짜의 게임은 게임 id 순으로 정렬한다.
+    플레이어/맵/기업별로도 같은 순서의 목록(보조 색인)을 유지해서 필터 조회에 사용한다.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.secondary = defaultdict(list)
+        self.games = {}
+        self.game_keys = {}
+        self.positions = {}
+        self.object_keys = {}
+        self.next_seq = 0
+
+    def rebuild(self, data):
+        self.entries = []
+        self.secondary = defaultdict(list)
+        self.games = {}
+        self.game_keys = {}
+        self.positions = {}
+        # 게임 객체 → 키 (id가 없는 게임은 위치로 키를 만들었으므로 삭제할 때 같은 키를 찾을 수 있도록)
+        self.object_keys = {}
+        for index, game in enumerate(data.get('games', [])):
+            key = game_key(game, index)
+            self.object_keys[id(game)] = key
+            entry = (date_ordinal(game.get('date')), id_order(key), key)
+            self.entries.append(entry)
+            self.game_keys[key] = secondary_keys(game)
+            for secondary_key in self.game_keys[key]:
+                self.secondary[secondary_key].append(entry)
+            self.games[key] = game
+            self.positions[key] = entry
+        self.entries.sort()
+        for entries in self.secondary.values():
+            entries.sort()
+        self.next_seq = len(self.entries)
+
+    def apply_game(self, old_game, new_game):
+        if old_game is not None:
+            key = self.object_keys.pop(id(old_game), None)
+            entry = self.positions.pop(key, None)
+            if entry is not None:
+                del self.entries[bisect_left(self.entries, entry)]
+                del self.games[key]
+                for secondary_key in self.game_keys.pop(key):
+                    entries = self.secondary[secondary_key]
+                    del entries[bisect_left(entries, entry)]
+                    if not entries:
+                        del self.secondary[secondary_key]
+        if new_game is not None:
+            # id가 없는 오래된 게임만 순번으로 구분
+            key = game_key(new_game, self.next_seq)
+            self.next_seq += 1
+            self.object_keys[id(new_game)] = key
+            entry = (date_ordinal(new_game.get('date')), id_order(key), key)
+            insort(self.entries, entry)
+            self.game_keys[key] = secondary_keys(new_game)
+            for secondary_key in self.game_keys[key]:
+                insort(self.secondary[secondary_key], entry)
+            self.games[key] = new_game
+            self.positions[key] = entry
+
+    def _bounds(self, start=None, end=None):
+        """서수 범위 [start, end]에 해당하는 entries 위치 범위"""
+        low = 0 if start is None else bisect_left(self.entries, (start,))
+        high = len(self.entries) if end is None else bisect_right(self.entries, (end + 1,))
+        return low, high
+
+    def range(self, start=None, end=None, newest_first=False):
+        """서수 범위 [start, end](양끝 포함)의 게임을 날짜 순으로 반환"""
+        low, high = self._bounds(start, end)
+        entries = self.entries[low:high]
+        if newest_first:
+            entries.reverse()
+        return [self.games[key] for _, _, key in entries]
+
+    def page(self, filters=(), start=None, end=None, cursor=None, limit=20):
+        """최신 게임부터 limit개와 다음 페이지 커서(없으면 None) 반환
+
+        filters는 ('player'|'map'|'corporation', 값) 목록. 가장 짧은 보조 색인 목록을
+        cursor 위치부터 거꾸로 훑으면서 나머지 조건을 확인하므로 전체 기록 수와 무관하게
+        한 페이지를 찾는 데 필요한 만큼만 본다.
+        """
+        candidates = [self.secondary.get(key, []) for key in filters]
+        entries = min(candidates, key=len) if candidates else self.entries
+
+        low = 0 if start is None else bisect_left(entries, (start,))
+        high = len(entries) if end is None else bisect_right(entries, (end + 1,))
+        if cursor is not None:
+            high = min(high, bisect_left(entries, cursor))
+
+        games = []
+        position = high - 1
+        while position >= low and len(games) < limit:
+            entry = entries[position]
+            if all(key in self.game_keys[entry[2]] for key in filters):
+                games.append(entry)
+            position -= 1
+
+        # 이 페이지 뒤에 조건에 맞는 게임이 더 있을 수 있으면 커서 제공
+        next_cursor = encode_cursor(games[-1]) if len(games) == limit and position >= low else None
+        return [self.games[key] for _, _, key in games], next_cursor
+
+    def count(self, start=None, end=None):
+        low, high = self._bounds(start, end)
+        return high - low
+
+    def year_range(self, year):
+        """해당 연도 1월 1일 ~ 12월 31일의 서수 범위"""
+        return date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+
+    def years(self):
+        """게임이 있는 연도 목록 (오름차순)"""
+        years = []
+        position = bisect_left(self.entries, (UNKNOWN_DATE + 1,))
+        while position < len(self.entries):
+            year = date.fromordinal(self.entries[position][0]).year
+            years.append(year)
+            position = bisect_left(self.entries, (date(year + 1, 1, 1).toordinal(),))
+        return years
+
+    def year_summaries(self, data=None):
+        """연도별 게임 수, 참여 플레이어 수, 첫/마지막 게임 날짜"""
+        summaries = []
+        for year in self.years():
+            games = self.range(*self.year_range(year))
+            players = {result.get('playerName') for game in games for result in game.get('results', [])}
+            summaries.append({
+                'year': year,
+                'games': len(games),
+                'players': len(players),
+                'firstDate': games[0].get('date'),
+                'lastDate': games[-1].get('date')
+            })
+        return {'years': summaries}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Excel 파싱 벤치마크
+
+임시 디렉토리에 시트 길이가 다른 가상 워크북을 만들고, 셀을 하나씩 읽는 예전 파서
+(parse_game_data_by_cell)와 iter_rows로 한 번만 읽는 파서(parse_game_data)의
+시간을 비교한다. 두 파서의 결과가 같은지도 확인한다.
+
+    python3 excel_benchmark.py --games 50 100 200 2000 20000 --by-cell-max-games 200
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from openpyxl import Workbook
+
+from excel_parser import load_workbook, parse_game_data, parse_game_data_by_cell, sheet_start_date
+
+PLAYERS = ['강보석', '김기훈', '이연로']
+MAPS = ['타르시스', '헬라스', '엘리시움', 'Utopia Planitia']
+CORPORATIONS = ['CREDICOR', 'ECOLINE', 'HELION', 'INVENTRIX', 'MINING GUILD', 'PHOBOLOG', 'THARSIS REPUBLIC', 'THORGATE']
+
+
+def make_workbook(path, games, seed):
+    """games개 게임이 들어 있는 시트 하나짜리 워크북 (중간중간 날짜 행과 빈 행 포함)"""
+    rng = random.Random(seed)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = 'TFM'
+    day = datetime(2020, 1, 4)
+    sheet.append([day])
+    sheet.append([])
+    sheet.append([None] + PLAYERS)
+    for number in range(1, games + 1):
+        # 하루에 몇 게임씩 하고 날짜가 바뀜
+        if rng.random() < 0.3:
+            day += timedelta(days=rng.randint(1, 14))
+            sheet.append([day])
+        sheet.append([f'{number} set'] + rng.sample(CORPORATIONS, len(PLAYERS)))
+        scores = []
+        for _ in PLAYERS:
+            score = rng.randint(50, 140)
+            # 동점 판정용 메가크레딧이 적힌 칸은 "98(21)" 형식
+            scores.append(f'{score}({rng.randint(0, 60)})' if rng.random() < 0.3 else score)
+        sheet.append([rng.choice(MAPS)] + scores)
+        if rng.random() < 0.1:
+            sheet.append([])
+    workbook.save(path)
+
+
+def time_parser(parser, path, repeat):
+    """가장 빠른 실행 시간과 결과"""
+    best = None
+    for _ in range(repeat):
+        workbook = load_workbook(path, read_only=True)
+        try:
+            worksheet = workbook['TFM']
+            started = time.perf_counter()
+            games = parser(worksheet, sheet_start_date(worksheet, 2020), 2020)
+            elapsed = time.perf_counter() - started
+        finally:
+            workbook.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, games
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Excel 파서 벤치마크 (셀 단위 읽기 vs iter_rows)')
+    parser.add_argument('--games', type=int, nargs='+', default=[25, 50, 100, 2000, 20000],
+                        help='시트 하나에 넣을 게임 수 목록 (기본: 25 50 100 2000 20000)')
+    parser.add_argument('--by-cell-max-games', type=int, default=100,
+                        help='예전 파서는 이 게임 수까지만 측정 (행 수의 제곱에 비례해서 느려짐, 기본: 100)')
+    parser.add_argument('--repeat', type=int, default=1, help='크기마다 반복 횟수, 가장 빠른 값 사용 (기본: 1)')
+    parser.add_argument('--seed', type=int, default=1, help='가상 데이터 난수 시드 (기본: 1)')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix='tfm-excel-')
+    try:
+        print(f"{'게임':>6s} | {'행':>6s} | {'셀 단위':>10s} | {'iter_rows':>10s} | {'배율':>7s}")
+        print("-" * 52)
+        for games in args.games:
+            path = os.path.join(workdir, f'tfm_{games}.xlsx')
+            make_workbook(path, games, args.seed)
+            workbook = load_workbook(path, read_only=True)
+            rows = workbook['TFM'].max_row
+            workbook.close()
+
+            streaming, new_games = time_parser(parse_game_data, path, args.repeat)
+            if len(new_games) != games:
+                print(f"❌ {games}게임: {len(new_games)}게임만 파싱되었습니다")
+                continue
+            if games > args.by_cell_max_games:
+                print(f"{games:6d} | {rows:6d} | {'-':>10s} | {streaming * 1000:8.1f}ms | {'-':>7s}")
+                continue
+
+            by_cell, old_games = time_parser(parse_game_data_by_cell, path, args.repeat)
+            if old_games != new_games:
+                print(f"❌ {games}게임: 두 파서의 결과가 다릅니다")
+                continue
+            print(f"{games:6d} | {rows:6d} | {by_cell * 1000:8.1f}ms | {streaming * 1000:8.1f}ms | "
+                  f"{by_cell / streaming:6.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
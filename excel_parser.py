@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+import glob
 import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import os
 import sys
@@ -12,118 +17,167 @@ except ImportError:
     print("openpyxl이 설치되어 있지 않습니다. 설치해주세요: pip install openpyxl")
     sys.exit(1)
 
+DEFAULT_OUTPUT = 'terraforming_mars_legacy.json'
+# 파일 이름에서 연도를 찾는 패턴 (예: 2020_TFM.xlsx, 20190222-24_TFM.xlsx)
+YEAR_PATTERN = re.compile(r'(19|20)\d{2}')
+
+def row_value(row, column):
+    """행 값 튜플에서 column(1부터)번째 값. 행이 짧으면 None"""
+    return row[column - 1] if column <= len(row) else None
+
+def read_players(row):
+    """플레이어 이름 행(보통 3행)의 B, C, D 열"""
+    players = []
+    for col in range(2, 5):
+        cell_value = row_value(row, col)
+        if cell_value and str(cell_value).strip():
+            players.append(str(cell_value).strip())
+    return players
+
+def split_score(score_cell):
+    """점수 셀을 (점수, 메가크레딧)으로 분리 (예: "98(21)" -> 98, 21)"""
+    if not score_cell:
+        return 0, 0
+    score_str = str(score_cell)
+    if '(' in score_str and ')' in score_str:
+        return int(score_str.split('(')[0]), int(score_str.split('(')[1].split(')')[0])
+    return (int(float(score_str)) if score_str.replace('.', '').isdigit() else 0), 0
+
+def build_game(players, set_row, score_row, date_str, year):
+    """세트 행(기업)과 다음 행(맵, 점수)으로 게임 한 건 생성"""
+    # 기업 정보 (세트 행)
+    corporations = []
+    for col in range(2, len(players) + 2):
+        corp = row_value(set_row, col)
+        corporations.append(str(corp).strip() if corp else "")
+    
+    # 맵 이름과 점수 (다음 행)
+    map_cell = row_value(score_row, 1)
+    map_name = str(map_cell).strip() if map_cell else ""
+    
+    player_results = []
+    for i, player in enumerate(players):
+        score, mc = split_score(row_value(score_row, i + 2))
+        player_results.append({
+            'player': player,
+            'corporation': corporations[i],
+            'score': score,
+            'megacredits': mc
+        })
+    
+    # 점수와 메가크레딧으로 정렬 (동점시 메가크레딧)
+    player_results.sort(key=lambda x: (x['score'], x['megacredits']), reverse=True)
+    
+    # 게임 데이터 생성
+    game_results = []
+    for rank, result in enumerate(player_results, 1):
+        game_results.append({
+            'playerId': hash(result['player']) % 1000000,  # 임시 ID
+            'playerName': result['player'],
+            'cubeColor': ['red', 'green', 'yellow', 'blue'][rank-1] if rank <= 4 else 'black',
+            'corporation': result['corporation'],
+            'score': result['score'],
+            'megacredits': result['megacredits'],
+            'rank': rank
+        })
+    
+    return {
+        'date': date_str,
+        'map': normalize_map_name(map_name),
+        'results': game_results,
+        'year': year
+    }
+
+def parse_game_rows(rows, initial_date_str, year):
+    """1행부터의 행 값 튜플을 한 번만 읽으며 게임 데이터를 파싱 (시트 중간에 날짜가 있는 경우도 처리)
+
+    - 3행: 플레이어 이름
+    - 날짜 셀(A열이 datetime): 이후 게임의 날짜
+    - A열에 "set"이 있는 행: 기업, 바로 다음 행: 맵과 점수 (다음 행은 내용과 관계없이 점수 행으로 읽음)
+    """
+    games = []
+    current_date_str = initial_date_str
+    players = []
+    set_row = None
+    
+    for row_number, row in enumerate(rows, 1):
+        if row_number < 3:
+            continue
+        if row_number == 3:
+            players = read_players(row)
+            if len(players) < 2:
+                return games
+            continue
+        
+        # 세트 행 다음 행은 맵과 점수
+        if set_row is not None:
+            games.append(build_game(players, set_row, row, current_date_str, year))
+            set_row = None
+            continue
+        
+        cell_a = row_value(row, 1)
+        # 날짜 셀인지 확인 (datetime 객체인 경우)
+        if cell_a and hasattr(cell_a, 'strftime'):
+            current_date_str = cell_a.strftime('%Y. %m. %d.')
+            continue
+        
+        # 세트 정보 확인
+        if cell_a and 'set' in str(cell_a).lower():
+            set_row = row
+    
+    return games
+
 def parse_game_data(worksheet, initial_date_str, year):
-    """워크시트에서 게임 데이터를 파싱 (시트 중간에 날짜가 있는 경우도 처리)"""
+    """워크시트를 iter_rows로 한 번만 읽어서 게임 데이터를 파싱"""
+    return parse_game_rows(worksheet.iter_rows(values_only=True), initial_date_str, year)
+
+def parse_game_data_by_cell(worksheet, initial_date_str, year):
+    """예전 방식: worksheet.cell()로 셀을 하나씩 읽어서 파싱 (excel_benchmark.py 비교용)
+
+    read_only 모드에서는 cell() 호출마다 시트 XML을 처음부터 다시 읽으므로 행 수의 제곱에 비례해서 느려진다.
+    """
     games = []
     current_date_str = initial_date_str
     
-    # 플레이어 이름 찾기 (보통 3행에 있음)
-    players = []
-    for col in range(2, 5):  # B, C, D 열
-        cell_value = worksheet.cell(row=3, column=col).value
-        if cell_value and str(cell_value).strip():
-            players.append(str(cell_value).strip())
+    def read_row(row):
+        return tuple(worksheet.cell(row=row, column=col).value for col in range(1, 6))
     
+    players = read_players(read_row(3))
     if len(players) < 2:
         return games
     
-    # 게임 데이터 파싱
     current_row = 4
     max_row = worksheet.max_row
     
     while current_row <= max_row:
         cell_a = worksheet.cell(row=current_row, column=1).value
         
-        # 날짜 셀인지 확인 (datetime 객체인 경우)
         if cell_a and hasattr(cell_a, 'strftime'):
             current_date_str = cell_a.strftime('%Y. %m. %d.')
             current_row += 1
             continue
         
-        # 세트 정보 확인
-        set_info = cell_a
-        if not set_info or 'set' not in str(set_info).lower():
+        if not cell_a or 'set' not in str(cell_a).lower():
             current_row += 1
             continue
         
-        # 기업 정보 (현재 행)
-        corporations = []
-        for col in range(2, len(players) + 2):
-            corp = worksheet.cell(row=current_row, column=col).value
-            corporations.append(str(corp).strip() if corp else "")
-        
-        # 맵과 점수 정보 (다음 행)
+        set_row = read_row(current_row)
         current_row += 1
         if current_row > max_row:
             break
-            
-        map_name = ""
-        scores = []
-        megacredits = []
-        
-        # 맵 이름과 점수 파싱
-        map_cell = worksheet.cell(row=current_row, column=1).value
-        if map_cell:
-            map_name = str(map_cell).strip()
-        
-        for col in range(2, len(players) + 2):
-            score_cell = worksheet.cell(row=current_row, column=col).value
-            if score_cell:
-                score_str = str(score_cell)
-                # 점수와 메가크레딧 분리 (예: "98(21)" -> 점수: 98, MC: 21)
-                if '(' in score_str and ')' in score_str:
-                    score = int(score_str.split('(')[0])
-                    mc = int(score_str.split('(')[1].split(')')[0])
-                else:
-                    score = int(float(score_str)) if score_str.replace('.', '').isdigit() else 0
-                    mc = 0
-                scores.append(score)
-                megacredits.append(mc)
-            else:
-                scores.append(0)
-                megacredits.append(0)
-        
-        # 순위 계산 (점수 기준, 동점시 메가크레딧)
-        player_results = []
-        for i, player in enumerate(players):
-            if i < len(scores):
-                player_results.append({
-                    'player': player,
-                    'corporation': corporations[i] if i < len(corporations) else "",
-                    'score': scores[i],
-                    'megacredits': megacredits[i]
-                })
-        
-        # 점수와 메가크레딧으로 정렬
-        player_results.sort(key=lambda x: (x['score'], x['megacredits']), reverse=True)
-        
-        # 게임 데이터 생성
-        game_results = []
-        for rank, result in enumerate(player_results, 1):
-            game_results.append({
-                'playerId': hash(result['player']) % 1000000,  # 임시 ID
-                'playerName': result['player'],
-                'cubeColor': ['red', 'green', 'yellow', 'blue'][rank-1] if rank <= 4 else 'black',
-                'corporation': result['corporation'],
-                'score': result['score'],
-                'megacredits': result['megacredits'],
-                'rank': rank
-            })
-        
-        # 맵 이름 정규화
-        map_normalized = normalize_map_name(map_name)
-        
-        games.append({
-            'date': current_date_str,
-            'map': map_normalized,
-            'results': game_results,
-            'year': year
-        })
-        
+        games.append(build_game(players, set_row, read_row(current_row), current_date_str, year))
         current_row += 1
     
     return games
 
+def sheet_start_date(worksheet, year):
+    """시트 첫 번째 셀의 날짜 (없으면 그 해 1월 1일)"""
+    first_row = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+    date_cell = row_value(first_row, 1)
+    if date_cell and hasattr(date_cell, 'strftime'):
+        return date_cell.strftime('%Y. %m. %d.')
+    return f"{year}. 01. 01."
+
 def normalize_map_name(map_name):
     """맵 이름 정규화"""
     map_name = map_name.lower()
@@ -142,104 +196,139 @@ def normalize_map_name(map_name):
     else:
         return 'THARSIS'  # 기본값
 
-def parse_tfm_excel_files():
-    """테라포밍 마스 Excel 파일들을 파싱해서 레거시 데이터 생성"""
+def file_year(path):
+    """파일 이름의 첫 네 자리 연도 (예: 20190222-24_TFM.xlsx -> 2019). 없으면 None"""
+    match = YEAR_PATTERN.search(os.path.basename(path))
+    return int(match.group(0)) if match else None
+
+def expand_inputs(patterns):
+    """입력 glob 목록을 파일 경로 목록으로 (패턴 순서대로, 패턴 안에서는 이름 순, 중복 제거)"""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern))) or [pattern]
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+def list_sheets(path):
+    """파싱할 시트 이름 목록 (Online 탭과 이름 없는 탭 제외)"""
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return [
+            sheet_name for sheet_name in workbook.sheetnames
+            if 'online' not in sheet_name.lower() and sheet_name.strip()
+        ]
+    finally:
+        workbook.close()
+
+def parse_sheet(task):
+    """시트 하나 파싱 (프로세스 풀 작업 단위). (순서 키, 게임 목록, 소요 시간, 오류) 반환"""
+    order, path, sheet_name, year = task
+    started = time.perf_counter()
+    try:
+        workbook = load_workbook(path, read_only=True)
+        try:
+            worksheet = workbook[sheet_name]
+            games = parse_game_data(worksheet, sheet_start_date(worksheet, year), year)
+        finally:
+            workbook.close()
+        return order, games, time.perf_counter() - started, None
+    except Exception as e:
+        return order, [], time.perf_counter() - started, str(e)
+
+def parse_tfm_excel_files(patterns, output_file, workers=None, year=None):
+    """테라포밍 마스 Excel 파일들을 시트 단위로 병렬 파싱해서 레거시 데이터 생성
+
+    게임 순서와 id는 작업이 끝난 순서와 관계없이 (입력 파일 순서, 시트 순서, 시트 안의 순서)로 정해진다.
+    """
+    started = time.perf_counter()
+    print("🔍 테라포밍 마스 Excel 파일 파싱 시작...")
+    
+    # 파일별 시트 목록으로 작업 만들기
+    tasks = []
+    years = []
+    for file_index, path in enumerate(expand_inputs(patterns)):
+        if not os.path.exists(path):
+            print(f"❌ 파일을 찾을 수 없습니다: {path}")
+            continue
+        
+        file_year_value = year or file_year(path) or datetime.now().year
+        try:
+            sheet_names = list_sheets(path)
+        except Exception as e:
+            print(f"❌ 파일 읽기 오류 ({path}): {e}")
+            continue
+        
+        print(f"📊 {os.path.basename(path)} ({file_year_value}년): 시트 {len(sheet_names)}개")
+        years.append(file_year_value)
+        for sheet_index, sheet_name in enumerate(sheet_names):
+            tasks.append(((file_index, sheet_index), path, sheet_name, file_year_value))
     
-    downloads_path = "/Users/kihokim/Downloads"
-    excel_files = [
-        ("20190222-24_TFM.xlsx", 2019),
-        ("2020_TFM.xlsx", 2020), 
-        ("2021_TFM.xlsx", 2021),
-        ("2022_TFM.xlsx", 2022)
-    ]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    print(f"\n⚙️ 시트 {len(tasks)}개를 프로세스 {workers}개로 파싱합니다")
+    if workers == 1:
+        results = [parse_sheet(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(parse_sheet, tasks))
+    sheet_seconds = sum(elapsed for _, _, elapsed, _ in results)
     
     all_players = {}
     all_games = []
     game_id_counter = 1
     
-    print("🔍 테라포밍 마스 Excel 파일 파싱 시작...")
-    
-    for excel_file, year in excel_files:
-        file_path = os.path.join(downloads_path, excel_file)
-        if not os.path.exists(file_path):
-            print(f"❌ 파일을 찾을 수 없습니다: {excel_file}")
+    # executor.map은 작업 순서대로 결과를 돌려주므로 병렬 처리 여부와 관계없이 같은 결과
+    for (order, path, sheet_name, _), (_, games, elapsed, error) in zip(tasks, results):
+        label = f"{os.path.basename(path)} / {sheet_name}"
+        if error is not None:
+            print(f"   ❌ {label}: 시트 파싱 오류 ({error})")
             continue
-            
-        print(f"\n📊 파싱 중: {excel_file} ({year}년)")
+        print(f"   📋 {label}: {len(games)}게임 ({elapsed * 1000:.0f}ms)")
         
-        try:
-            workbook = load_workbook(file_path, read_only=True)
-            sheet_names = workbook.sheetnames
+        for game in games:
+            game['id'] = game_id_counter
+            all_games.append(game)
+            game_id_counter += 1
             
-            # Online 탭 제외하고 처리
-            for sheet_name in sheet_names:
-                if 'online' in sheet_name.lower() or not sheet_name.strip():
-                    continue
-                    
-                print(f"   📋 시트 처리: {sheet_name}")
+            # 플레이어 통계 업데이트
+            for result in game['results']:
+                player_name = result['playerName']
+                if player_name not in all_players:
+                    all_players[player_name] = {
+                        'id': len(all_players) + 1,
+                        'name': player_name,
+                        'gameIds': [],
+                        'stats': {
+                            'totalGames': 0,
+                            'totalScore': 0,
+                            'averageScore': 0,
+                            'wins': 0,
+                            'seconds': 0,
+                            'thirds': 0,
+                            'fourths': 0
+                        }
+                    }
                 
-                try:
-                    worksheet = workbook[sheet_name]
-                    
-                    # 날짜 추출 (첫 번째 셀에서)
-                    date_cell = worksheet.cell(row=1, column=1).value
-                    if date_cell and hasattr(date_cell, 'strftime'):
-                        date_str = date_cell.strftime('%Y. %m. %d.')
-                    else:
-                        date_str = f"{year}. 01. 01."
-                    
-                    # 게임 데이터 파싱
-                    games = parse_game_data(worksheet, date_str, year)
-                    
-                    for game in games:
-                        game['id'] = game_id_counter
-                        all_games.append(game)
-                        game_id_counter += 1
-                        
-                        # 플레이어 통계 업데이트
-                        for result in game['results']:
-                            player_name = result['playerName']
-                            if player_name not in all_players:
-                                all_players[player_name] = {
-                                    'id': len(all_players) + 1,
-                                    'name': player_name,
-                                    'games': [],
-                                    'stats': {
-                                        'totalGames': 0,
-                                        'totalScore': 0,
-                                        'averageScore': 0,
-                                        'wins': 0,
-                                        'seconds': 0,
-                                        'thirds': 0,
-                                        'fourths': 0
-                                    }
-                                }
-                            
-                            player = all_players[player_name]
-                            player['games'].append(result)
-                            player['stats']['totalGames'] += 1
-                            player['stats']['totalScore'] += result['score']
-                            
-                            if result['rank'] == 1:
-                                player['stats']['wins'] += 1
-                            elif result['rank'] == 2:
-                                player['stats']['seconds'] += 1
-                            elif result['rank'] == 3:
-                                player['stats']['thirds'] += 1
-                            elif result['rank'] == 4:
-                                player['stats']['fourths'] += 1
-                    
-                    print(f"      ✅ {len(games)}개 게임 파싱 완료")
-                        
-                except Exception as e:
-                    print(f"      ❌ 시트 파싱 오류: {e}")
-                    continue
-            
-            workbook.close()
-                    
-        except Exception as e:
-            print(f"❌ 파일 읽기 오류 ({excel_file}): {e}")
-            continue
+                player = all_players[player_name]
+                # 프로세스마다 다른 hash() 임시 ID 대신 등장 순서로 정한 플레이어 id 사용
+                result['playerId'] = player['id']
+                # 결과 본문은 games에만 두고 플레이어에는 게임 id만 기록
+                player['gameIds'].append(game['id'])
+                player['stats']['totalGames'] += 1
+                player['stats']['totalScore'] += result['score']
+                
+                if result['rank'] == 1:
+                    player['stats']['wins'] += 1
+                elif result['rank'] == 2:
+                    player['stats']['seconds'] += 1
+                elif result['rank'] == 3:
+                    player['stats']['thirds'] += 1
+                elif result['rank'] == 4:
+                    player['stats']['fourths'] += 1
     
     # 평균 점수 계산
     for player in all_players.values():
@@ -249,27 +338,32 @@ def parse_tfm_excel_files():
             )
     
     # 레거시 데이터 생성
+    year_range = f"{min(years)}-{max(years)}" if years else ""
     legacy_data = {
         'players': list(all_players.values()),
         'games': all_games,
         'exportDate': datetime.now().isoformat(),
         'version': '1.0',
-        'description': '테라포밍 마스 레거시 데이터 (2019-2022)',
+        'description': f'테라포밍 마스 레거시 데이터 ({year_range})',
         'source': 'Excel 파일 파싱',
         'totalGames': len(all_games),
         'totalPlayers': len(all_players),
-        'yearRange': '2019-2022'
+        'yearRange': year_range
     }
     
     # JSON 파일로 저장
-    output_file = '/Users/kihokim/Documents/TFMCounter/terraforming_mars_legacy_2019-2022.json'
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(legacy_data, f, ensure_ascii=False, indent=2)
     
+    elapsed = time.perf_counter() - started
     print(f"\n✅ 레거시 데이터 생성 완료!")
     print(f"📁 파일 위치: {output_file}")
     print(f"👥 총 플레이어: {len(all_players)}명")
     print(f"🎮 총 게임: {len(all_games)}게임")
+    print(f"⏱️ 전체 {elapsed:.2f}초 (시트 파싱 시간 합계 {sheet_seconds:.2f}초)")
     
     # 플레이어별 통계 출력
     print(f"\n📊 플레이어별 통계:")
@@ -284,5 +378,17 @@ def parse_tfm_excel_files():
     
     return legacy_data
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='테라포밍 마스 Excel 기록을 레거시 JSON으로 변환')
+    parser.add_argument('inputs', nargs='+', help='Excel 파일 경로 또는 glob (예: "~/Downloads/*_TFM.xlsx")')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help=f'출력 JSON 파일 (기본: {DEFAULT_OUTPUT})')
+    parser.add_argument('--workers', type=int, default=None, help='파싱 프로세스 수 (기본: CPU 코어 수, 1이면 현재 프로세스에서)')
+    parser.add_argument('--year', type=int, default=None, help='모든 파일에 쓸 연도 (기본: 파일 이름의 연도)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    parse_tfm_excel_files(args.inputs, args.output, workers=args.workers, year=args.year)
+
 if __name__ == "__main__":
-    parse_tfm_excel_files()
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+from game_store import normalize_game_date
+
+# 응답/파일에 한 번에 쓰는 크기 (게임을 이만큼 모아서 내보냄)
+CHUNK_SIZE = 64 * 1024
+
+
+def encode_json(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class ExportSummary:
+    """내보낸 게임 수와 날짜 범위 (날짜 순으로 정렬된 게임을 내보내는 동안 갱신)"""
+
+    def __init__(self):
+        self.game_count = 0
+        self.first = None
+        self.last = None
+
+    def add(self, game):
+        self.game_count += 1
+        # 날짜를 알 수 없는 게임은 맨 앞에 오므로 날짜가 있는 첫 게임을 시작일로 사용
+        if self.first is None and normalize_game_date(game.get('date')):
+            self.first = game.get('date')
+        self.last = game.get('date') or self.last
+
+    def date_range(self):
+        return {'start': self.first or '', 'end': self.last or ''}
+
+    def file_date_range(self):
+        """파일 이름용 날짜 범위 ("20190222" 또는 "20190222-20221231")"""
+        if not self.game_count:
+            return 'empty'
+        first = normalize_game_date(self.first).replace('-', '') or 'unknown'
+        last = normalize_game_date(self.last).replace('-', '') or 'unknown'
+        return first if self.game_count == 1 else f"{first}-{last}"
+
+
+def buffered(parts):
+    """작은 조각들을 CHUNK_SIZE 정도로 묶어서 돌려줌"""
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def iter_ndjson(games, summary):
+    """게임 한 건을 한 줄로 (NDJSON)"""
+    for game in games:
+        summary.add(game)
+        yield encode_json(game) + b'\n'
+
+
+def iter_legacy_json(players, games, summary):
+    """레거시 내보내기 파일과 같은 구조의 JSON을 게임 단위로 이어서 만듦
+
+    게임 수와 날짜 범위는 게임을 모두 내보낸 뒤에야 알 수 있으므로 맨 뒤에 둔다.
+    """
+    yield b'{"players":' + encode_json(players) + b',"games":['
+    for game in games:
+        yield (b',' if summary.game_count else b'') + encode_json(game)
+        summary.add(game)
+    tail = {
+        'exportDate': datetime.now().isoformat(),
+        'version': '1.0',
+        'description': '테라포밍 마스 레거시 데이터',
+        'gameCount': summary.game_count,
+        'dateRange': summary.date_range()
+    }
+    yield b'],' + encode_json(tail)[1:]
+
+
+def export_to_file(games_dir, players, games, compress=False):
+    """레거시 형식으로 파일에 바로 써 나감. (파일 경로, ExportSummary) 반환"""
+    os.makedirs(games_dir, exist_ok=True)
+    summary = ExportSummary()
+    extension = '.json.gz' if compress else '.json'
+    tmp_path = os.path.join(games_dir, f'.export_{os.getpid()}_{id(summary)}{extension}')
+    opener = gzip.open if compress else open
+    try:
+        with opener(tmp_path, 'wb') as f:
+            for chunk in buffered(iter_legacy_json(players, games, summary)):
+                f.write(chunk)
+        # 날짜 범위는 다 쓴 뒤에 알 수 있으므로 마지막에 이름 변경
+        filename = f"terraforming_mars_legacy_{summary.file_date_range()}{extension}"
+        export_path = os.path.join(games_dir, filename)
+        os.replace(tmp_path, export_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return export_path, summary
@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime
+
+from metrics import METRICS
+from player_stats import PlayerStatsAggregator, count_mismatches
+
+
+def game_key(game, index):
+    """게임 식별 키 (id가 없는 오래된 데이터는 위치로 구분)"""
+    return game.get('id', f'#{index}')
+
+
+def player_key(player, index):
+    """플레이어 식별 키 (게임 결과와 이름으로 매칭하므로 이름 사용)"""
+    return player.get('name', f'#{index}')
+
+
+def diff_records(old_records, new_records, key_func):
+    """두 목록을 키로 비교해서 (추가/변경된 레코드 dict, 삭제된 키 목록) 반환"""
+    old_index = {key_func(record, i): record for i, record in enumerate(old_records)}
+    upserted = {}
+    new_keys = set()
+    for i, record in enumerate(new_records):
+        key = key_func(record, i)
+        new_keys.add(key)
+        if old_index.get(key) != record:
+            upserted[key] = record
+    deleted = [key for key in old_index if key not in new_keys]
+    return upserted, deleted
+
+
+def diff_datasets(old_data, new_data):
+    """데이터셋 변경분 계산 (게임/플레이어 단위)"""
+    games_upserted, games_deleted = diff_records(
+        old_data.get('games', []), new_data.get('games', []), game_key)
+    players_upserted, players_deleted = diff_records(
+        old_data.get('players', []), new_data.get('players', []), player_key)
+    return {
+        'games': (games_upserted, games_deleted),
+        'players': (players_upserted, players_deleted)
+    }
+
+
+DATE_PATTERN = re.compile(r'(\d{4})\D+(\d{1,2})\D+(\d{1,2})')
+
+
+def normalize_game_date(date_str):
+    """게임 날짜 문자열("2019. 02. 22.", ISO 형식 등)을 "YYYY-MM-DD"로 변환. 알 수 없으면 빈 문자열"""
+    match = DATE_PATTERN.search(date_str or '')
+    if not match:
+        return ''
+    year, month, day = match.groups()
+    return f"{year}-{month.zfill(2)}-{day.zfill(2)}"
+
+
+def find_game_index(games, game_id):
+    """id로 게임 위치 찾기 (없으면 -1)"""
+    for i, game in enumerate(games):
+        if game.get('id') == game_id:
+            return i
+    return -1
+
+
+def apply_game_op(games, op, game_id, game):
+    """게임 목록에 단일 게임 추가/수정/삭제 적용 (목록을 직접 수정). 대상 게임이 없으면 KeyError"""
+    if op == 'add':
+        games.append(game)
+        return
+    index = find_game_index(games, game_id)
+    if index == -1:
+        raise KeyError(game_id)
+    if op == 'update':
+        games[index] = game
+    elif op == 'delete':
+        del games[index]
+    else:
+        raise ValueError(f"알 수 없는 작업: {op}")
+
+
+def encode_data(data):
+    """데이터셋을 공백 없는 UTF-8 JSON 바이트로 직렬화 (파일 저장과 응답에 같이 사용)"""
+    with METRICS.time('sync_json_encode_seconds', target='dataset'):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compress_body(body, encoding):
+    """응답 본문을 gzip 또는 deflate(zlib)로 압축"""
+    if encoding == 'gzip':
+        # mtime을 고정해서 같은 본문이면 항상 같은 바이트가 나오게 함
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == 'deflate':
+        return zlib.compress(body, 6)
+    raise ValueError(f"지원하지 않는 압축 방식: {encoding}")
+
+
+def write_file_atomic(path, data_bytes, target='snapshot'):
+    """임시 파일에 쓰고 fsync 후 rename으로 교체 (중간에 멈춰도 이전 파일이 그대로 남음)"""
+    started = time.perf_counter()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # rename 자체도 디스크에 남도록 디렉토리 fsync (지원하지 않는 OS는 건너뜀)
+    try:
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        dir_fd = None
+    if dir_fd is not None:
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    METRICS.observe('sync_disk_write_seconds', time.perf_counter() - started, target=target)
+    METRICS.inc('sync_disk_write_bytes_total', len(data_bytes), target=target)
+
+
+def replay_change(data, entry, stats=None):
+    """저장된 변경 한 건(게임 추가/수정/삭제)을 데이터에 적용 (목록을 직접 수정, 플레이어 통계도 갱신)"""
+    old_game = None
+    if entry['op'] != 'add':
+        index = find_game_index(data['games'], entry.get('gameId'))
+        if index != -1:
+            old_game = data['games'][index]
+    apply_game_op(data['games'], entry['op'], entry.get('gameId'), entry.get('game'))
+    (stats or PlayerStatsAggregator()).apply_game(data, old_game, entry.get('game'))
+    data['lastUpdated'] = entry['lastUpdated']
+    data['dataVersion'] = entry['version']
+
+
+class JsonFileBackend:
+    """game_data.json 스냅샷 + 저널 파일에 저장하는 방식 (기본값)"""
+
+    name = 'json'
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        # 단일 게임 변경을 한 줄씩 덧붙이는 저널 (스냅샷 이후의 변경만 보관)
+        self.journal_file = os.path.splitext(data_file)[0] + '.journal'
+        # 스냅샷에 아직 합쳐지지 않은 저널 건수
+        self.pending_changes = 0
+
+    def change_key(self):
+        """캐시 키로 쓰는 파일 버전 (수정 시각, 크기). 파일이 없으면 None"""
+        try:
+            stat = os.stat(self.data_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+        """스냅샷을 읽고, 스냅샷 이후에 저널에 기록된 변경을 순서대로 다시 적용"""
+        data = self.read_snapshot()
+
+        self.pending_changes = 0
+        if not os.path.exists(self.journal_file):
+            return data
+
+        snapshot_version = data.get('dataVersion', 0)
+        data['games'] = data.get('games', [])
+        stats = PlayerStatsAggregator()
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    with METRICS.time('sync_json_decode_seconds', source='journal'):
+                        entry = json.loads(line)
+                except ValueError:
+                    # 기록 도중 중단된 마지막 줄은 무시
+                    print(f"저널의 손상된 줄을 건너뜁니다: {self.journal_file}")
+                    break
+                if entry['version'] <= snapshot_version:
+                    continue
+                replay_change(data, entry, stats)
+                self.pending_changes += 1
+
+        if self.pending_changes:
+            print(f"저널에서 {self.pending_changes}개의 변경을 복원했습니다")
+        return data
+
+    def read_snapshot(self):
+        with open(self.data_file, 'r', encoding='utf-8') as f, \
+                METRICS.time('sync_json_decode_seconds', source='snapshot'):
+            return json.load(f)
+
+    def write_snapshot_file(self, data, data_bytes=None):
+        write_file_atomic(self.data_file, data_bytes if data_bytes is not None else encode_data(data))
+
+    def write_snapshot(self, data, data_bytes=None):
+        """전체 스냅샷을 원자적으로 교체한 뒤 저널 비우기 (스냅샷에 이미 반영된 내용이므로)"""
+        self.write_snapshot_file(data, data_bytes)
+        if self.pending_changes or os.path.exists(self.journal_file):
+            open(self.journal_file, 'w').close()
+        self.pending_changes = 0
+
+    def append_change(self, entry, players=()):
+        """저널 끝에 변경 한 건 기록 (변경 크기만큼만 디스크에 씀)
+
+        바뀐 플레이어(players)는 다시 읽을 때 게임 기록으로부터 계산되므로 따로 기록하지 않는다.
+        """
+        with METRICS.time('sync_json_encode_seconds', target='journal'):
+            line = (json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with METRICS.time('sync_disk_write_seconds', target='journal'):
+            with open(self.journal_file, 'ab') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        METRICS.inc('sync_disk_write_bytes_total', len(line), target='journal')
+        self.pending_changes += 1
+
+    def compact(self, data, data_bytes=None):
+        """저널에 쌓인 변경을 스냅샷으로 합침. 합칠 게 있었으면 True"""
+        if not self.pending_changes:
+            return False
+        count = self.pending_changes
+        self.write_snapshot(data, data_bytes)
+        print(f"저널 {count}건을 스냅샷으로 합쳤습니다")
+        return True
+
+
+class GameStore:
+    """저장된 데이터셋을 메모리에 캐시하고 직렬화된 응답 바이트를 함께 보관하는 저장소
+
+    실제 저장은 backend(JsonFileBackend, sqlite_store.SqliteBackend)가 맡는다.
+    """
+
+    # 이보다 작은 응답은 압축해도 이득이 거의 없으므로 그대로 보냄
+    MIN_COMPRESS_SIZE = 512
+
+    def __init__(self, backend, change_log_size=500, compact_threshold=500, commit_window=0.01):
+        self.backend = backend
+        # 밀린 변경(저널)이 이만큼 쌓이면 스냅샷으로 합침
+        self.compact_threshold = compact_threshold
+        # 파일 읽기/쓰기와 캐시 갱신을 직렬화하는 잠금
+        self.lock = threading.RLock()
+
+        self._file_key = None
+        self._data = None
+        self._data_bytes = None
+        self._sync_bytes = None
+        self._delta_bytes = {}
+        self._encoded = {}
+        self._view_bytes = {}
+
+        # 저장할 때마다 1씩 증가하는 데이터셋 버전과 버전별 변경 로그
+        self.version = 0
+        self.change_log = deque(maxlen=change_log_size)
+        # 이 버전보다 오래된 클라이언트는 변경 로그로 따라올 수 없음 (전체 스냅샷 필요)
+        self.log_floor = 0
+
+        # 저장이 끝날 때마다 호출되는 콜백 (푸시 알림 등)
+        self.listeners = []
+        # 이름→플레이어 색인으로 플레이어 통계를 증분 유지
+        self.stats = PlayerStatsAggregator()
+
+        # 게임 단위로 증분 갱신되는 집계 색인과, 그 색인으로 만드는 버전별 응답(랭킹 등)
+        self.indexes = []
+        self.views = {}
+        self.unversioned_views = set()
+        self._indexed_data = None
+
+        # 스냅샷을 덮어쓰기 직전에 이전 데이터 바이트로 호출되는 콜백 (백업 등)
+        self.commit_hooks = []
+
+        # 그룹 커밋: 짧은 시간 안에 들어온 전체 저장 요청들을 한 번의 디스크 쓰기로 처리
+        self.commit_window = commit_window
+        self._batch = []
+        self._batch_cond = threading.Condition()
+        self._leader_active = False
+
+    def add_listener(self, callback):
+        """저장 완료 시 callback(data) 호출 등록"""
+        self.listeners.append(callback)
+
+    def add_commit_hook(self, callback):
+        """스냅샷 교체 직전에 callback(이전 데이터 바이트) 호출 등록"""
+        self.commit_hooks.append(callback)
+
+    def add_index(self, index):
+        """index.rebuild(data), index.apply_game(old_game, new_game)을 구현한 집계 색인 등록"""
+        with self.lock:
+            self.indexes.append(index)
+            self._indexed_data = None
+
+    def add_view(self, name, build, versioned=True):
+        """build(data)의 결과를 버전마다 한 번만 직렬화해서 get_response(name)으로 제공
+
+        versioned가 False이면 version 필드를 붙이지 않고 /api/data와 같은 형식으로 직렬화한다.
+        """
+        self.views[name] = build
+        if not versioned:
+            self.unversioned_views.add(name)
+
+    def _ensure_indexes(self):
+        """색인이 현재 데이터를 반영하지 않으면 전체 재구성 (잠금을 잡은 상태에서 호출)"""
+        if self._data is not None and self._indexed_data is not self._data:
+            for index in self.indexes:
+                index.rebuild(self._data)
+            self._indexed_data = self._data
+
+    def query(self, func):
+        """색인을 현재 데이터에 맞춘 뒤 잠금 안에서 func(data) 실행. 데이터가 없으면 None"""
+        with self.lock:
+            self._ensure_loaded()
+            if self._data is None:
+                return None
+            self._ensure_indexes()
+            return func(self._data)
+
+    def _set_cache(self, data, file_key):
+        self._file_key = file_key
+        self._data = data
+        self._data_bytes = None
+        self._sync_bytes = None
+        self._delta_bytes = {}
+        self._encoded = {}
+        self._view_bytes = {}
+
+    def _reset_change_log(self):
+        self.change_log.clear()
+        self.log_floor = self.version
+
+    def _ensure_loaded(self):
+        """저장소가 바뀐 경우에만 다시 읽어서 캐시 갱신 (잠금을 잡은 상태에서 호출)"""
+        file_key = self.backend.change_key()
+        if file_key == self._file_key and (file_key is None or self._data is not None):
+            return
+        if file_key is None:
+            self._set_cache(None, None)
+            return
+        # 예전 형식(플레이어마다 결과 사본)으로 저장된 데이터도 게임 id 참조로 바꿔서 사용
+        data = self.stats.link_games(self.backend.load())
+
+        # 외부에서 파일이 바뀐 경우에도 버전은 뒤로 가지 않게 함
+        version = data.get('dataVersion', 0)
+        if self._data is not None:
+            version = max(version, self.version + 1)
+        self.version = version
+        data['dataVersion'] = version
+        self._reset_change_log()
+        self._set_cache(data, file_key)
+
+    def get_data(self):
+        """캐시된 데이터 객체 반환 (공유 객체이므로 호출하는 쪽에서 수정하면 안 됨)"""
+        with self.lock:
+            self._ensure_loaded()
+            return self._data
+
+    def get_version(self):
+        with self.lock:
+            self._ensure_loaded()
+            return self.version
+
+    def get_data_bytes(self):
+        """GET /api/data 응답 본문 (UTF-8 JSON). 파일 버전마다 한 번만 직렬화"""
+        with self.lock:
+            self._ensure_loaded()
+            if self._data is None:
+                return None
+            if self._data_bytes is None:
+                self._data_bytes = encode_data(self._data)
+            return self._data_bytes
+
+    def get_sync_bytes(self):
+        """업데이트가 필요한 클라이언트에게 보낼 /api/sync 응답 본문 (전체 스냅샷)"""
+        with self.lock:
+            data_bytes = self.get_data_bytes()
+            if data_bytes is None:
+                return None
+            if self._sync_bytes is None:
+                server_timestamp = json.dumps(self._data.get('lastUpdated', ''), ensure_ascii=False)
+                self._sync_bytes = b''.join([
+                    b'{"needsUpdate": true, "serverTimestamp": ',
+                    server_timestamp.encode('utf-8'),
+                    b', "version": ',
+                    str(self.version).encode('ascii'),
+                    b', "delta": null, "data": ',
+                    data_bytes,
+                    b'}'
+                ])
+            return self._sync_bytes
+
+    def get_delta_bytes(self, since):
+        """since 버전 이후의 변경분만 담은 /api/sync 응답 본문
+
+        변경 로그가 since 이전까지 압축되어 없으면 전체 스냅샷으로 대체한다.
+        """
+        with self.lock:
+            self._ensure_loaded()
+            if self._data is None:
+                return None
+            if since < self.log_floor or since > self.version:
+                return self.get_sync_bytes()
+            if since not in self._delta_bytes:
+                response = {
+                    'needsUpdate': since != self.version,
+                    'serverTimestamp': self._data.get('lastUpdated', ''),
+                    'version': self.version,
+                    'delta': self._merge_changes(since) if since != self.version else None,
+                    'data': None
+                }
+                with METRICS.time('sync_json_encode_seconds', target='response'):
+                    self._delta_bytes[since] = json.dumps(response, ensure_ascii=False).encode('utf-8')
+            return self._delta_bytes[since]
+
+    def get_response(self, kind, encoding=None, since=None):
+        """(버전, 본문, 실제 적용한 압축 방식) 반환. 데이터가 없으면 (None, None, None)
+
+        kind는 'data'(/api/data), 'sync'(전체 스냅샷), 'delta'(since 이후 변경분) 또는 add_view로 등록한 이름.
+        버전과 본문을 같은 잠금 안에서 읽어 ETag와 본문이 어긋나지 않게 하고,
+        압축본은 버전마다 한 번만 만들어 둔다.
+        """
+        with self.lock:
+            self._ensure_loaded()
+            cached = self._cached_body(kind, since) is not None
+            if kind == 'data':
+                body = self.get_data_bytes()
+            elif kind == 'sync':
+                body = self.get_sync_bytes()
+            elif kind == 'delta':
+                body = self.get_delta_bytes(since)
+            else:
+                body = self._get_view_bytes(kind)
+            if body is None:
+                return None, None, None
+            METRICS.inc('sync_cache_requests_total', cache=kind if kind in ('data', 'sync', 'delta') else 'view',
+                        result='hit' if cached else 'miss')
+            if encoding is None or len(body) < self.MIN_COMPRESS_SIZE:
+                return self.version, body, None
+            key = (kind, since, encoding)
+            METRICS.inc('sync_cache_requests_total', cache='compressed', result='hit' if key in self._encoded else 'miss')
+            if key not in self._encoded:
+                self._encoded[key] = compress_body(body, encoding)
+            return self.version, self._encoded[key], encoding
+
+    def _cached_body(self, kind, since):
+        """이미 만들어 둔 응답 본문 (없으면 None)"""
+        if kind == 'data':
+            return self._data_bytes
+        if kind == 'sync':
+            return self._sync_bytes
+        if kind == 'delta':
+            return self._delta_bytes.get(since)
+        return self._view_bytes.get(kind)
+
+    def _get_view_bytes(self, name):
+        self._ensure_loaded()
+        if self._data is None:
+            return None
+        if name not in self._view_bytes:
+            self._ensure_indexes()
+            if name in self.unversioned_views:
+                self._view_bytes[name] = encode_data(self.views[name](self._data))
+                return self._view_bytes[name]
+            response = dict(self.views[name](self._data), version=self.version)
+            with METRICS.time('sync_json_encode_seconds', target='response'):
+                self._view_bytes[name] = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        return self._view_bytes[name]
+
+    def _merge_changes(self, since):
+        """since 이후 변경 로그를 하나의 변경분으로 합침"""
+        merged = {'games': ({}, {}), 'players': ({}, {})}
+        for version, changes in self.change_log:
+            if version <= since:
+                continue
+            for kind in ('games', 'players'):
+                upserted, deleted = merged[kind]
+                changed_records, deleted_keys = changes[kind]
+                for key in deleted_keys:
+                    upserted.pop(key, None)
+                    deleted[key] = True
+                for key, record in changed_records.items():
+                    deleted.pop(key, None)
+                    upserted[key] = record
+
+        delta = {'fromVersion': since}
+        for kind in ('games', 'players'):
+            upserted, deleted = merged[kind]
+            delta[kind] = {'upserted': list(upserted.values()), 'deleted': list(deleted)}
+        # selectedMap 같은 최상위 값들은 작으므로 항상 현재 값을 그대로 보냄
+        delta['meta'] = {key: value for key, value in self._data.items() if key not in ('games', 'players')}
+        return delta
+
+    def get_last_updated(self):
+        data = self.get_data()
+        return data.get('lastUpdated', '') if data is not None else None
+
+    def save(self, data):
+        """전체 데이터 저장. 커밋된 데이터(이 요청의 lastUpdated, dataVersion 포함) 반환"""
+        return self.update(lambda previous: data)
+
+    def update(self, transform):
+        """transform(이전 데이터)가 돌려준 새 데이터를 저장
+
+        동시에 들어온 요청들은 모아서 차례로 적용한 뒤 마지막 결과만 한 번 디스크에 쓴다.
+        각 요청은 자기 변경에 해당하는 버전과 lastUpdated를 돌려받는다.
+        transform은 이전 데이터를 수정하지 말고 새 객체를 만들어야 한다.
+        """
+        pending = {'transform': transform, 'done': False, 'result': None, 'error': None}
+        with self._batch_cond:
+            self._batch.append(pending)
+            while not pending['done'] and self._leader_active:
+                self._batch_cond.wait()
+            if pending['done']:
+                if pending['error'] is not None:
+                    raise pending['error']
+                return pending['result']
+            # 진행 중인 커밋이 없으면 이 요청이 리더가 되어 모인 요청들을 커밋
+            self._leader_active = True
+
+        try:
+            if self.commit_window:
+                time.sleep(self.commit_window)
+            with self._batch_cond:
+                batch, self._batch = self._batch, []
+            self._commit_batch(batch)
+        finally:
+            with self._batch_cond:
+                self._leader_active = False
+                self._batch_cond.notify_all()
+
+        if pending['error'] is not None:
+            raise pending['error']
+        return pending['result']
+
+    def _commit_batch(self, batch):
+        """요청들을 순서대로 적용하고 최종 데이터를 한 번만 저장"""
+        with self.lock:
+            try:
+                self._ensure_loaded()
+                previous_bytes = self.get_data_bytes()
+                previous = self._data
+                start_version = self.version
+                start_log = list(self.change_log)
+                start_floor = self.log_floor
+
+                committed = []
+                for pending in batch:
+                    try:
+                        # 클라이언트가 보낸 player.games(결과 사본)는 저장하지 않고 게임 id 참조로 바꿈
+                        data = self.stats.link_games(pending['transform'](previous))
+                    except Exception as e:
+                        pending['error'] = e
+                        continue
+                    data['lastUpdated'] = datetime.now().isoformat()
+                    self.version += 1
+                    data['dataVersion'] = self.version
+                    if previous is None:
+                        self._reset_change_log()
+                    else:
+                        self.change_log.append((self.version, diff_datasets(previous, data)))
+                        # 로그 최대 길이를 넘어 오래된 항목이 밀려난 경우
+                        self.log_floor = max(self.log_floor, self.change_log[0][0] - 1)
+                    pending['result'] = data
+                    committed.append(pending)
+                    previous = data
+
+                if committed:
+                    if previous_bytes is not None:
+                        for callback in self.commit_hooks:
+                            try:
+                                callback(previous_bytes)
+                            except Exception as e:
+                                print(f"커밋 전 처리 중 오류: {e}")
+                    data_bytes = encode_data(previous)
+                    try:
+                        self.backend.write_snapshot(previous, data_bytes)
+                    except Exception as e:
+                        # 디스크 쓰기에 실패하면 버전과 변경 로그를 커밋 전으로 되돌림
+                        self.version = start_version
+                        self.change_log.clear()
+                        self.change_log.extend(start_log)
+                        self.log_floor = start_floor
+                        for pending in committed:
+                            pending['result'] = None
+                            pending['error'] = e
+                        return
+                    self._set_cache(previous, self.backend.change_key())
+                    self._data_bytes = data_bytes
+                    if len(committed) > 1:
+                        print(f"그룹 커밋: 저장 요청 {len(committed)}건을 한 번에 기록했습니다")
+                    self._notify(previous)
+            finally:
+                for pending in batch:
+                    pending['done'] = True
+
+    def _notify(self, data):
+        for callback in self.listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"저장 알림 처리 중 오류: {e}")
+
+    def apply_game_change(self, op, game_id=None, game=None):
+        """게임 한 건 추가/수정/삭제
+
+        전체 스냅샷 대신 변경 한 건만 저장하고 캐시를 새 버전으로 교체한다.
+        대상 게임이 없으면 KeyError.
+        """
+        with self.lock:
+            self._ensure_loaded()
+            data = self._data if self._data is not None else {'players': [], 'games': []}
+            games = data.get('games', [])
+
+            old_game = None
+            if op == 'add':
+                game_id = game.get('id')
+                if game_id is None or find_game_index(games, game_id) != -1:
+                    game_id = self._new_game_id(games)
+                    game = dict(game, id=game_id)
+            else:
+                index = find_game_index(games, game_id)
+                if index == -1:
+                    raise KeyError(game_id)
+                old_game = games[index]
+                if op == 'update':
+                    game = dict(game, id=game_id)
+
+            # 캐시된 데이터는 다른 요청이 읽고 있을 수 있으므로 새 목록에 적용
+            new_data = dict(data)
+            new_data['games'] = list(games)
+            apply_game_op(new_data['games'], op, game_id, game)
+            new_game = game if op != 'delete' else None
+            changed_players = self.stats.apply_game(new_data, old_game, new_game)
+            version = self.version + 1
+            new_data['lastUpdated'] = datetime.now().isoformat()
+            new_data['dataVersion'] = version
+
+            # 디스크에 먼저 기록하고, 성공한 경우에만 버전/변경 로그/색인/캐시를 바꿈
+            # (쓰기에 실패하면 예외가 그대로 올라가고 메모리 상태는 이전 버전 그대로)
+            if self._file_key is None:
+                # 아직 스냅샷이 없으면 변경 기록 대신 바로 스냅샷 생성
+                self.backend.write_snapshot(new_data, encode_data(new_data))
+                file_key = self.backend.change_key()
+            else:
+                entry = {
+                    'version': version,
+                    'op': op,
+                    'gameId': game_id,
+                    'lastUpdated': new_data['lastUpdated']
+                }
+                if op != 'delete':
+                    entry['game'] = game
+                self.backend.append_change(entry, changed_players)
+                file_key = self._file_key
+
+            self.version = version
+            players_upserted = {player_key(player, 0): player for player in changed_players}
+            if op == 'delete':
+                self.change_log.append((self.version, {'games': ({}, [game_id]), 'players': (players_upserted, [])}))
+            else:
+                self.change_log.append((self.version, {'games': ({game_id: game}, []), 'players': (players_upserted, [])}))
+            self.log_floor = max(self.log_floor, self.change_log[0][0] - 1)
+
+            if self._indexed_data is not None and self._indexed_data is self._data:
+                # 색인이 최신이면 바뀐 게임만 반영, 아니면 다음 조회 때 전체 재구성
+                for index in self.indexes:
+                    index.apply_game(old_game, new_game)
+                self._indexed_data = new_data
+            self._set_cache(new_data, file_key)
+
+            if self.backend.pending_changes >= self.compact_threshold:
+                try:
+                    self.compact()
+                except Exception as e:
+                    # 변경은 이미 저널에 기록되었으므로 요청은 성공으로 처리하고 다음 압축 때 다시 시도
+                    print(f"저널 압축 중 오류: {e}")
+
+            self._notify(new_data)
+            return new_data, game
+
+    def rebuild_player_stats(self):
+        """게임 기록으로 플레이어 통계를 전체 재계산해서 저장. (저장된 데이터, 통계가 달랐던 플레이어 수) 반환"""
+        mismatches = []
+
+        def rebuild(previous):
+            data = self.stats.rebuild(previous)
+            mismatches.append(count_mismatches(previous.get('players', []), data['players']))
+            return data
+
+        data = self.update(rebuild)
+        return data, mismatches[0]
+
+    @staticmethod
+    def _new_game_id(games):
+        """클라이언트와 같은 방식(밀리초 타임스탬프)으로 겹치지 않는 게임 id 생성"""
+        game_id = int(time.time() * 1000)
+        existing = {game.get('id') for game in games}
+        while game_id in existing:
+            game_id += 1
+        return game_id
+
+    def compact(self):
+        """밀린 변경(저널)을 스냅샷으로 합침"""
+        with self.lock:
+            if self._data is None:
+                return
+            if self.backend.compact(self._data, self.get_data_bytes()):
+                self._file_key = self.backend.change_key()
+
+    def close(self):
+        """밀린 저널을 스냅샷으로 합치고 저장소 연결을 닫음 (이후에는 사용하지 않음)"""
+        self.compact()
+        close = getattr(self.backend, 'close', None)
+        if close is not None:
+            close()
+
+    def start_compaction(self, interval):
+        """interval초마다 저널을 스냅샷으로 합치는 백그라운드 스레드 시작"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.compact()
+                except Exception as e:
+                    print(f"저널 압축 중 오류: {e}")
+
+        thread = threading.Thread(target=run, name='journal-compaction')
+        thread.daemon = True
+        thread.start()
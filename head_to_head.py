@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+def seated_players(results):
+    """게임 결과에서 (이름, 순위, 점수) 목록 (이름이 없거나 중복된 결과는 제외)"""
+    players = []
+    seen = set()
+    for result in results:
+        name = result.get('playerName')
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        players.append((name, result.get('rank') or float('inf'), result.get('score') or 0))
+    return players
+
+
+class HeadToHeadIndex:
+    """같은 테이블에 앉은 두 플레이어의 상대 전적을 유지하는 색인 (GameStore.add_index로 등록)
+
+    플레이어 이름을 0부터 시작하는 id로 바꾸고, id → {상대 id: [같이 한 게임 수, 앞선 횟수, 점수 차 합]}
+    형태의 희소 행렬을 게임 단위로 증분 갱신한다.
+    - 같이 한 게임 수: a와 b가 같은 테이블에 앉은 게임 수
+    - 앞선 횟수: a가 b보다 높은 순위로 끝낸 게임 수
+    - 점수 차 합: 같이 한 게임에서 (a 점수 - b 점수)의 합
+    새 플레이어 등록과 게임 한 건 반영은 그 게임의 플레이어 쌍만큼, 두 사람 조회는 O(1),
+    한 사람의 전체 상대 조회는 실제로 같이 한 상대 수만큼만 걸린다.
+    """
+
+    def __init__(self):
+        self.rebuild({})
+
+    def rebuild(self, data):
+        self.ids = {}
+        self.names = []
+        self.pairs = []
+        for game in data.get('games', []):
+            self.apply_game(None, game)
+
+    def intern(self, name):
+        """플레이어 id (처음 보는 이름이면 빈 행 추가)"""
+        player_id = self.ids.get(name)
+        if player_id is None:
+            player_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.pairs.append({})
+        return player_id
+
+    def apply_game(self, old_game, new_game):
+        """old_game 전적을 빼고 new_game 전적을 더함 (추가는 old_game=None, 삭제는 new_game=None)"""
+        if old_game is not None:
+            self._count_game(old_game, -1)
+        if new_game is not None:
+            self._count_game(new_game, 1)
+
+    def _count_game(self, game, sign):
+        players = [
+            (self.intern(name), rank, score)
+            for name, rank, score in seated_players(game.get('results', []))
+        ]
+        for a, rank, score in players:
+            row = self.pairs[a]
+            for b, other_rank, other_score in players:
+                if a == b:
+                    continue
+                counts = row.get(b)
+                if counts is None:
+                    counts = row[b] = [0, 0, 0]
+                counts[0] += sign
+                counts[2] += sign * (score - other_score)
+                if rank < other_rank:
+                    counts[1] += sign
+                if counts[0] <= 0:
+                    # 같이 한 게임이 없어진 상대는 행에서 뺌
+                    del row[b]
+
+    def _record(self, a, b, counts):
+        games, ahead, margin = counts
+        behind = self.pairs[b][a][1]
+        return {
+            'opponent': self.names[b],
+            'games': games,
+            'ahead': ahead,
+            'behind': behind,
+            'aheadRate': round(ahead / games * 100, 1),
+            'averageMargin': round(margin / games, 1)
+        }
+
+    def pair(self, name, opponent):
+        """name 기준 opponent와의 전적. 같이 한 게임이 없으면 None"""
+        a = self.ids.get(name)
+        b = self.ids.get(opponent)
+        if a is None or b is None or b not in self.pairs[a]:
+            return None
+        return self._record(a, b, self.pairs[a][b])
+
+    def row(self, name):
+        """name이 같이 한 모든 상대와의 전적 (같이 한 게임 수 순). 기록이 없으면 None"""
+        a = self.ids.get(name)
+        if a is None or not self.pairs[a]:
+            return None
+        rows = [self._record(a, b, counts) for b, counts in self.pairs[a].items()]
+        # 같이 한 게임 수 → 앞선 비율 순, 같으면 이름 순 (갱신 순서와 관계없이 같은 결과)
+        rows.sort(key=lambda row: (-row['games'], -row['aheadRate'], row['opponent']))
+        return rows
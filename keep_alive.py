@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import selectors
+import socket
+import threading
+import time
+
+
+class IdleConnectionPool:
+    """keep-alive 연결이 다음 요청을 기다리는 동안 워커 대신 한 개의 스레드(selector)가 지켜봄
+
+    다음 요청이 도착한 연결은 on_ready(sock, client_address)로 워커 대기열에 돌려주고,
+    idle_timeout 동안 요청이 없거나 evict로 밀려난 연결은 on_close(sock)로 닫는다.
+    """
+
+    def __init__(self, on_ready, on_close, idle_timeout=15):
+        self.on_ready = on_ready
+        self.on_close = on_close
+        self.idle_timeout = idle_timeout
+
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()
+        # 대기 중인 연결: 소켓 -> (클라이언트 주소, 만료 시각)
+        self.parked = {}
+        self.pending = []
+        self.evicted = []
+        self.closed = False
+
+        # 다른 스레드에서 selector 루프를 깨우기 위한 소켓 쌍
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.wakeup_reader.setblocking(False)
+        self.wakeup_writer.setblocking(False)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ)
+
+        self.thread = threading.Thread(target=self.run, name='keep-alive-idle')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def park(self, sock, client_address):
+        """응답을 마친 연결을 넘겨받음 (selector 등록은 루프 스레드에서)"""
+        with self.lock:
+            if self.closed:
+                closed = True
+            else:
+                closed = False
+                self.parked[sock] = (client_address, time.monotonic() + self.idle_timeout)
+                self.pending.append(sock)
+        if closed:
+            self.on_close(sock)
+        else:
+            self.wakeup()
+
+    def evict(self, host):
+        """host의 대기 연결 중 가장 오래된 것을 닫도록 예약. 닫을 연결이 없으면 False"""
+        with self.lock:
+            candidates = [
+                (deadline, sock) for sock, (client_address, deadline) in self.parked.items()
+                if client_address[0] == host
+            ]
+            if not candidates:
+                return False
+            sock = min(candidates, key=lambda item: item[0])[1]
+            del self.parked[sock]
+            self.evicted.append(sock)
+        self.wakeup()
+        return True
+
+    def idle_count(self):
+        with self.lock:
+            return len(self.parked)
+
+    def wakeup(self):
+        try:
+            self.wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def run(self):
+        """selector 루프: 새 연결 등록, 요청이 온 연결 반환, 밀려나거나 만료된 연결 정리"""
+        while True:
+            events = self.selector.select(timeout=1.0)
+            with self.lock:
+                if self.closed:
+                    break
+                pending, self.pending = self.pending, []
+                evicted, self.evicted = self.evicted, []
+
+            for sock in pending:
+                try:
+                    self.selector.register(sock, selectors.EVENT_READ)
+                except (KeyError, ValueError, OSError):
+                    pass
+
+            for key, _ in events:
+                sock = key.fileobj
+                if sock is self.wakeup_reader:
+                    self.drain_wakeup()
+                    continue
+                with self.lock:
+                    entry = self.parked.pop(sock, None)
+                if entry is None:
+                    # 같은 순간에 evict된 연결 (아래에서 닫음)
+                    continue
+                self.unregister(sock)
+                # 연결이 끊긴 경우도 읽기 가능으로 깨어나며, 워커가 빈 요청을 읽고 닫음
+                self.on_ready(sock, entry[0])
+
+            now = time.monotonic()
+            with self.lock:
+                expired = [sock for sock, (_, deadline) in self.parked.items() if deadline <= now]
+                for sock in expired:
+                    del self.parked[sock]
+            for sock in evicted + expired:
+                self.unregister(sock)
+                self.on_close(sock)
+
+        self.shutdown()
+
+    def drain_wakeup(self):
+        try:
+            while self.wakeup_reader.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def unregister(self, sock):
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+
+    def close(self):
+        """루프를 멈추고 대기 중인 연결을 모두 닫음"""
+        with self.lock:
+            self.closed = True
+        self.wakeup()
+        self.thread.join(timeout=2)
+
+    def shutdown(self):
+        with self.lock:
+            remaining = list(self.parked) + self.evicted
+            self.parked = {}
+            self.evicted = []
+            self.pending = []
+        for sock in remaining:
+            self.unregister(sock)
+            self.on_close(sock)
+        self.selector.close()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# 기본 리그(/api/... 경로, data/ 디렉토리)의 이름
+DEFAULT_LEAGUE = ''
+# /api/<리그>/... 에 쓸 수 있는 리그 이름 (디렉토리 이름으로도 쓰이므로 제한)
+LEAGUE_NAME = re.compile(r'^[a-z0-9][a-z0-9_-]{0,63}$')
+
+
+def is_league_name(name):
+    return bool(LEAGUE_NAME.match(name))
+
+
+class League:
+    """리그 하나의 데이터셋 저장소와 색인, 백업 묶음
+
+    store, date_index, ratings, head_to_head, backups는 LeagueRegistry에 넘긴 factory가 채운다.
+    """
+
+    def __init__(self, name, data_dir):
+        self.name = name
+        self.data_dir = data_dir
+        self.store = None
+        self.date_index = None
+        self.ratings = None
+        self.head_to_head = None
+        self.backups = None
+        # 이 리그를 쓰고 있는 요청 수 (0일 때만 내릴 수 있음)
+        self.active = 0
+        self.last_used = time.monotonic()
+        self.last_compacted = time.monotonic()
+
+    def close(self):
+        """밀린 저널을 스냅샷으로 합치고 남은 백업을 기록"""
+        try:
+            self.store.close()
+        except Exception as e:
+            print(f"리그 '{self.name}' 저널 압축 중 오류: {e}")
+        if self.backups is not None:
+            self.backups.close()
+
+
+class LeagueRegistry:
+    """리그별 저장소를 처음 요청될 때 만들고, 메모리에 올려 둔 리그 수를 LRU로 제한
+
+    - max_loaded: 기본 리그를 제외하고 동시에 올려 둘 리그 수 (넘으면 가장 오래 안 쓴 리그부터 내림)
+    - idle_timeout: 이 시간(초) 동안 요청이 없던 리그는 내림
+    - compact_interval: 올라와 있는 리그의 저널을 스냅샷으로 합치는 주기(초)
+    - exists: 리그 이름을 받아 저장된 데이터가 있는지 확인하는 함수 (없으면 create일 때만 새로 만듦)
+
+    리그를 불러오는 동안(factory 실행)에는 잠금을 놓으므로 다른 리그의 요청을 막지 않는다.
+    리그를 내릴 때는 저널을 스냅샷으로 합친 뒤 메모리에서 버리므로, 다음 요청 때 파일에서 다시 읽는다.
+    요청 처리 중인 리그(acquire 후 release 전)는 내리지 않는다.
+    """
+
+    def __init__(self, factory, exists=None, max_loaded=32, idle_timeout=600, compact_interval=300):
+        self.factory = factory
+        self.exists = exists or (lambda name: True)
+        self.max_loaded = max_loaded
+        self.idle_timeout = idle_timeout
+        self.compact_interval = compact_interval
+
+        self.lock = threading.Lock()
+        self.loaded = OrderedDict()
+        # 불러오는 중인 리그: 이름 -> 완료 이벤트 (같은 리그를 동시에 두 번 만들지 않음)
+        self.loading = {}
+        # 내리는 중인 리그: 이름 -> 완료 이벤트 (다 내릴 때까지 같은 리그를 다시 만들지 않음)
+        self.closing = {}
+        self.default = factory(DEFAULT_LEAGUE)
+        self.thread = None
+
+    def acquire(self, name, create=False):
+        """리그를 (필요하면 불러와서) 사용 중으로 표시하고 반환. 다 쓰면 release 호출
+
+        저장된 데이터가 없는 리그는 create가 True일 때만 새로 만들고, 아니면 None을 반환한다.
+        """
+        if name == DEFAULT_LEAGUE:
+            with self.lock:
+                self.default.active += 1
+            return self.default
+
+        while True:
+            with self.lock:
+                waiting = self.closing.get(name) or self.loading.get(name)
+                if waiting is None:
+                    league = self.loaded.get(name)
+                    if league is not None:
+                        self._use(league)
+                        evicted = []
+                        break
+                    if not create and not self.exists(name):
+                        return None
+                    loading = self.loading[name] = threading.Event()
+                    break
+            waiting.wait()
+
+        if league is None:
+            # 파일을 읽는 동안 다른 리그의 요청을 막지 않도록 잠금 밖에서 만듦
+            try:
+                league = self.factory(name)
+            except Exception:
+                with self.lock:
+                    del self.loading[name]
+                loading.set()
+                raise
+            with self.lock:
+                del self.loading[name]
+                self.loaded[name] = league
+                self._use(league)
+                evicted = self._evict(lambda league: len(self.loaded) > self.max_loaded)
+                count = len(self.loaded)
+            loading.set()
+            print(f"📂 리그 '{name}'을(를) 불러왔습니다 (메모리에 {count}개)")
+
+        self._close(evicted)
+        return league
+
+    def _use(self, league):
+        """사용 중으로 표시하고 LRU 순서를 가장 뒤로 (잠금을 잡은 상태에서 호출)"""
+        self.loaded.move_to_end(league.name)
+        league.active += 1
+        league.last_used = time.monotonic()
+
+    def release(self, league):
+        with self.lock:
+            league.active -= 1
+            league.last_used = time.monotonic()
+            if self.loaded.get(league.name) is league:
+                self.loaded.move_to_end(league.name)
+
+    def loaded_count(self):
+        with self.lock:
+            return len(self.loaded)
+
+    def _evict(self, should_evict):
+        """오래 안 쓴 리그부터 should_evict(리그)가 참인 동안 목록에서 뺌 (잠금을 잡은 상태에서 호출)"""
+        evicted = []
+        for name, league in list(self.loaded.items()):
+            if not should_evict(league):
+                break
+            if league.active:
+                continue
+            del self.loaded[name]
+            self.closing[name] = threading.Event()
+            evicted.append(league)
+        return evicted
+
+    def _close(self, leagues):
+        for league in leagues:
+            try:
+                league.close()
+            finally:
+                with self.lock:
+                    event = self.closing.pop(league.name)
+                event.set()
+                print(f"💤 리그 '{league.name}'을(를) 메모리에서 내렸습니다")
+
+    def maintain(self):
+        """유휴 리그를 내리고, 압축 주기가 된 리그의 저널을 스냅샷으로 합침"""
+        now = time.monotonic()
+        with self.lock:
+            evicted = self._evict(lambda league: now - league.last_used >= self.idle_timeout)
+            due = [
+                league for league in [self.default] + list(self.loaded.values())
+                if now - league.last_compacted >= self.compact_interval
+            ]
+            for league in due:
+                league.active += 1
+        self._close(evicted)
+
+        for league in due:
+            try:
+                league.store.compact()
+            except Exception as e:
+                print(f"저널 압축 중 오류: {e}")
+            finally:
+                # 압축은 사용으로 치지 않음 (유휴 시간을 늘리지 않도록 release 대신 직접 되돌림)
+                with self.lock:
+                    league.active -= 1
+                    league.last_compacted = time.monotonic()
+
+    def start(self, check_interval=10):
+        """check_interval초마다 maintain을 실행하는 백그라운드 스레드 시작"""
+        def run():
+            while True:
+                time.sleep(check_interval)
+                try:
+                    self.maintain()
+                except Exception as e:
+                    print(f"리그 정리 중 오류: {e}")
+
+        self.thread = threading.Thread(target=run, name='league-maintenance')
+        self.thread.daemon = True
+        self.thread.start()
+
+    def close(self):
+        """종료 시 모든 리그의 남은 백업을 기록"""
+        with self.lock:
+            leagues = [self.default] + list(self.loaded.values())
+        for league in leagues:
+            if league.backups is not None:
+                league.backups.close()
@@ -2,17 +2,35 @@
 # -*- coding: utf-8 -*-
 
 import json
+import sys
 from collections import defaultdict, Counter
 
-def analyze_legacy_data():
-    """레거시 데이터 분석 및 랭킹 생성"""
+from columnar_store import ColumnarSnapshot
+from player_stats import empty_stats
+from ratings import RatingIndex
+from head_to_head import HeadToHeadIndex
+
+LEGACY_FILE = '/Users/kihokim/Documents/TFMCounter/terraforming_mars_legacy_2019-2022.json'
+
+def load_snapshot(path):
+    """JSON 파일은 읽어서 컬럼으로 변환하고, 컬럼형 스냅샷(.tfmc)은 mmap으로 바로 엶"""
+    if path.endswith('.tfmc'):
+        return ColumnarSnapshot.open(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return ColumnarSnapshot.from_data(json.load(f))
+
+def analyze_legacy_data(path=LEGACY_FILE):
+    """레거시 데이터 분석 및 랭킹 생성 (결과는 dict로 만들지 않고 컬럼에서 바로 집계)"""
     
     # 레거시 데이터 로드
-    with open('/Users/kihokim/Documents/TFMCounter/terraforming_mars_legacy_2019-2022.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    players = data['players']
-    games = data['games']
+    with load_snapshot(path) as snapshot:
+        print_analysis(snapshot)
+
+def print_analysis(snapshot):
+    players = snapshot.meta.get('players', [])
+    player_stats = snapshot.player_stats()
+    # 결과 한 건: (게임 번호, 플레이어, 기업, 점수, 메가크레딧, 순위)
+    results = list(snapshot.iter_results())
     
     print("🏆 테라포밍 마스 레거시 데이터 분석 (2019-2022)")
     print("=" * 60)
@@ -24,7 +42,7 @@ def analyze_legacy_data():
     # 승률 기준 정렬
     player_rankings = []
     for player in players:
-        stats = player['stats']
+        stats = player_stats.get(player['name']) or empty_stats()
         win_rate = (stats['wins'] / stats['totalGames'] * 100) if stats['totalGames'] > 0 else 0
         
         player_rankings.append({
@@ -47,6 +65,39 @@ def analyze_legacy_data():
               f"승률 {player['win_rate']:5.1f}% | "
               f"평균 {player['avg_score']:5.1f}점")
     
+    # 1-1. 레이팅 (상대의 실력까지 반영한 Elo, 게임 날짜 순으로 계산)
+    print("\n📈 Elo 레이팅")
+    print("-" * 40)
+    
+    ratings = RatingIndex()
+    ratings.rebuild({'games': list(snapshot.iter_games())})
+    for row in ratings.leaderboard()['ratings']:
+        history = ratings.history(row['name'])
+        recent = sum(change['change'] for change in history[-10:])
+        print(f"{row['rank']:2d}. {row['name']:8s} | "
+              f"{row['rating']:6.1f} | "
+              f"최고 {row['peak']:6.1f} | "
+              f"{row['games']:3d}게임 | "
+              f"최근 10게임 {recent:+5.1f}")
+    
+    # 1-2. 상대 전적 (같은 테이블에서 누가 더 높은 순위로 끝냈는지)
+    print("\n⚔️ 상대 전적 (같이 한 게임이 많은 순)")
+    print("-" * 40)
+    
+    head_to_head = HeadToHeadIndex()
+    head_to_head.rebuild({'games': list(snapshot.iter_games())})
+    rivalries = [
+        (record, name) for name in head_to_head.names
+        for record in head_to_head.row(name) or []
+        if name < record['opponent']
+    ]
+    rivalries.sort(key=lambda item: item[0]['games'], reverse=True)
+    for record, name in rivalries[:15]:
+        print(f"{name:8s} vs {record['opponent']:8s} | "
+              f"{record['games']:3d}게임 | "
+              f"{record['ahead']:3d} : {record['behind']:3d} | "
+              f"평균 점수 차 {record['averageMargin']:+5.1f}")
+    
     # 2. 기업별 랭킹
     print("\n🏢 역대 기업별 랭킹")
     print("-" * 40)
@@ -55,15 +106,14 @@ def analyze_legacy_data():
         'games': 0, 'wins': 0, 'total_score': 0, 'players': set()
     })
     
-    for game in games:
-        for result in game['results']:
-            corp = result['corporation'].upper().strip()
-            if corp and corp != 'NONE':
-                corp_stats[corp]['games'] += 1
-                corp_stats[corp]['total_score'] += result['score']
-                corp_stats[corp]['players'].add(result['playerName'])
-                if result['rank'] == 1:
-                    corp_stats[corp]['wins'] += 1
+    for _, player, corporation, score, _, rank in results:
+        corp = corporation.upper().strip()
+        if corp and corp != 'NONE':
+            corp_stats[corp]['games'] += 1
+            corp_stats[corp]['total_score'] += score
+            corp_stats[corp]['players'].add(player)
+            if rank == 1:
+                corp_stats[corp]['wins'] += 1
     
     # 기업 랭킹 계산
     corp_rankings = []
@@ -100,14 +150,12 @@ def analyze_legacy_data():
         'games': 0, 'wins': 0, 'total_score': 0
     }))
     
-    for game in games:
-        map_name = game['map']
-        for result in game['results']:
-            player = result['playerName']
-            map_player_stats[map_name][player]['games'] += 1
-            map_player_stats[map_name][player]['total_score'] += result['score']
-            if result['rank'] == 1:
-                map_player_stats[map_name][player]['wins'] += 1
+    for index, player, _, score, _, rank in results:
+        map_name = snapshot.game_map(index)
+        map_player_stats[map_name][player]['games'] += 1
+        map_player_stats[map_name][player]['total_score'] += score
+        if rank == 1:
+            map_player_stats[map_name][player]['wins'] += 1
     
     for map_name, player_stats in map_player_stats.items():
         print(f"\n📍 {map_name}")
@@ -141,11 +189,11 @@ def analyze_legacy_data():
     
     year_stats = defaultdict(lambda: {'games': 0, 'players': set()})
     
-    for game in games:
-        year = game.get('year', 2019)
+    for index in range(snapshot.game_count):
+        year = snapshot.game_year(index) or 2019
         year_stats[year]['games'] += 1
-        for result in game['results']:
-            year_stats[year]['players'].add(result['playerName'])
+    for index, player, _, _, _, _ in results:
+        year_stats[snapshot.game_year(index) or 2019]['players'].add(player)
     
     for year in sorted(year_stats.keys()):
         stats = year_stats[year]
@@ -156,32 +204,30 @@ def analyze_legacy_data():
     print("-" * 40)
     
     # 최고점수
-    highest_score = max(games, key=lambda g: max(r['score'] for r in g['results']))
-    best_result = max(highest_score['results'], key=lambda r: r['score'])
-    print(f"🎯 최고점수: {best_result['score']}점 - {best_result['playerName']} ({best_result['corporation']})")
+    _, best_player, best_corporation, best_score, _, _ = max(results, key=lambda r: r[3])
+    print(f"🎯 최고점수: {best_score}점 - {best_player} ({best_corporation})")
     
     # 최저점수
-    lowest_score = min(games, key=lambda g: min(r['score'] for r in g['results']))
-    worst_result = min(lowest_score['results'], key=lambda r: r['score'])
-    print(f"😅 최저점수: {worst_result['score']}점 - {worst_result['playerName']} ({worst_result['corporation']})")
+    _, worst_player, worst_corporation, worst_score, _, _ = min(results, key=lambda r: r[3])
+    print(f"😅 최저점수: {worst_score}점 - {worst_player} ({worst_corporation})")
     
     # 가장 많이 사용된 기업
     corp_usage = Counter()
-    for game in games:
-        for result in game['results']:
-            corp = result['corporation'].upper().strip()
-            if corp and corp != 'NONE':
-                corp_usage[corp] += 1
+    for _, _, corporation, _, _, _ in results:
+        corp = corporation.upper().strip()
+        if corp and corp != 'NONE':
+            corp_usage[corp] += 1
     
     most_used_corp = corp_usage.most_common(1)[0]
     print(f"🏢 최다 사용 기업: {most_used_corp[0]} ({most_used_corp[1]}회)")
     
     # 가장 많이 플레이된 맵
-    map_usage = Counter(game['map'] for game in games)
+    map_usage = Counter(snapshot.game_map(index) for index in range(snapshot.game_count))
     most_played_map = map_usage.most_common(1)[0]
     print(f"🗺️  최다 플레이 맵: {most_played_map[0]} ({most_played_map[1]}게임)")
     
-    print(f"\n✅ 총 {len(games)}게임, {len(players)}명의 플레이어 데이터 분석 완료!")
+    print(f"\n✅ 총 {snapshot.game_count}게임, {len(players)}명의 플레이어 데이터 분석 완료!")
 
 if __name__ == "__main__":
-    analyze_legacy_data()
+    # 분석할 파일 (JSON 또는 columnar_store.py로 만든 .tfmc)
+    analyze_legacy_data(sys.argv[1] if len(sys.argv) > 1 else LEGACY_FILE)
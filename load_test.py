@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+동기화 서버 부하 테스트
+
+임시 디렉토리에 가상 데이터셋을 만들고 sync_server.py를 띄운 뒤, 여러 기기가
+syncManager.js와 같은 방식(주기적으로 /api/sync 확인, 가끔 전체 데이터 저장)으로
+접속하는 상황을 흉내 내서 처리량, 응답 시간 백분위, 오류율, 저장 파일 증가량을 보고한다.
+
+    python3 load_test.py --games 10000 --devices 50 --duration 30 --poll-interval 0.2
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from player_stats import PlayerStatsAggregator
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sync_server.py')
+MAPS = ['THARSIS', 'HELLAS', 'ELYSIUM']
+CORPORATIONS = [
+    'CREDICOR', 'ECOLINE', 'HELION', 'INTERPLANETARY CINEMATICS', 'INVENTRIX', 'MINING GUILD',
+    'PHOBOLOG', 'SATURN SYSTEM', 'TERACTOR', 'THARSIS REPUBLIC', 'THORGATE', 'UNITED NATIONS MARS INITIATIVE'
+]
+CUBE_COLORS = ['red', 'green', 'blue', 'yellow', 'black']
+# 가상 게임 날짜를 고르게 퍼뜨릴 기간
+FIRST_DATE = date(2019, 1, 1)
+DATE_SPAN_DAYS = 6 * 365
+
+
+def make_game(rng, game_id, game_date, player_names):
+    """2~5인 게임 한 건 (점수 순으로 순위 지정)"""
+    names = rng.sample(player_names, rng.randint(2, min(5, len(player_names))))
+    colors = rng.sample(CUBE_COLORS, len(names))
+    results = [
+        {
+            'playerId': player_names.index(name) + 1,
+            'playerName': name,
+            'cubeColor': color,
+            'corporation': rng.choice(CORPORATIONS),
+            'score': rng.randint(50, 140),
+            'megacredits': rng.randint(0, 60)
+        }
+        for name, color in zip(names, colors)
+    ]
+    results.sort(key=lambda result: (result['score'], result['megacredits']), reverse=True)
+    for rank, result in enumerate(results, 1):
+        result['rank'] = rank
+    return {
+        'id': game_id,
+        'date': game_date.isoformat(),
+        'year': game_date.year,
+        'map': rng.choice(MAPS),
+        'results': results
+    }
+
+
+def make_dataset(game_count, player_count, seed=0):
+    """게임 game_count개, 플레이어 player_count명의 가상 데이터셋 (플레이어 통계 포함)"""
+    rng = random.Random(seed)
+    player_names = [f'플레이어{i + 1:02d}' for i in range(player_count)]
+    games = [
+        make_game(rng, i + 1, FIRST_DATE + timedelta(days=i * DATE_SPAN_DAYS // max(1, game_count)), player_names)
+        for i in range(game_count)
+    ]
+    data = {
+        'players': [{'id': i + 1, 'name': name, 'gameIds': [], 'stats': {}} for i, name in enumerate(player_names)],
+        'games': games,
+        'selectedMap': 'THARSIS',
+        'selectedColonies': []
+    }
+    return PlayerStatsAggregator().rebuild(data)
+
+
+def write_dataset(work_dir, data, storage):
+    """서버가 읽을 data/ 디렉토리 준비"""
+    data_dir = os.path.join(work_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    if storage == 'sqlite':
+        from sqlite_store import SqliteBackend
+        backend = SqliteBackend(os.path.join(data_dir, 'game_data.sqlite3'))
+        backend.write_snapshot(data)
+        backend.conn.close()
+    elif storage == 'columnar':
+        from columnar_store import write_columnar
+        write_columnar(os.path.join(data_dir, 'game_data.tfmc'), data)
+    else:
+        with open(os.path.join(data_dir, 'game_data.json'), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    return data_dir
+
+
+def directory_sizes(data_dir):
+    """data/ 아래 파일별 크기 (백업은 디렉토리 단위로 합산)"""
+    sizes = {}
+    for dirpath, _, filenames in os.walk(data_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, data_dir)
+            if name.startswith('backups' + os.sep):
+                name = 'backups/'
+            try:
+                sizes[name] = sizes.get(name, 0) + os.path.getsize(path)
+            except OSError:
+                pass
+    return sizes
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class LoadResults:
+    """요청 종류별 응답 시간과 오류 기록"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.statuses = {}
+        self.retries = {}
+
+    def record_retry(self, kind):
+        with self.lock:
+            self.retries[kind] = self.retries.get(kind, 0) + 1
+
+    def record(self, kind, latency, status=None, error=None):
+        with self.lock:
+            if error is None:
+                self.latencies.setdefault(kind, []).append(latency)
+                key = (kind, status)
+                self.statuses[key] = self.statuses.get(key, 0) + 1
+            else:
+                key = (kind, error)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def summary(self, elapsed):
+        kinds = {}
+        total = 0
+        total_errors = 0
+        for kind in sorted(set(self.latencies) | {kind for kind, _ in self.errors}):
+            values = sorted(self.latencies.get(kind, []))
+            errors = sum(count for (error_kind, _), count in self.errors.items() if error_kind == kind)
+            count = len(values) + errors
+            total += count
+            total_errors += errors
+            kinds[kind] = {
+                'requests': count,
+                'errors': errors,
+                'errorRate': round(errors / count, 4) if count else 0,
+                'throughput': round(count / elapsed, 1) if elapsed else 0,
+                'p50Ms': round(percentile(values, 0.50) * 1000, 2),
+                'p95Ms': round(percentile(values, 0.95) * 1000, 2),
+                'p99Ms': round(percentile(values, 0.99) * 1000, 2),
+                'maxMs': round(values[-1] * 1000, 2) if values else 0,
+                'retries': self.retries.get(kind, 0),
+                'statuses': {str(status): n for (status_kind, status), n in sorted(self.statuses.items()) if status_kind == kind}
+            }
+        return {
+            'requests': total,
+            'errors': total_errors,
+            'errorRate': round(total_errors / total, 4) if total else 0,
+            'throughput': round(total / elapsed, 1) if elapsed else 0,
+            'byKind': kinds,
+            'errorDetails': {f'{kind}:{error}': count for (kind, error), count in sorted(self.errors.items())}
+        }
+
+
+class SharedWrites:
+    """모든 기기가 함께 쓰는 전체 저장 본문 (기존 게임 JSON은 한 번만 직렬화해서 재사용)
+
+    기기는 자기 화면의 전체 데이터를 그대로 보내므로, 저장할 때마다 지금까지 추가된
+    게임을 모두 포함한 본문을 만든다 (저장 파일이 실제 사용처럼 점점 커짐).
+    """
+
+    def __init__(self, data, seed):
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed + 1)
+        self.player_names = [player['name'] for player in data['players']]
+        self.next_id = max((game['id'] for game in data['games']), default=0) + 1
+        self.next_date = FIRST_DATE + timedelta(days=DATE_SPAN_DAYS)
+        self.head = (
+            b'{"players":' + json.dumps(data['players'], ensure_ascii=False, separators=(',', ':')).encode('utf-8') +
+            b',"games":[' + b','.join(
+                json.dumps(game, ensure_ascii=False, separators=(',', ':')).encode('utf-8') for game in data['games']
+            )
+        )
+        self.added = []
+        self.tail = b'],"selectedMap":"THARSIS","selectedColonies":[]}'
+        self.has_games = bool(data['games'])
+
+    def new_game(self):
+        """게임 한 건을 추가하고 그 게임 반환"""
+        with self.lock:
+            game = make_game(self.rng, self.next_id, self.next_date, self.player_names)
+            self.next_id += 1
+            self.added.append(json.dumps(game, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            return game
+
+    def full_body(self):
+        with self.lock:
+            added = list(self.added)
+        separator = b',' if self.has_games else b''
+        parts = [self.head]
+        for i, game_bytes in enumerate(added):
+            parts.append(separator if i == 0 else b',')
+            parts.append(game_bytes)
+        parts.append(self.tail)
+        return b''.join(parts)
+
+
+class Device:
+    """syncManager.js 한 개를 흉내 내는 기기 (keep-alive 연결 하나 사용)"""
+
+    def __init__(self, number, args, results, writes, stop_at):
+        self.number = number
+        self.args = args
+        self.results = results
+        self.writes = writes
+        self.stop_at = stop_at
+        self.rng = random.Random(args.seed * 1000 + number)
+        self.conn = None
+        self.version = None
+        self.etags = {}
+
+    def request(self, kind, method, path, body=None):
+        """요청 한 건을 보내고 (상태 코드, 응답 JSON 또는 None) 반환. 오류는 기록하고 None"""
+        headers = {'Accept-Encoding': 'gzip'} if method == 'GET' else {'Content-Type': 'application/json'}
+        if method == 'GET' and path in self.etags:
+            # 브라우저 HTTP 캐시처럼 이전 ETag로 재검증
+            headers['If-None-Match'] = self.etags[path]
+        started = time.perf_counter()
+        for attempt in range(2):
+            reused = self.conn is not None
+            try:
+                if self.conn is None:
+                    self.conn = http.client.HTTPConnection('127.0.0.1', self.args.port, timeout=30)
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                payload = response.read()
+                latency = time.perf_counter() - started
+                if response.will_close:
+                    self.close()
+                break
+            except (ConnectionResetError, BrokenPipeError, http.client.RemoteDisconnected) as e:
+                self.close()
+                # 서버가 유휴 keep-alive 연결을 닫은 경우 브라우저처럼 새 연결로 한 번 다시 보냄
+                if reused and attempt == 0:
+                    self.results.record_retry(kind)
+                    continue
+                self.results.record(kind, time.perf_counter() - started, error=type(e).__name__)
+                return None, None
+            except (OSError, http.client.HTTPException) as e:
+                self.results.record(kind, time.perf_counter() - started, error=type(e).__name__)
+                self.close()
+                return None, None
+        if response.status >= 400:
+            self.results.record(kind, latency, error=f'HTTP {response.status}')
+            return response.status, None
+        self.results.record(kind, latency, status=response.status)
+        if method == 'GET' and response.getheader('ETag'):
+            self.etags[path] = response.getheader('ETag')
+        if response.status == 304 or not payload:
+            return response.status, None
+        if response.getheader('Content-Encoding') == 'gzip':
+            payload = gzip.decompress(payload)
+        return response.status, json.loads(payload.decode('utf-8'))
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def run(self):
+        # 페이지를 열 때처럼 전체 데이터를 한 번 받음
+        status, data = self.request('data', 'GET', '/api/data')
+        if data is not None:
+            self.version = data.get('dataVersion')
+
+        while time.time() < self.stop_at:
+            # setInterval 주기가 기기마다 조금씩 어긋나도록 흔들어 줌
+            interval = self.args.poll_interval
+            time.sleep(max(0, interval * self.rng.uniform(0.8, 1.2)))
+            if time.time() >= self.stop_at:
+                break
+
+            if self.rng.random() < self.args.write_ratio:
+                self.write()
+                continue
+
+            path = f'/api/sync?since={self.version}' if self.version is not None else '/api/sync?timestamp='
+            status, result = self.request('sync', 'GET', path)
+            if result is not None and isinstance(result.get('version'), int):
+                self.version = result['version']
+        self.close()
+
+    def write(self):
+        game = self.writes.new_game()
+        if self.args.write_mode == 'game':
+            body = json.dumps(game, ensure_ascii=False).encode('utf-8')
+            status, result = self.request('write', 'POST', '/api/games', body)
+        else:
+            status, result = self.request('write', 'POST', '/api/data', self.writes.full_body())
+        if result is not None and isinstance(result.get('version'), int):
+            self.version = result['version']
+
+
+def start_server(args, work_dir, log_file):
+    # 모든 기기가 127.0.0.1에서 접속하므로 클라이언트별 연결 제한을 기기 수에 맞춤 (--server-arg로 덮어쓸 수 있음)
+    command = [
+        sys.executable, SERVER_SCRIPT, '--port', str(args.port), '--storage', args.storage,
+        '--max-connections-per-client', str(max(8, args.devices + 4))
+    ] + args.server_args
+    process = subprocess.Popen(command, cwd=work_dir, stdout=log_file, stderr=subprocess.STDOUT)
+    deadline = time.time() + args.startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            return process, False
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', args.port, timeout=2)
+            conn.request('GET', '/api/sync')
+            conn.getresponse().read()
+            conn.close()
+            return process, True
+        except OSError:
+            time.sleep(0.2)
+    return process, False
+
+
+def stop_server(process):
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+
+
+def print_report(report):
+    load = report['load']
+    print("\n📊 부하 테스트 결과")
+    print(f"   데이터셋: 게임 {report['games']}개, 플레이어 {report['players']}명 ({report['storage']})")
+    print(f"   기기 {report['devices']}대, {report['duration']}초, 확인 주기 {report['pollInterval']}초, "
+          f"저장 비율 {report['writeRatio']} ({report['writeMode']})")
+    print(f"   전체: 요청 {load['requests']}건, {load['throughput']} req/s, 오류 {load['errors']}건 ({load['errorRate'] * 100:.2f}%)")
+    for kind, stats in load['byKind'].items():
+        print(f"   {kind:<6} {stats['requests']:>7}건 {stats['throughput']:>8} req/s | "
+              f"p50 {stats['p50Ms']}ms p95 {stats['p95Ms']}ms p99 {stats['p99Ms']}ms max {stats['maxMs']}ms | "
+              f"오류 {stats['errors']} (재시도 {stats['retries']}) | 상태 {stats['statuses']}")
+    for name, count in load['errorDetails'].items():
+        print(f"   ⚠️  {name}: {count}건")
+    print("   저장 파일:")
+    for name in sorted(set(report['filesBefore']) | set(report['filesAfter'])):
+        before = report['filesBefore'].get(name, 0)
+        after = report['filesAfter'].get(name, 0)
+        print(f"     {name:<28} {format_size(before):>9} → {format_size(after):>9} ({format_size(after - before)} 증가)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='테라포밍 마스 동기화 서버 부하 테스트')
+    parser.add_argument('--games', type=int, default=1000, help='가상 데이터셋의 게임 수 (기본값: 1000)')
+    parser.add_argument('--players', type=int, default=12, help='가상 데이터셋의 플레이어 수 (기본값: 12)')
+    parser.add_argument('--devices', type=int, default=20, help='동시에 접속하는 기기 수 (기본값: 20)')
+    parser.add_argument('--duration', type=float, default=30, help='측정 시간(초) (기본값: 30)')
+    parser.add_argument('--poll-interval', type=float, default=3.0,
+                        help='기기별 /api/sync 확인 주기(초), syncManager.js는 3초 (기본값: 3.0)')
+    parser.add_argument('--write-ratio', type=float, default=0.02,
+                        help='확인 대신 저장하는 비율 (기본값: 0.02)')
+    parser.add_argument('--write-mode', choices=['full', 'game'], default='full',
+                        help='full: POST /api/data로 전체 저장 (기존 방식), game: POST /api/games로 한 건만 (기본값: full)')
+    parser.add_argument('--storage', choices=['json', 'sqlite', 'columnar'], default='json', help='서버 저장 방식 (기본값: json)')
+    parser.add_argument('--port', type=int, default=3099, help='테스트 서버 포트 (기본값: 3099)')
+    parser.add_argument('--seed', type=int, default=0, help='가상 데이터와 요청 순서의 난수 시드 (기본값: 0)')
+    parser.add_argument('--startup-timeout', type=float, default=60, help='서버 시작 대기 시간(초) (기본값: 60)')
+    parser.add_argument('--server-arg', dest='server_args', action='append', default=[],
+                        help='sync_server.py에 그대로 넘길 옵션 (예: --server-arg=--workers=32), 여러 번 사용 가능')
+    parser.add_argument('--output', help='결과를 JSON으로 저장할 파일 (회귀 비교용)')
+    parser.add_argument('--keep-dir', action='store_true', help='테스트가 끝나도 임시 디렉토리(데이터, 서버 로그)를 지우지 않음')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    work_dir = tempfile.mkdtemp(prefix='tfm_load_')
+    print(f"🧪 가상 데이터셋 생성 중: 게임 {args.games}개, 플레이어 {args.players}명")
+    data = make_dataset(args.games, args.players, args.seed)
+    data_dir = write_dataset(work_dir, data, args.storage)
+    writes = SharedWrites(data, args.seed)
+    del data
+    files_before = directory_sizes(data_dir)
+
+    log_path = os.path.join(work_dir, 'server.log')
+    process = None
+    try:
+        with open(log_path, 'wb') as log_file:
+            print(f"🚀 서버 시작: 포트 {args.port} ({work_dir})")
+            process, ready = start_server(args, work_dir, log_file)
+            if not ready:
+                print("❌ 서버가 시작되지 않았습니다. 서버 로그:")
+                log_file.flush()
+                with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+                    print(f.read()[-2000:])
+                sys.exit(1)
+
+            results = LoadResults()
+            stop_at = time.time() + args.duration
+            devices = [Device(i, args, results, writes, stop_at) for i in range(args.devices)]
+            threads = [threading.Thread(target=device.run, name=f'device-{device.number}') for device in devices]
+            print(f"📱 기기 {args.devices}대로 {args.duration:g}초 동안 측정합니다...")
+            started = time.time()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.time() - started
+        stop_server(process)
+
+        report = {
+            'games': args.games,
+            'players': args.players,
+            'storage': args.storage,
+            'devices': args.devices,
+            'duration': round(elapsed, 1),
+            'pollInterval': args.poll_interval,
+            'writeRatio': args.write_ratio,
+            'writeMode': args.write_mode,
+            'load': results.summary(elapsed),
+            'filesBefore': files_before,
+            'filesAfter': directory_sizes(data_dir)
+        }
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"💾 결과 저장: {args.output}")
+    finally:
+        if process is not None:
+            stop_server(process)
+        if args.keep_dir:
+            print(f"📁 테스트 디렉토리: {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# 응답 시간, JSON 처리, 디스크 쓰기 등에 공통으로 쓰는 히스토그램 구간(초)
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# /api/metrics에 함께 내보내는 추정 백분위
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 이름: (종류, 설명)
+METRIC_DEFINITIONS = {
+    'sync_requests_total': ('counter', '처리한 HTTP 요청 수'),
+    'sync_request_duration_seconds': ('histogram', '요청 처리 시간'),
+    'sync_response_bytes_total': ('counter', '응답 본문 바이트 수'),
+    'sync_json_decode_seconds': ('histogram', 'JSON 파싱(json.load/json.loads)에 쓴 시간'),
+    'sync_json_encode_seconds': ('histogram', 'JSON 직렬화(json.dumps)에 쓴 시간'),
+    'sync_disk_write_seconds': ('histogram', '디스크 쓰기(fsync 포함)에 쓴 시간'),
+    'sync_disk_write_bytes_total': ('counter', '디스크에 쓴 바이트 수'),
+    'sync_backup_duration_seconds': ('histogram', '백업 한 건(압축, 기록, 정리)에 걸린 시간'),
+    'sync_cache_requests_total': ('counter', '캐시 조회 수 (result=hit|miss)'),
+}
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram과 같은 le 구간)"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """구간 안에서 선형 보간한 백분위 추정값 (histogram_quantile과 같은 방식)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    return float(self.buckets[-1])
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return float(self.buckets[-1])
+
+
+class MetricsRegistry:
+    """요청/저장 경로의 카운터와 히스토그램을 모아서 Prometheus 텍스트 형식으로 내보냄
+
+    기록 한 번은 잠금 한 번과 사전 조회 정도라서 운영 중에도 켜 둘 수 있다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.gauges = {}
+        self.started = time.time()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, name, **labels):
+        """with 블록에 걸린 시간을 히스토그램에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def add_gauge(self, name, description, read):
+        """내보낼 때마다 read()로 현재 값을 읽는 게이지 등록"""
+        self.gauges[name] = (description, read)
+
+    def render(self):
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {
+                key: (list(histogram.counts), histogram.sum, histogram.count,
+                      [histogram.quantile(q) for q in QUANTILES])
+                for key, histogram in self.histograms.items()
+            }
+
+        lines = []
+
+        def header(name, kind, description):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        for name, (kind, description) in METRIC_DEFINITIONS.items():
+            if kind == 'counter':
+                series = sorted((labels, value) for (key, labels), value in counters.items() if key == name)
+                if not series:
+                    continue
+                header(name, kind, description)
+                for labels, value in series:
+                    lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                continue
+
+            series = sorted((labels, value) for (key, labels), value in histograms.items() if key == name)
+            if not series:
+                continue
+            header(name, kind, description)
+            for labels, (counts, total, count, _) in series:
+                cumulative = 0
+                for bound, bucket_count in zip(DURATION_BUCKETS + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    bucket_labels = labels + (('le', format_value(float(bound))),)
+                    lines.append(f'{name}_bucket{format_labels(bucket_labels)} {cumulative}')
+                lines.append(f'{name}_sum{format_labels(labels)} {format_value(total)}')
+                lines.append(f'{name}_count{format_labels(labels)} {count}')
+            # 대시보드 없이도 바로 볼 수 있도록 구간에서 추정한 p50/p95/p99를 게이지로 함께 내보냄
+            quantile_name = name.replace('_seconds', '_quantile_seconds')
+            header(quantile_name, 'gauge', f'{description} 추정 백분위')
+            for labels, (_, _, _, quantiles) in series:
+                for q, value in zip(QUANTILES, quantiles):
+                    lines.append(f'{quantile_name}{format_labels(labels + (("quantile", str(q)),))} {format_value(value)}')
+
+        header('sync_uptime_seconds', 'gauge', '서버 시작 후 경과 시간')
+        lines.append(f'sync_uptime_seconds {format_value(time.time() - self.started)}')
+        for name, (description, read) in self.gauges.items():
+            try:
+                value = read()
+            except Exception:
+                continue
+            header(name, 'gauge', description)
+            lines.append(f'{name} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# 프로세스 전체에서 공유하는 기본 레지스트리
+METRICS = MetricsRegistry()
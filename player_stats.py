@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+RANK_FIELDS = {1: 'wins', 2: 'seconds', 3: 'thirds', 4: 'fourths'}
+
+
+def empty_stats():
+    return {
+        'totalGames': 0,
+        'totalScore': 0,
+        'averageScore': 0,
+        'wins': 0,
+        'seconds': 0,
+        'thirds': 0,
+        'fourths': 0
+    }
+
+
+def apply_result(stats, result, sign):
+    """결과 한 건을 통계에 더하거나(sign=1) 뺌(sign=-1)"""
+    stats['totalGames'] += sign
+    stats['totalScore'] += sign * (result.get('score') or 0)
+    field = RANK_FIELDS.get(result.get('rank'))
+    if field:
+        stats[field] += sign
+
+
+def finish_stats(stats):
+    """평균 점수 다시 계산"""
+    if stats['totalGames'] > 0:
+        stats['averageScore'] = round(stats['totalScore'] / stats['totalGames'], 1)
+    else:
+        stats['averageScore'] = 0
+
+
+def without_games(player):
+    """예전 형식의 결과 사본 목록(player['games'])을 뺀 플레이어 레코드"""
+    return {key: value for key, value in player.items() if key != 'games'}
+
+
+def remove_game_id(game_ids, game_id):
+    """같은 id가 여러 개면 가장 최근 것부터 제거"""
+    for i in range(len(game_ids) - 1, -1, -1):
+        if game_ids[i] == game_id:
+            del game_ids[i]
+            return
+
+
+def insert_game_id(game_ids, game_id, positions):
+    """data['games'] 순서(positions: 게임 id→위치)를 유지하도록 게임 id 삽입"""
+    position = positions.get(game_id, len(positions))
+    at = len(game_ids)
+    while at > 0 and positions.get(game_ids[at - 1], -1) > position:
+        at -= 1
+    game_ids.insert(at, game_id)
+
+
+def player_games(player, games_by_key):
+    """gameIds로 예전 형식의 플레이어 결과 목록(player['games'])을 만듦
+
+    games_by_key는 게임 id→게임 (DateIndex.games 등). 없는 id는 건너뛴다.
+    """
+    results = []
+    name = player.get('name')
+    for game_id in player.get('gameIds', []):
+        game = games_by_key.get(game_id)
+        if game is None:
+            continue
+        results.extend(result for result in game.get('results', []) if result.get('playerName') == name)
+    return results
+
+
+def expand_player_games(data, games_by_key=None):
+    """플레이어마다 games 목록을 채운 예전 형식의 데이터셋 (player.games를 읽는 클라이언트용)"""
+    if games_by_key is None:
+        games_by_key = {game.get('id'): game for game in data.get('games', [])}
+    expanded = dict(data)
+    expanded['players'] = [
+        dict(player, games=player_games(player, games_by_key)) for player in data.get('players', [])
+    ]
+    return expanded
+
+
+class PlayerStatsAggregator:
+    """이름→플레이어 위치 색인으로 플레이어 통계(stats)와 게임 id 목록(gameIds)을 유지
+
+    결과 본문은 data['games']에만 두고 플레이어 레코드에는 참조(게임 id)만 저장한다.
+    gameIds는 항상 data['games'] 순서를 따르므로 증분 갱신 결과와 다시 읽은 결과가 같다.
+
+    게임 한 건이 추가/수정/삭제될 때는 그 게임에 나온 플레이어만 갱신하고,
+    전체 재계산도 같은 색인을 사용해서 결과 수에 비례하는 시간에 끝낸다.
+    """
+
+    def __init__(self):
+        self._players = None
+        self._index = {}
+
+    def index_for(self, players):
+        """players 목록의 이름→위치 색인 (같은 목록이면 다시 만들지 않음)"""
+        if players is not self._players:
+            self._players = players
+            self._index = {player.get('name'): i for i, player in enumerate(players)}
+        return self._index
+
+    def apply_game(self, data, old_game, new_game):
+        """old_game을 빼고 new_game을 더해서 바뀐 플레이어 목록 반환 (추가는 old_game=None, 삭제는 new_game=None)
+
+        data['games']에는 이미 변경이 반영되어 있어야 한다 (추가된 게임은 맨 뒤, 수정된 게임은 같은 위치).
+        data['players']는 다른 요청이 읽고 있을 수 있으므로 바뀐 플레이어만 복사한 새 목록으로 교체한다.
+        """
+        players = data.get('players', [])
+        index = self.index_for(players)
+        touched = {}
+
+        def player_copy(name):
+            position = index.get(name)
+            if position is None:
+                return None
+            if position not in touched:
+                player = players[position]
+                touched[position] = dict(
+                    without_games(player),
+                    stats=dict(player.get('stats') or empty_stats()),
+                    gameIds=list(player.get('gameIds') or [])
+                )
+            return touched[position]
+
+        old_results = (old_game or {}).get('results', [])
+        new_results = (new_game or {}).get('results', [])
+        old_id = (old_game or {}).get('id')
+        new_id = (new_game or {}).get('id')
+        # 수정 전후에 모두 나온 플레이어는 게임 id 목록의 위치를 그대로 둠
+        kept = set()
+        if old_game is not None and new_game is not None and old_id == new_id:
+            kept = {result.get('playerName') for result in old_results} & \
+                   {result.get('playerName') for result in new_results}
+
+        for result in old_results:
+            player = player_copy(result.get('playerName'))
+            if player is None:
+                continue
+            apply_result(player['stats'], result, -1)
+            if player['name'] not in kept:
+                remove_game_id(player['gameIds'], old_id)
+
+        positions = None
+        for result in new_results:
+            player = player_copy(result.get('playerName'))
+            if player is None:
+                continue
+            apply_result(player['stats'], result, 1)
+            if player['name'] in kept:
+                continue
+            if old_game is None:
+                # 추가된 게임은 data['games']의 맨 뒤
+                player['gameIds'].append(new_id)
+            else:
+                # 수정으로 새로 참여한 플레이어는 게임 위치에 맞춰 끼워 넣음 (드문 경우라 위치 색인은 이때만 만듦)
+                if positions is None:
+                    positions = {game.get('id'): i for i, game in enumerate(data.get('games', []))}
+                insert_game_id(player['gameIds'], new_id, positions)
+
+        if not touched:
+            return []
+        new_players = list(players)
+        for position, player in touched.items():
+            finish_stats(player['stats'])
+            new_players[position] = player
+        data['players'] = new_players
+        # 위치는 그대로이므로 색인을 새 목록에 그대로 사용
+        self._players = new_players
+        return [new_players[position] for position in sorted(touched)]
+
+    def rebuild(self, data):
+        """게임 기록으로부터 모든 플레이어 통계를 다시 계산한 새 데이터셋 반환 (원본은 수정하지 않음)"""
+        new_data = dict(data)
+        players = [dict(without_games(player), gameIds=[], stats=empty_stats()) for player in data.get('players', [])]
+        new_data['players'] = players
+        index = self.index_for(players)
+
+        for game in data.get('games', []):
+            for result in game.get('results', []):
+                position = index.get(result.get('playerName'))
+                if position is None:
+                    continue
+                player = players[position]
+                player['gameIds'].append(game.get('id'))
+                apply_result(player['stats'], result, 1)
+
+        for player in players:
+            finish_stats(player['stats'])
+        return new_data
+
+    def link_games(self, data):
+        """통계는 그대로 두고 게임 id 목록만 게임 기록으로부터 다시 만든 새 데이터셋 반환
+
+        예전 형식처럼 플레이어에 결과 사본(games)이 들어 있으면 제거한다.
+        """
+        new_data = dict(data)
+        players = [dict(without_games(player), gameIds=[]) for player in data.get('players', [])]
+        new_data['players'] = players
+        index = self.index_for(players)
+
+        for game in data.get('games', []):
+            for result in game.get('results', []):
+                position = index.get(result.get('playerName'))
+                if position is not None:
+                    players[position]['gameIds'].append(game.get('id'))
+        return new_data
+
+
+def count_mismatches(old_players, new_players):
+    """재계산 전후 통계가 다른 플레이어 수 (증분 유지가 맞았는지 확인용)"""
+    old_stats = {player.get('name'): player.get('stats') for player in old_players}
+    return sum(1 for player in new_players if old_stats.get(player.get('name')) != player['stats'])
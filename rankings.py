@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import Counter, defaultdict
+
+# legacy_analysis.py 와 같은 최소 게임 수 기준
+MIN_CORPORATION_GAMES = 3
+MIN_MAP_PLAYER_GAMES = 2
+
+
+def normalize_corporation(name):
+    """기업 이름 정규화 (대소문자/공백 차이 무시). 기업 정보가 없으면 빈 문자열"""
+    corporation = (name or '').upper().strip()
+    return '' if corporation == 'NONE' else corporation
+
+
+def win_rate(wins, games):
+    return round(wins / games * 100, 1) if games else 0
+
+
+def average(total, games):
+    return round(total / games, 1) if games else 0
+
+
+def new_counter():
+    return {'games': 0, 'wins': 0, 'seconds': 0, 'thirds': 0, 'totalScore': 0, 'scores': Counter(), 'players': Counter()}
+
+
+def count_result(counter, result, sign):
+    """결과 한 건을 집계에 더하거나(sign=1) 뺌(sign=-1)"""
+    score = result.get('score') or 0
+    counter['games'] += sign
+    counter['totalScore'] += sign * score
+    rank = result.get('rank')
+    if rank == 1:
+        counter['wins'] += sign
+    elif rank == 2:
+        counter['seconds'] += sign
+    elif rank == 3:
+        counter['thirds'] += sign
+    # 삭제 시에도 최고/최저 점수와 사용자 수를 되돌릴 수 있도록 개수로 보관
+    counter['scores'][score] += sign
+    counter['players'][result.get('playerName')] += sign
+    if counter['scores'][score] <= 0:
+        del counter['scores'][score]
+    if counter['players'][result.get('playerName')] <= 0:
+        del counter['players'][result.get('playerName')]
+
+
+def summarize(name, counter):
+    games = counter['games']
+    return {
+        'name': name,
+        'totalGames': games,
+        'wins': counter['wins'],
+        'seconds': counter['seconds'],
+        'thirds': counter['thirds'],
+        'winRate': win_rate(counter['wins'], games),
+        'averageScore': average(counter['totalScore'], games),
+        'bestScore': max(counter['scores']) if counter['scores'] else 0,
+        'worstScore': min(counter['scores']) if counter['scores'] else 0,
+        'playersCount': len(counter['players'])
+    }
+
+
+def with_rank(rows):
+    for position, row in enumerate(rows, 1):
+        row['rank'] = position
+    return rows
+
+
+class RankingIndex:
+    """기업별/맵별 집계를 게임 단위로 증분 유지하는 색인 (GameStore.add_index로 등록)"""
+
+    def __init__(self):
+        self.corporations = defaultdict(new_counter)
+        self.maps = defaultdict(lambda: {'games': 0, 'totalScore': 0, 'results': 0, 'scores': Counter(),
+                                         'players': defaultdict(new_counter)})
+
+    def rebuild(self, data):
+        self.corporations.clear()
+        self.maps.clear()
+        for game in data.get('games', []):
+            self.apply_game(None, game)
+
+    def apply_game(self, old_game, new_game):
+        """old_game 집계를 빼고 new_game 집계를 더함 (추가는 old_game=None, 삭제는 new_game=None)"""
+        if old_game is not None:
+            self._count_game(old_game, -1)
+        if new_game is not None:
+            self._count_game(new_game, 1)
+
+    def _count_game(self, game, sign):
+        map_name = game.get('map') or ''
+        map_stats = self.maps[map_name]
+        map_stats['games'] += sign
+        for result in game.get('results', []):
+            corporation = normalize_corporation(result.get('corporation'))
+            if corporation:
+                count_result(self.corporations[corporation], result, sign)
+                if self.corporations[corporation]['games'] <= 0:
+                    del self.corporations[corporation]
+
+            score = result.get('score') or 0
+            map_stats['totalScore'] += sign * score
+            map_stats['results'] += sign
+            map_stats['scores'][score] += sign
+            if map_stats['scores'][score] <= 0:
+                del map_stats['scores'][score]
+            player_name = result.get('playerName')
+            count_result(map_stats['players'][player_name], result, sign)
+            if map_stats['players'][player_name]['games'] <= 0:
+                del map_stats['players'][player_name]
+        if map_stats['games'] <= 0:
+            del self.maps[map_name]
+
+    def corporation_rankings(self, data):
+        """최소 3게임 이상 사용된 기업을 승률 → 평균 점수 순으로 정렬"""
+        rows = [
+            summarize(name, counter) for name, counter in self.corporations.items()
+            if counter['games'] >= MIN_CORPORATION_GAMES
+        ]
+        rows.sort(key=lambda row: (row['winRate'], row['averageScore']), reverse=True)
+        return {'minGames': MIN_CORPORATION_GAMES, 'rankings': with_rank(rows)}
+
+    def map_rankings(self, data):
+        """맵별 전체 통계와, 그 맵에서 2게임 이상 한 플레이어를 승수 → 승률 → 평균 점수 순으로 정렬"""
+        maps = []
+        for map_name, map_stats in self.maps.items():
+            players = [
+                summarize(name, counter) for name, counter in map_stats['players'].items()
+                if counter['games'] >= MIN_MAP_PLAYER_GAMES
+            ]
+            players.sort(key=lambda row: (row['wins'], row['winRate'], row['averageScore']), reverse=True)
+            maps.append({
+                'map': map_name,
+                'totalGames': map_stats['games'],
+                'averageScore': average(map_stats['totalScore'], map_stats['results']),
+                'highestScore': max(map_stats['scores']) if map_stats['scores'] else 0,
+                'lowestScore': min(map_stats['scores']) if map_stats['scores'] else 0,
+                'rankings': with_rank(players)
+            })
+        maps.sort(key=lambda row: row['totalGames'], reverse=True)
+        return {'minGames': MIN_MAP_PLAYER_GAMES, 'maps': maps}
+
+
+def player_rankings(data):
+    """플레이어 통계(증분 유지됨)를 승수 → 승률 → 평균 점수 순으로 정렬"""
+    rows = []
+    for player in data.get('players', []):
+        stats = player.get('stats') or {}
+        games = stats.get('totalGames', 0)
+        rows.append({
+            'name': player.get('name'),
+            'totalGames': games,
+            'wins': stats.get('wins', 0),
+            'seconds': stats.get('seconds', 0),
+            'thirds': stats.get('thirds', 0),
+            'fourths': stats.get('fourths', 0),
+            'winRate': win_rate(stats.get('wins', 0), games),
+            'averageScore': stats.get('averageScore', 0)
+        })
+    rows.sort(key=lambda row: (row['wins'], row['winRate'], row['averageScore']), reverse=True)
+    return {'rankings': with_rank(rows)}
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_left
+
+from date_index import date_ordinal
+from game_store import game_key
+
+# 처음 게임하는 플레이어의 레이팅
+DEFAULT_RATING = 1500
+# 게임 한 건에서 움직일 수 있는 최대 레이팅 (상대 수로 나눠서 적용)
+K_FACTOR = 32
+# 이 게임 수마다 레이팅 상태를 저장해 두고, 과거 게임이 바뀌면 가장 가까운 체크포인트부터 다시 계산
+CHECKPOINT_INTERVAL = 200
+
+
+def expected_score(rating, opponent):
+    """rating이 opponent를 이길 확률 (Elo)"""
+    return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+
+def rate_game(ratings, results, k_factor=K_FACTOR):
+    """게임 한 건의 레이팅 변화 [(이름, 이전, 이후)]
+
+    같은 테이블의 모든 상대와 1:1로 비교한 Elo를 상대 수로 나눠서 적용한다 (순위가 같으면 무승부).
+    ratings는 이름→현재 레이팅이며 수정하지 않는다.
+    """
+    players = []
+    seen = set()
+    for result in results:
+        name = result.get('playerName')
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        players.append((name, result.get('rank') or float('inf')))
+    if len(players) < 2:
+        return []
+
+    before = {name: ratings.get(name, DEFAULT_RATING) for name, _ in players}
+    scale = k_factor / (len(players) - 1)
+    changes = []
+    for name, rank in players:
+        delta = 0
+        for other, other_rank in players:
+            if other == name:
+                continue
+            actual = 1 if rank < other_rank else 0.5 if rank == other_rank else 0
+            delta += actual - expected_score(before[name], before[other])
+        changes.append((name, before[name], before[name] + scale * delta))
+    return changes
+
+
+class RatingIndex:
+    """게임 날짜 순으로 플레이어 레이팅을 유지하는 색인 (GameStore.add_index로 등록)
+
+    가장 최근 날짜의 게임이 추가되면 그 게임의 플레이어만 O(플레이어 수)로 갱신하고,
+    과거 게임이 추가/수정/삭제되면 그 앞의 가장 가까운 체크포인트부터 끝까지 다시 계산한다.
+    같은 날짜의 게임은 데이터에 들어온 순서를 따른다.
+    """
+
+    def __init__(self, checkpoint_interval=CHECKPOINT_INTERVAL, k_factor=K_FACTOR):
+        self.checkpoint_interval = checkpoint_interval
+        self.k_factor = k_factor
+        self.rebuild({})
+
+    def rebuild(self, data):
+        # 날짜 순 (서수, 순번, 키)와 같은 위치의 레이팅 변화
+        self.entries = []
+        self.changes = []
+        self.games = {}
+        self.positions = {}
+        # 게임 객체 → 키 (id가 없는 게임도 삭제할 때 rebuild에서 만든 키를 찾을 수 있도록)
+        self.object_keys = {}
+        for index, game in enumerate(data.get('games', [])):
+            key = game_key(game, index)
+            self.object_keys[id(game)] = key
+            entry = (date_ordinal(game.get('date')), index, key)
+            self.entries.append(entry)
+            self.games[key] = game
+            self.positions[key] = entry
+        self.entries.sort()
+        self.changes = [None] * len(self.entries)
+        self.next_seq = len(self.entries)
+        # k번째 체크포인트: 위치 k * checkpoint_interval의 게임 직전 (레이팅, 게임 수)
+        self.checkpoints = [({}, {})]
+        self.replay(0)
+
+    def apply_game(self, old_game, new_game):
+        position = None
+        seq = None
+        if old_game is not None:
+            key = self.object_keys.pop(id(old_game), None)
+            entry = self.positions.pop(key, None)
+            if entry is not None:
+                # 수정된 게임은 같은 날짜 안의 순서를 유지
+                seq = entry[1]
+                position = bisect_left(self.entries, entry)
+                del self.entries[position]
+                del self.changes[position]
+                del self.games[key]
+        if new_game is not None:
+            if seq is None:
+                seq = self.next_seq
+                self.next_seq += 1
+            key = game_key(new_game, seq)
+            self.object_keys[id(new_game)] = key
+            entry = (date_ordinal(new_game.get('date')), seq, key)
+            index = bisect_left(self.entries, entry)
+            self.entries.insert(index, entry)
+            self.changes.insert(index, None)
+            self.games[key] = new_game
+            self.positions[key] = entry
+            if position is None and index == len(self.entries) - 1:
+                # 가장 최근 게임이 추가된 경우: 현재 상태에 이 게임만 반영
+                self.rate(index)
+                return
+            position = index if position is None else min(position, index)
+        if position is not None:
+            self.replay(position)
+
+    def rate(self, position):
+        """position의 게임을 현재 레이팅에 반영 (앞의 게임은 모두 반영된 상태여야 함)"""
+        changes = rate_game(self.ratings, self.games[self.entries[position][2]].get('results', []), self.k_factor)
+        for name, _, after in changes:
+            self.ratings[name] = after
+            self.game_counts[name] = self.game_counts.get(name, 0) + 1
+        self.changes[position] = changes
+        if (position + 1) % self.checkpoint_interval == 0:
+            self.checkpoints.append((dict(self.ratings), dict(self.game_counts)))
+
+    def replay(self, position):
+        """position 앞의 가장 가까운 체크포인트에서 상태를 되살려 끝까지 다시 계산. 다시 계산한 게임 수 반환"""
+        checkpoint = min(position // self.checkpoint_interval, len(self.checkpoints) - 1)
+        del self.checkpoints[checkpoint + 1:]
+        ratings, game_counts = self.checkpoints[checkpoint]
+        self.ratings = dict(ratings)
+        self.game_counts = dict(game_counts)
+        start = checkpoint * self.checkpoint_interval
+        for i in range(start, len(self.entries)):
+            self.rate(i)
+        return len(self.entries) - start
+
+    def leaderboard(self, data=None):
+        """현재 레이팅 순위 (최고 레이팅 포함)"""
+        peaks = {}
+        for changes in self.changes:
+            for name, _, after in changes:
+                if after > peaks.get(name, DEFAULT_RATING):
+                    peaks[name] = after
+        rows = sorted(self.ratings.items(), key=lambda item: item[1], reverse=True)
+        return {
+            'ratings': [
+                {
+                    'rank': position,
+                    'name': name,
+                    'rating': round(rating, 1),
+                    'peak': round(peaks.get(name, DEFAULT_RATING), 1),
+                    'games': self.game_counts.get(name, 0)
+                }
+                for position, (name, rating) in enumerate(rows, 1)
+            ],
+            'initialRating': DEFAULT_RATING,
+            'kFactor': self.k_factor
+        }
+
+    def history(self, name):
+        """플레이어의 게임별 레이팅 변화 (날짜 순). 게임이 없으면 빈 목록"""
+        rows = []
+        for (_, _, key), changes in zip(self.entries, self.changes):
+            for player, before, after in changes:
+                if player == name:
+                    game = self.games[key]
+                    rows.append({
+                        'gameId': game.get('id'),
+                        'date': game.get('date'),
+                        'before': round(before, 1),
+                        'after': round(after, 1),
+                        'change': round(after - before, 1)
+                    })
+                    break
+        return rows
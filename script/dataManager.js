@@ -83,12 +83,23 @@ TerraformingMarsTracker.prototype.importData = function(event) {
     event.target.value = '';
 };
 
+// 접속 주소의 리그 이름 (?league=이름, 없으면 기본 리그)
+TerraformingMarsTracker.prototype.getLeagueName = function() {
+    return new URLSearchParams(window.location.search).get('league') || '';
+};
+
+// 리그마다 로컬 저장소를 따로 씀
+TerraformingMarsTracker.prototype.getStorageKey = function() {
+    const league = this.getLeagueName();
+    return league ? `terraformingMarsData:${league}` : 'terraformingMarsData';
+};
+
 TerraformingMarsTracker.prototype.saveData = function() {
     const data = {
         players: this.players,
         games: this.games
     };
-    localStorage.setItem('terraformingMarsData', JSON.stringify(data));
+    localStorage.setItem(this.getStorageKey(), JSON.stringify(data));
 };
 
 TerraformingMarsTracker.prototype.loadData = function() {
@@ -98,7 +109,7 @@ TerraformingMarsTracker.prototype.loadData = function() {
         return;
     }
     
-    const savedData = localStorage.getItem('terraformingMarsData');
+    const savedData = localStorage.getItem(this.getStorageKey());
     if (savedData) {
         try {
             const data = JSON.parse(savedData);
@@ -223,7 +234,7 @@ TerraformingMarsTracker.prototype.syncToServerAndWait = function(type) {
     
     console.log('서버로 데이터 전송 (대기):', type, fullData);
     
-    fetch(`${this.syncServerUrl}/api/data`, {
+    fetch(`${this.syncApiUrl}/data`, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
@@ -244,6 +255,9 @@ TerraformingMarsTracker.prototype.syncToServerAndWait = function(type) {
         if (result.lastUpdated) {
             this.lastSyncTimestamp = result.lastUpdated;
         }
+        if (typeof result.version === 'number') {
+            this.syncVersion = result.version;
+        }
         
         this.isSyncingToServer = false;
         
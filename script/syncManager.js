@@ -14,8 +14,13 @@ TerraformingMarsTracker.prototype.initializeSync = function() {
         // 기타 환경
         this.syncServerUrl = `${window.location.protocol}//${currentHost}${currentPort ? ':' + currentPort : ''}`;
     }
-    console.log('동기화 서버 URL:', this.syncServerUrl);
+    // ?league=이름 으로 접속하면 동기화 서버의 해당 리그(/api/<리그>/...)를 사용
+    const league = this.getLeagueName();
+    this.syncApiUrl = league ? `${this.syncServerUrl}/api/${encodeURIComponent(league)}` : `${this.syncServerUrl}/api`;
+    console.log('동기화 서버 URL:', this.syncApiUrl);
     this.lastSyncTimestamp = null;
+    // 동기화 서버의 데이터셋 버전 (알고 있으면 변경분만 받아옴)
+    this.syncVersion = null;
     this.syncInterval = null;
     
     // 연결 상태 표시 (제거됨)
@@ -25,6 +30,9 @@ TerraformingMarsTracker.prototype.initializeSync = function() {
     
     // 주기적 동기화 시작 (3초마다)
     this.startPeriodicSync();
+    
+    // 서버 푸시(SSE)가 가능하면 폴링 대신 사용
+    this.startEventStream();
 };
 
 // 동기화 상태 표시기 생성
@@ -111,6 +119,9 @@ TerraformingMarsTracker.prototype.handleServerDataUpdate = function(data) {
         this.players = data.players;
         this.games = data.games;
         this.lastSyncTimestamp = data.lastUpdated;
+        if (typeof data.dataVersion === 'number') {
+            this.syncVersion = data.dataVersion;
+        }
         
         // 선택된 맵 복원 (''도 유효한 "선택 안 함" 상태)
         if (data.selectedMap !== undefined && data.selectedMap !== null) {
@@ -150,9 +161,9 @@ TerraformingMarsTracker.prototype.handleServerDataUpdate = function(data) {
         
         console.log(`플레이어: ${oldPlayersLength} -> ${this.players.length}, 게임: ${oldGamesLength} -> ${this.games.length}`);
         
-        // 통계 재계산
+        // 통계 재계산 (서버는 player.games 대신 게임 id 목록만 보내므로 게임이 없어도 목록을 만듦)
+        this.recalculateAllStats();
         if (this.games.length > 0) {
-            this.recalculateAllStats();
             console.log('통계 재계산 완료 - 플레이어 평균점수 확인:');
             this.players.forEach(player => {
                 console.log(`${player.name}: ${player.stats.averageScore}점 (${player.stats.totalScore}/${player.stats.totalGames})`);
@@ -271,7 +282,7 @@ TerraformingMarsTracker.prototype.updatePlayerStatsFromGames = function() {
 // 서버에서 데이터 로드
 TerraformingMarsTracker.prototype.loadFromServer = function() {
     console.log('서버에서 데이터 로드 시도:', this.syncServerUrl);
-    fetch(`${this.syncServerUrl}/api/data`)
+    fetch(`${this.syncApiUrl}/data`)
         .then(response => {
             console.log('서버 응답 상태:', response.status);
             if (!response.ok) {
@@ -305,6 +316,48 @@ TerraformingMarsTracker.prototype.startPeriodicSync = function() {
     }, 3000); // 3초마다 체크
 };
 
+// 주기적 동기화 중지
+TerraformingMarsTracker.prototype.stopPeriodicSync = function() {
+    if (this.syncInterval) {
+        clearInterval(this.syncInterval);
+        this.syncInterval = null;
+    }
+};
+
+// 서버 푸시 구독 (/api/events). 연결되면 폴링을 멈추고, 끊기면 폴링으로 되돌아감
+TerraformingMarsTracker.prototype.startEventStream = function() {
+    if (typeof EventSource === 'undefined') {
+        return;
+    }
+    
+    const eventSource = new EventSource(`${this.syncApiUrl}/events`);
+    this.eventSource = eventSource;
+    
+    eventSource.onopen = () => {
+        console.log('서버 푸시 연결됨, 폴링 중지');
+        this.stopPeriodicSync();
+        this.updateSyncIndicator(true);
+    };
+    
+    eventSource.addEventListener('sync', event => {
+        const message = JSON.parse(event.data);
+        const changed = typeof message.version === 'number'
+            ? message.version !== this.syncVersion
+            : message.lastUpdated && message.lastUpdated !== this.lastSyncTimestamp;
+        if (changed) {
+            this.checkForUpdates();
+        }
+    });
+    
+    eventSource.onerror = () => {
+        // 재연결을 기다리는 동안에도 변경을 놓치지 않도록 폴링 재개
+        if (!this.syncInterval) {
+            console.log('서버 푸시 연결 끊김, 폴링으로 전환');
+            this.startPeriodicSync();
+        }
+    };
+};
+
 // 업데이트 확인
 TerraformingMarsTracker.prototype.checkForUpdates = function() {
     // 서버로 데이터 전송 중이면 동기화 체크 건너뛰기
@@ -313,9 +366,12 @@ TerraformingMarsTracker.prototype.checkForUpdates = function() {
         return;
     }
     
-    const url = `${this.syncServerUrl}/api/sync?timestamp=${encodeURIComponent(this.lastSyncTimestamp || '')}`;
+    // 버전을 알고 있으면 그 이후 변경분만 요청
+    const url = this.syncVersion !== null
+        ? `${this.syncApiUrl}/sync?since=${this.syncVersion}`
+        : `${this.syncApiUrl}/sync?timestamp=${encodeURIComponent(this.lastSyncTimestamp || '')}`;
     
-    console.log('업데이트 확인:', url, '현재 타임스탬프:', this.lastSyncTimestamp);
+    console.log('업데이트 확인:', url, '현재 타임스탬프:', this.lastSyncTimestamp, '버전:', this.syncVersion);
     
     fetch(url)
         .then(response => {
@@ -328,7 +384,10 @@ TerraformingMarsTracker.prototype.checkForUpdates = function() {
         })
         .then(result => {
             console.log('동기화 체크 결과:', result);
-            if (result.needsUpdate && result.data) {
+            if (result.needsUpdate && result.delta) {
+                console.log('서버에서 변경분 감지, 적용:', result.delta);
+                this.applyServerDelta(result.delta, result.version);
+            } else if (result.needsUpdate && result.data) {
                 console.log('서버에서 업데이트 감지, 데이터 적용:', result.data);
                 this.handleServerDataUpdate(result.data);
             } else {
@@ -342,6 +401,35 @@ TerraformingMarsTracker.prototype.checkForUpdates = function() {
         });
 };
 
+// 서버 변경분(delta)을 현재 데이터에 병합
+TerraformingMarsTracker.prototype.applyServerDelta = function(delta, version) {
+    const mergeRecords = (records, changes, keyOf) => {
+        const deleted = new Set(changes.deleted);
+        const upserted = new Map(changes.upserted.map(record => [keyOf(record), record]));
+        const merged = [];
+        records.forEach(record => {
+            const key = keyOf(record);
+            if (deleted.has(key)) return;
+            if (upserted.has(key)) {
+                merged.push(upserted.get(key));
+                upserted.delete(key);
+            } else {
+                merged.push(record);
+            }
+        });
+        // 새로 추가된 레코드는 뒤에 붙임
+        upserted.forEach(record => merged.push(record));
+        return merged;
+    };
+    
+    const data = Object.assign({}, delta.meta, {
+        players: mergeRecords(this.players, delta.players, player => player.name),
+        games: mergeRecords(this.games, delta.games, game => game.id),
+        dataVersion: version
+    });
+    this.handleServerDataUpdate(data);
+};
+
 // 디버깅용 함수 - 콘솔에서 호출 가능
 TerraformingMarsTracker.prototype.debugPlayerStats = function() {
     console.log('=== 플레이어 통계 디버깅 ===');
@@ -370,7 +458,8 @@ TerraformingMarsTracker.prototype.syncToServer = function(type, data) {
     }
 
     const fullData = {
-        players: this.players,
+        // 플레이어별 결과 목록(games)은 게임 기록과 중복이므로 보내지 않음 (서버가 게임 id로 연결)
+        players: this.players.map(({ games, ...player }) => player),
         games: this.games,
         // ''(빈 문자열)도 유효한 "초기화 상태"로 취급해야 하므로 || 를 쓰면 안 됨
         selectedMap: (normalizedSelectedMap === undefined || normalizedSelectedMap === null) ? 'THARSIS' : normalizedSelectedMap, // 기본값 설정
@@ -379,7 +468,7 @@ TerraformingMarsTracker.prototype.syncToServer = function(type, data) {
     
     console.log('서버로 데이터 전송:', type, fullData);
     
-    fetch(`${this.syncServerUrl}/api/data`, {
+    fetch(`${this.syncApiUrl}/data`, {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
@@ -403,6 +492,9 @@ TerraformingMarsTracker.prototype.syncToServer = function(type, data) {
         if (result.lastUpdated) {
             this.lastSyncTimestamp = result.lastUpdated;
         }
+        if (typeof result.version === 'number') {
+            this.syncVersion = result.version;
+        }
         
         // 전송 완료 후 플래그 해제
         this.isSyncingToServer = false;
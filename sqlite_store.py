@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+from game_store import JsonFileBackend, game_key, normalize_game_date
+from metrics import METRICS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    player_id INTEGER,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    game_key TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    date TEXT,
+    date_key TEXT,
+    map TEXT,
+    year INTEGER,
+    doc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    game_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    player_name TEXT,
+    corporation TEXT,
+    rank INTEGER,
+    score INTEGER,
+    megacredits INTEGER,
+    doc TEXT NOT NULL,
+    PRIMARY KEY (game_key, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_games_position ON games(position);
+CREATE INDEX IF NOT EXISTS idx_games_map ON games(map);
+CREATE INDEX IF NOT EXISTS idx_games_date ON games(date_key);
+CREATE INDEX IF NOT EXISTS idx_results_player ON results(player_name);
+CREATE INDEX IF NOT EXISTS idx_results_corporation ON results(corporation);
+"""
+
+
+def encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class SqliteBackend:
+    """게임/결과/플레이어를 SQLite 테이블에 나눠 저장하는 방식
+
+    각 행에는 원본 JSON(doc)을 함께 보관해서 기존 API 응답과 똑같은 데이터를 복원하고,
+    플레이어 이름/맵/기업/날짜 컬럼에는 인덱스를 걸어 조회에 사용한다.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        # SQLite는 변경마다 바로 반영되므로 따로 합칠 저널이 없음
+        self.pending_changes = 0
+        # GameStore 잠금 안에서만 사용하므로 스레드 간 공유 허용
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def change_key(self):
+        """데이터가 없으면 None. 다른 프로세스가 DB를 바꾸면 data_version이 달라짐"""
+        row = self.conn.execute("SELECT 1 FROM meta WHERE key = 'dataVersion'").fetchone()
+        if row is None:
+            return None
+        return ('sqlite', self.conn.execute('PRAGMA data_version').fetchone()[0])
+
+    def load(self):
+        """테이블에서 기존 JSON과 같은 구조의 데이터셋 복원"""
+        results = defaultdict(list)
+        for key, doc in self.conn.execute('SELECT game_key, doc FROM results ORDER BY game_key, seq'):
+            results[key].append(json.loads(doc))
+
+        games = []
+        for key, doc in self.conn.execute('SELECT game_key, doc FROM games ORDER BY position'):
+            game = json.loads(doc)
+            game['results'] = results.get(key, [])
+            games.append(game)
+
+        players = [json.loads(doc) for (doc,) in self.conn.execute('SELECT doc FROM players ORDER BY position')]
+
+        data = {'players': players, 'games': games}
+        for key, value in self.conn.execute('SELECT key, value FROM meta'):
+            data[key] = json.loads(value)
+        return data
+
+    def _insert_game(self, game, key, position):
+        # results 는 별도 테이블에 두고, 키 순서 유지를 위해 doc에는 빈 목록만 남김
+        doc = dict(game, results=[])
+        self.conn.execute(
+            'INSERT INTO games (game_key, position, date, date_key, map, year, doc) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, position, game.get('date'), normalize_game_date(game.get('date')),
+             game.get('map'), game.get('year'), encode(doc))
+        )
+        self.conn.executemany(
+            'INSERT INTO results (game_key, seq, player_name, corporation, rank, score, megacredits, doc) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [
+                (key, seq, result.get('playerName'), (result.get('corporation') or '').upper().strip(),
+                 result.get('rank'), result.get('score'), result.get('megacredits'), encode(result))
+                for seq, result in enumerate(game.get('results', []))
+            ]
+        )
+
+    def _delete_game(self, key):
+        self.conn.execute('DELETE FROM results WHERE game_key = ?', (key,))
+        self.conn.execute('DELETE FROM games WHERE game_key = ?', (key,))
+
+    def _write_meta(self, data):
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+            [(key, encode(value)) for key, value in data.items() if key not in ('players', 'games')]
+        )
+
+    def write_snapshot(self, data, data_bytes=None):
+        """전체 데이터셋을 한 트랜잭션으로 교체"""
+        with METRICS.time('sync_disk_write_seconds', target='sqlite'), self.conn:
+            for table in ('results', 'games', 'players', 'meta'):
+                self.conn.execute(f'DELETE FROM {table}')
+            for position, game in enumerate(data.get('games', [])):
+                self._insert_game(game, encode(game_key(game, position)), position)
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO players (name, position, player_id, doc) VALUES (?, ?, ?, ?)',
+                [
+                    (player.get('name'), position, player.get('id'), encode(player))
+                    for position, player in enumerate(data.get('players', []))
+                ]
+            )
+            self._write_meta(data)
+
+    def append_change(self, entry, players=()):
+        """게임 한 건 추가/수정/삭제를 해당 행에만 반영 (통계가 바뀐 플레이어 행도 함께 갱신)"""
+        key = encode(entry['gameId'])
+        with METRICS.time('sync_disk_write_seconds', target='sqlite'), self.conn:
+            if entry['op'] == 'add':
+                row = self.conn.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM games').fetchone()
+                self._insert_game(entry['game'], key, row[0])
+            elif entry['op'] == 'update':
+                row = self.conn.execute('SELECT position FROM games WHERE game_key = ?', (key,)).fetchone()
+                self._delete_game(key)
+                self._insert_game(entry['game'], key, row[0])
+            elif entry['op'] == 'delete':
+                self._delete_game(key)
+            self.conn.executemany(
+                'UPDATE players SET player_id = ?, doc = ? WHERE name = ?',
+                [(player.get('id'), encode(player), player.get('name')) for player in players]
+            )
+            self._write_meta({'lastUpdated': entry['lastUpdated'], 'dataVersion': entry['version']})
+
+    def compact(self, data, data_bytes=None):
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    def query_games(self, player=None, map_name=None, corporation=None, date_from=None, date_to=None):
+        """인덱스를 이용한 게임 조회 (날짜는 "YYYY-MM-DD"). 날짜 순으로 게임 목록 반환"""
+        conditions = []
+        params = []
+        if map_name:
+            conditions.append('g.map = ?')
+            params.append(map_name)
+        if date_from:
+            conditions.append('g.date_key >= ?')
+            params.append(date_from)
+        if date_to:
+            conditions.append('g.date_key <= ?')
+            params.append(date_to)
+        if player:
+            conditions.append('g.game_key IN (SELECT game_key FROM results WHERE player_name = ?)')
+            params.append(player)
+        if corporation:
+            conditions.append('g.game_key IN (SELECT game_key FROM results WHERE corporation = ?)')
+            params.append(corporation.upper().strip())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        rows = self.conn.execute(
+            f'SELECT g.game_key, g.doc FROM games g {where} ORDER BY g.date_key, g.position', params
+        ).fetchall()
+
+        games = []
+        for key, doc in rows:
+            game = json.loads(doc)
+            game['results'] = [
+                json.loads(result_doc) for (result_doc,) in
+                self.conn.execute('SELECT doc FROM results WHERE game_key = ? ORDER BY seq', (key,))
+            ]
+            games.append(game)
+        return games
+
+
+def game_signature(game):
+    """같은 게임인지 판단하는 기준 (날짜, 맵, 플레이어별 점수/순위)"""
+    results = tuple(sorted(
+        (result.get('playerName'), result.get('score'), result.get('rank')) for result in game.get('results', [])
+    ))
+    return (normalize_game_date(game.get('date')), game.get('map'), results)
+
+
+def merge_legacy_data(data, legacy_data):
+    """레거시 내보내기 데이터를 현재 데이터에 병합 (브라우저의 mergeLegacyData와 같은 규칙)
+
+    이미 들어 있는 게임은 다시 추가하지 않으므로 여러 번 실행해도 안전하다.
+    """
+    existing_names = {player['name'] for player in data['players']}
+    max_player_id = max([p.get('id', 0) for p in data['players'] if isinstance(p.get('id'), int)], default=0)
+    added_players = 0
+    for player in legacy_data.get('players', []):
+        if player['name'] in existing_names:
+            continue
+        max_player_id += 1
+        data['players'].append(dict(player, id=max_player_id))
+        existing_names.add(player['name'])
+        added_players += 1
+
+    existing_games = {game_signature(game) for game in data['games']}
+    max_game_id = max([g.get('id', 0) for g in data['games'] if isinstance(g.get('id'), int)], default=0)
+    added_games = 0
+    for game in legacy_data.get('games', []):
+        if game_signature(game) in existing_games:
+            continue
+        max_game_id += 1
+        data['games'].append(dict(game, id=max_game_id))
+        existing_games.add(game_signature(game))
+        added_games += 1
+
+    return added_players, added_games
+
+
+def migrate(db_file, json_file, legacy_files):
+    """JSON 저장 파일(+저널)과 레거시 내보내기 파일을 SQLite DB로 옮김"""
+    if os.path.exists(json_file):
+        data = JsonFileBackend(json_file).load()
+        print(f"📄 {json_file}: 게임 {len(data.get('games', []))}개, 플레이어 {len(data.get('players', []))}명")
+    else:
+        data = {}
+        print(f"📄 {json_file} 파일이 없어 빈 데이터에서 시작합니다")
+    data.setdefault('players', [])
+    data.setdefault('games', [])
+
+    for legacy_file in legacy_files:
+        with open(legacy_file, 'r', encoding='utf-8') as f:
+            legacy_data = json.load(f)
+        added_players, added_games = merge_legacy_data(data, legacy_data)
+        print(f"📜 {legacy_file}: 게임 {added_games}개, 플레이어 {added_players}명 추가")
+
+    data['lastUpdated'] = datetime.now().isoformat()
+    data['dataVersion'] = data.get('dataVersion', 0) + 1
+
+    backend = SqliteBackend(db_file)
+    backend.write_snapshot(data)
+    print(f"✅ {db_file} 저장 완료: 게임 {len(data['games'])}개, 플레이어 {len(data['players'])}명")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='테라포밍 마스 SQLite 저장소 도구')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    migrate_parser = subparsers.add_parser('migrate', help='JSON 데이터와 레거시 파일을 SQLite로 옮기기')
+    migrate_parser.add_argument('--db', default=os.path.join('data', 'game_data.sqlite3'))
+    migrate_parser.add_argument('--json', default=os.path.join('data', 'game_data.json'))
+    migrate_parser.add_argument('--legacy', nargs='*', default=['terraforming_mars_legacy_2019-2022.json'],
+                                help='함께 가져올 레거시 내보내기 파일들')
+
+    query_parser = subparsers.add_parser('query', help='인덱스로 게임 조회')
+    query_parser.add_argument('--db', default=os.path.join('data', 'game_data.sqlite3'))
+    query_parser.add_argument('--player')
+    query_parser.add_argument('--map')
+    query_parser.add_argument('--corporation')
+    query_parser.add_argument('--from', dest='date_from', help='YYYY-MM-DD')
+    query_parser.add_argument('--to', dest='date_to', help='YYYY-MM-DD')
+
+    args = parser.parse_args()
+    if args.command == 'migrate':
+        os.makedirs(os.path.dirname(args.db) or '.', exist_ok=True)
+        migrate(args.db, args.json, args.legacy)
+    elif args.command == 'query':
+        if not os.path.exists(args.db):
+            print(f"❌ DB 파일을 찾을 수 없습니다: {args.db}")
+            sys.exit(1)
+        games = SqliteBackend(args.db).query_games(
+            args.player, args.map, args.corporation, args.date_from, args.date_to)
+        for game in games:
+            summary = ', '.join(f"{r['rank']}. {r['playerName']} {r['score']}점" for r in game.get('results', []))
+            print(f"{game.get('date')} | {game.get('map')} | {summary}")
+        print(f"총 {len(games)}게임")
+
+
+if __name__ == "__main__":
+    main()
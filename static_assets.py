@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from email.utils import formatdate
+
+from metrics import METRICS
+
+# 캐시해서 서빙할 정적 파일 확장자 (그 외 파일은 기존 SimpleHTTPRequestHandler가 처리)
+STATIC_EXTENSIONS = {'.html', '.css', '.js', '.svg', '.png', '.jpg', '.jpeg', '.gif', '.ico', '.webp', '.woff', '.woff2'}
+# 미리 gzip으로 압축해 둘 텍스트 형식
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.svg'}
+# 시작 시 훑지 않을 디렉토리 (데이터, 저장소 메타데이터 등)
+SKIP_DIRS = {'data', '.git', '__pycache__', 'node_modules'}
+
+
+class StaticAsset:
+    """정적 파일 한 개의 캐시 (작은 파일은 내용과 gzip 본문을 메모리에 보관)"""
+
+    def __init__(self, path, stat, content, gzipped, tag):
+        self.path = path
+        self.file_key = (stat.st_mtime_ns, stat.st_size)
+        self.size = stat.st_size
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.content = content
+        self.gzipped = gzipped
+        # 내용 해시 (ETag 값, 압축 본문은 뒤에 -gzip을 붙여 구분)
+        self.tag = tag
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/javascript', 'image/svg+xml'):
+            self.content_type += '; charset=utf-8'
+        extension = os.path.splitext(path)[1].lower()
+        # HTML/JS/CSS는 배포 때마다 바뀌므로 항상 ETag로 재검증, 이미지는 잠시 캐시
+        self.cache_control = 'no-cache' if extension in COMPRESSIBLE_EXTENSIONS else 'public, max-age=3600'
+
+
+class StaticAssetCache:
+    """정적 파일을 시작 시 읽어서 해시/압축해 두고, 파일이 바뀐 경우에만 다시 읽음
+
+    max_memory_size보다 큰 파일은 메모리에 올리지 않고 os.sendfile로 바로 전송한다.
+    """
+
+    def __init__(self, root, max_memory_size=512 * 1024):
+        self.root = os.path.abspath(root)
+        self.max_memory_size = max_memory_size
+        self.assets = {}
+        self.lock = threading.Lock()
+
+    def preload(self):
+        """root 아래 정적 파일을 모두 읽어 둠. 읽은 파일 수 반환"""
+        count = 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if name not in SKIP_DIRS and not name.startswith('.')]
+            for filename in filenames:
+                if self.get(os.path.join(dirpath, filename)) is not None:
+                    count += 1
+        return count
+
+    def is_static(self, path):
+        return os.path.splitext(path)[1].lower() in STATIC_EXTENSIONS
+
+    def get(self, path):
+        """파일 경로의 캐시 항목. 정적 파일이 아니거나 없으면 None (바뀐 파일은 다시 읽음)"""
+        path = os.path.abspath(path)
+        if not self.is_static(path) or not path.startswith(self.root + os.sep):
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            with self.lock:
+                self.assets.pop(path, None)
+            return None
+
+        with self.lock:
+            asset = self.assets.get(path)
+        if asset is not None and asset.file_key == (stat.st_mtime_ns, stat.st_size):
+            METRICS.inc('sync_cache_requests_total', cache='static', result='hit')
+            return asset
+
+        METRICS.inc('sync_cache_requests_total', cache='static', result='miss')
+
+        asset = self.load(path, stat)
+        with self.lock:
+            self.assets[path] = asset
+        return asset
+
+    def load(self, path, stat):
+        digest = hashlib.sha256()
+        content = None
+        gzipped = None
+        if stat.st_size <= self.max_memory_size:
+            with open(path, 'rb') as f:
+                content = f.read()
+            digest.update(content)
+            if os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                compressed = gzip.compress(content, compresslevel=9, mtime=0)
+                if len(compressed) < len(content):
+                    gzipped = compressed
+        else:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        return StaticAsset(path, stat, content, gzipped, digest.hexdigest()[:16])
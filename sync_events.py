@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import selectors
+import socket
+import threading
+import time
+
+
+class SyncEventBroadcaster:
+    """Server-Sent Events 구독 소켓들을 한 개의 스레드(selector)로 관리하면서 변경 알림을 푸시
+
+    구독자는 채널(리그 이름, 기본 리그는 '')별로 나뉘고 이벤트는 같은 채널의 구독자에게만 간다.
+    """
+
+    def __init__(self, heartbeat_interval=20, max_subscribers=1000, max_buffer=256 * 1024):
+        self.heartbeat_interval = heartbeat_interval
+        self.max_subscribers = max_subscribers
+        # 읽지 않는 클라이언트 때문에 메모리가 계속 늘지 않도록 소켓별 대기 버퍼 크기 제한
+        self.max_buffer = max_buffer
+
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()
+        self.subscribers = {}
+        self.channels = {}
+        self.pending_subscribers = []
+        self.pending_events = []
+        self.subscriber_count = 0
+
+        # 다른 스레드에서 selector 루프를 깨우기 위한 소켓 쌍
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.wakeup_reader.setblocking(False)
+        self.wakeup_writer.setblocking(False)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ)
+
+        self.thread = threading.Thread(target=self.run, name='sync-events')
+        self.thread.daemon = True
+        self.thread.start()
+
+    @staticmethod
+    def format_event(event, data):
+        """SSE 메시지 한 건을 바이트로 변환"""
+        payload = json.dumps(data, ensure_ascii=False)
+        return f"event: {event}\ndata: {payload}\n\n".encode('utf-8')
+
+    def is_full(self):
+        with self.lock:
+            return self.subscriber_count >= self.max_subscribers
+
+    def subscribe(self, sock, initial=b'', channel=''):
+        """응답 헤더를 보낸 소켓을 구독자로 넘겨받음 (이후 소켓은 이 객체가 닫음)"""
+        sock.setblocking(False)
+        with self.lock:
+            self.pending_subscribers.append((sock, bytearray(b'retry: 3000\n\n' + initial), channel))
+            self.subscriber_count += 1
+        self.wakeup()
+
+    def publish(self, event, data, channel=''):
+        """channel의 모든 구독자에게 이벤트 전송 예약"""
+        with self.lock:
+            if not self.subscriber_count:
+                return
+            self.pending_events.append((channel, self.format_event(event, data)))
+        self.wakeup()
+
+    def wakeup(self):
+        try:
+            self.wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def run(self):
+        """selector 루프: 새 구독자 등록, 이벤트 전파, 끊긴 소켓 정리, heartbeat"""
+        last_heartbeat = time.monotonic()
+        while True:
+            for key, mask in self.selector.select(timeout=self.heartbeat_interval):
+                if key.fileobj is self.wakeup_reader:
+                    self.drain_wakeup()
+                    continue
+                sock = key.fileobj
+                if mask & selectors.EVENT_READ:
+                    # 구독자는 데이터를 보내지 않으므로 읽을 게 생기면 연결 종료로 간주
+                    try:
+                        if not sock.recv(1024):
+                            self.drop(sock)
+                            continue
+                    except BlockingIOError:
+                        pass
+                    except OSError:
+                        self.drop(sock)
+                        continue
+                if mask & selectors.EVENT_WRITE:
+                    self.flush(sock)
+
+            with self.lock:
+                new_subscribers, self.pending_subscribers = self.pending_subscribers, []
+                events, self.pending_events = self.pending_events, []
+
+            for sock, buffer, channel in new_subscribers:
+                self.subscribers[sock] = buffer
+                self.channels[sock] = channel
+                self.selector.register(sock, selectors.EVENT_READ)
+
+            if time.monotonic() - last_heartbeat >= self.heartbeat_interval:
+                # heartbeat는 채널에 관계없이 모든 구독자에게
+                events.append((None, b': ping\n\n'))
+                last_heartbeat = time.monotonic()
+
+            payloads = {}
+            for sock in list(self.subscribers):
+                channel = self.channels[sock]
+                if channel not in payloads:
+                    payloads[channel] = b''.join(
+                        payload for event_channel, payload in events if event_channel is None or event_channel == channel
+                    )
+                if payloads[channel]:
+                    self.subscribers[sock] += payloads[channel]
+                self.flush(sock)
+
+    def drain_wakeup(self):
+        try:
+            while self.wakeup_reader.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def flush(self, sock):
+        """대기 중인 바이트를 가능한 만큼 전송하고, 남으면 쓰기 가능 이벤트를 기다림"""
+        buffer = self.subscribers.get(sock)
+        if buffer is None:
+            return
+        if buffer:
+            try:
+                sent = sock.send(buffer)
+                del buffer[:sent]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self.drop(sock)
+                return
+        if len(buffer) > self.max_buffer:
+            self.drop(sock)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if buffer else 0)
+        if self.selector.get_key(sock).events != events:
+            self.selector.modify(sock, events)
+
+    def drop(self, sock):
+        if self.subscribers.pop(sock, None) is None:
+            return
+        self.channels.pop(sock, None)
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            sock.close()
+        except OSError:
+            pass
+        with self.lock:
+            self.subscriber_count -= 1
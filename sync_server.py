@@ -1,106 +1,550 @@
 #!/usr/bin/env python3
+import argparse
 import http.server
+import queue
 import socketserver
 import json
 import os
 import threading
 import time
+import zlib
 import signal
 import sys
-from urllib.parse import urlparse, parse_qs
+from collections import Counter
+from urllib.parse import urlparse, parse_qs, unquote
 from datetime import datetime
 
+from backup_store import BackupStore
+from date_index import DateIndex, decode_cursor, parse_date_bound
+from exporter import ExportSummary, buffered, export_to_file, iter_legacy_json, iter_ndjson
+from game_store import GameStore, JsonFileBackend
+from keep_alive import IdleConnectionPool
+from leagues import DEFAULT_LEAGUE, League, LeagueRegistry, is_league_name
+from metrics import METRICS
+from player_stats import expand_player_games, player_games
+from rankings import RankingIndex, normalize_corporation, player_rankings
+from ratings import RatingIndex
+from head_to_head import HeadToHeadIndex
+from static_assets import StaticAssetCache
+from sync_events import SyncEventBroadcaster
+
+DATA_DIR = 'data'
+DATA_FILE = os.path.join(DATA_DIR, 'game_data.json')
+COLUMNAR_FILE = os.path.join(DATA_DIR, 'game_data.tfmc')
+DB_FILE = os.path.join(DATA_DIR, 'game_data.sqlite3')
+# /api/<리그>/... 로 접근하는 리그별 데이터 디렉토리 (data/leagues/<리그>/)
+LEAGUES_DIR = os.path.join(DATA_DIR, 'leagues')
+# /api/games 한 페이지의 최대 게임 수
+MAX_PAGE_SIZE = 100
+# 지표에서 그대로 구분하는 API 경로 (그 외 /api/ 경로는 /api/other로 묶음)
+API_ROUTES = {
+    '/api/data', '/api/events', '/api/sync', '/api/games', '/api/years',
+    '/api/rankings/players', '/api/rankings/corporations', '/api/rankings/maps',
+    '/api/recalculate', '/api/export', '/api/export/stream', '/api/metrics', '/api/ratings'
+}
+# 리그 이름으로 쓸 수 없는 /api/ 아래 경로 이름
+RESERVED_API_NAMES = {route.split('/')[2] for route in API_ROUTES} | {'players', 'leagues', 'head-to-head'}
+
 class ReusableTCPServer(socketserver.TCPServer):
     """포트 재사용이 가능한 TCP 서버"""
     allow_reuse_address = True
+    # 여러 기기가 동시에 접속해도 연결이 거부되지 않도록 listen 대기열을 넉넉히
+    request_queue_size = 128
+    
+    def __init__(self, *args, **kwargs):
+        # 핸들러 종료 후에도 열어 두어야 하는 소켓들 (SSE 구독 등)
+        self.detached_requests = set()
+        super().__init__(*args, **kwargs)
     
     def server_bind(self):
         """소켓 옵션 설정 후 바인딩"""
         import socket
         self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         super().server_bind()
+    
+    def detach_request(self, request):
+        """핸들러가 끝나도 소켓을 닫지 않도록 표시 (SSE 구독처럼 다른 객체가 넘겨받는 경우)"""
+        self.detached_requests.add(request)
+    
+    def shutdown_request(self, request):
+        if request in self.detached_requests:
+            self.detached_requests.discard(request)
+            return
+        super().shutdown_request(request)
 
-class SyncHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        self.data_dir = 'data'
-        self.data_file = os.path.join(self.data_dir, 'game_data.json')
-        self.backup_dir = os.path.join(self.data_dir, 'backups')
+class ThreadPoolTCPServer(ReusableTCPServer):
+    """고정된 수의 워커 스레드로 요청을 동시에 처리하는 TCP 서버
+    
+    keep-alive 연결은 응답 후 워커를 놓아주고 IdleConnectionPool에서 다음 요청을 기다린다.
+    """
+    # 요청을 읽는 도중 멈춘 클라이언트가 워커를 붙잡고 있을 수 있는 최대 시간(초)
+    request_timeout = 30
+    
+    def __init__(self, server_address, RequestHandlerClass, workers=16, bind_and_activate=True,
+                 keep_alive_timeout=15, max_connections_per_client=8):
+        self.workers = workers
+        # 대기열 크기를 제한해서 워커가 모두 바쁠 때는 accept 자체를 늦춤
+        self.request_queue = queue.Queue(maxsize=workers * 4)
         
-        # 디렉토리 생성
-        os.makedirs(self.data_dir, exist_ok=True)
-        os.makedirs(self.backup_dir, exist_ok=True)
+        # 클라이언트(IP)별 열린 연결 수 (대기 중인 keep-alive 연결 포함)
+        self.max_connections_per_client = max_connections_per_client
+        self.connections_lock = threading.Lock()
+        self.connection_hosts = {}
+        self.host_connections = Counter()
+        self.limited_connections = set()
         
-        super().__init__(*args, **kwargs)
+        # keep_alive_timeout이 0이면 keep-alive를 쓰지 않고 요청마다 연결을 닫음
+        self.idle_connections = None
+        if keep_alive_timeout > 0:
+            self.idle_connections = IdleConnectionPool(
+                lambda request, client_address: self.request_queue.put((request, client_address)),
+                self.shutdown_request,
+                idle_timeout=keep_alive_timeout
+            )
+        super().__init__(server_address, RequestHandlerClass, bind_and_activate)
+        
+        for i in range(workers):
+            worker = threading.Thread(target=self.process_request_worker, name=f'sync-worker-{i + 1}')
+            worker.daemon = True
+            worker.start()
+    
+    def process_request(self, request, client_address):
+        """요청을 워커 대기열에 넣음 (accept 루프는 바로 다음 연결을 받음)"""
+        self.track_connection(request, client_address[0])
+        self.request_queue.put((request, client_address))
+    
+    def track_connection(self, request, host):
+        """새 연결을 기록. 클라이언트별 제한을 넘으면 그 클라이언트의 유휴 연결을 하나 닫고,
+        닫을 유휴 연결이 없으면 새 연결을 응답 한 번 후에 닫음"""
+        with self.connections_lock:
+            over_limit = self.host_connections[host] >= self.max_connections_per_client
+            self.connection_hosts[request] = host
+            self.host_connections[host] += 1
+        if over_limit and not (self.idle_connections and self.idle_connections.evict(host)):
+            with self.connections_lock:
+                self.limited_connections.add(request)
+    
+    def release_connection(self, request):
+        with self.connections_lock:
+            host = self.connection_hosts.pop(request, None)
+            self.limited_connections.discard(request)
+            if host is not None:
+                self.host_connections[host] -= 1
+                if self.host_connections[host] <= 0:
+                    del self.host_connections[host]
+    
+    def is_limited(self, request):
+        """연결 수 제한 때문에 응답 후 닫아야 하는 연결인지"""
+        with self.connections_lock:
+            return request in self.limited_connections
+    
+    def detach_request(self, request):
+        # 넘겨받은 객체가 따로 관리하므로 연결 수에서 제외
+        super().detach_request(request)
+        self.release_connection(request)
+    
+    def shutdown_request(self, request):
+        self.release_connection(request)
+        super().shutdown_request(request)
+    
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+    
+    def process_request_worker(self):
+        """대기열에서 요청을 꺼내 처리하는 워커 루프"""
+        while True:
+            request, client_address = self.request_queue.get()
+            if request is None:
+                break
+            handler = None
+            try:
+                handler = self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                if handler is not None and handler.keep_alive_idle:
+                    # 다음 요청은 대기 풀에서 기다림 (도착하면 다시 이 대기열로 들어옴)
+                    self.idle_connections.park(request, client_address)
+                else:
+                    self.shutdown_request(request)
+    
+    def server_close(self):
+        super().server_close()
+        if self.idle_connections is not None:
+            self.idle_connections.close()
+        for _ in range(self.workers):
+            try:
+                self.request_queue.put_nowait((None, None))
+            except queue.Full:
+                break
+
+class SyncHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    # 연결을 재사용할 수 있도록 HTTP/1.1로 응답 (모든 응답에 Content-Length 필요)
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 보내므로, 연결을 재사용할 때 Nagle 지연(delayed ACK)에 걸리지 않도록 끔
+    disable_nagle_algorithm = True
+    
+    def server_limits_connection(self):
+        is_limited = getattr(self.server, 'is_limited', None)
+        return is_limited is not None and is_limited(self.request)
+    
+    @property
+    def league(self):
+        """이 요청의 리그 (처음 쓸 때 불러오고, 요청이 끝나면 놓아줌)"""
+        if self._league is None:
+            self._league = self.server.leagues.acquire(self.league_name)
+            if self._league is None:
+                raise KeyError(self.league_name)
+        return self._league
+    
+    def require_league(self, create=False):
+        """/api/<리그>/... 요청이면 리그를 불러옴. 없는 리그면 404를 보내고 False
+
+        create가 True(게임/전체 저장)일 때만 없는 리그를 새로 만든다.
+        """
+        if self.league_name == DEFAULT_LEAGUE or self._league is not None:
+            return True
+        self._league = self.server.leagues.acquire(self.league_name, create=create)
+        if self._league is None:
+            self.send_json_error(404, "리그를 찾을 수 없습니다")
+            return False
+        return True
+    
+    @property
+    def store(self):
+        """요청한 리그의 데이터셋 캐시"""
+        return self.league.store
+    
+    def parse_request(self):
+        """/api/<리그>/... 경로는 리그 이름을 기억하고 /api/... 로 바꿔서 기본 리그와 같은 처리 경로를 탐"""
+        if not super().parse_request():
+            return False
+        parsed = urlparse(self.path)
+        parts = parsed.path.split('/', 3)
+        if len(parts) >= 3 and parts[1] == 'api' and parts[2] not in RESERVED_API_NAMES and is_league_name(parts[2]):
+            path = '/api/' + (parts[3] if len(parts) > 3 else '')
+            # 리그 API가 아닌 경로(/api/nosuch 등)는 바꾸지 않고 일반 경로처럼 404
+            if route_label(path) not in ('/api/other', 'static'):
+                self.league_name = parts[2]
+                self.path = path + (f'?{parsed.query}' if parsed.query else '')
+        return True
+    
+    def setup(self):
+        self.keep_alive_idle = False
+        self.idle_connections = getattr(self.server, 'idle_connections', None)
+        if self.idle_connections is None:
+            # 단일 처리 모드에서는 연결을 붙잡고 있으면 다른 클라이언트가 모두 막히므로 요청마다 닫음
+            self.protocol_version = 'HTTP/1.0'
+        else:
+            self.timeout = self.server.request_timeout
+        super().setup()
+    
+    def handle(self):
+        """요청 하나를 처리한 뒤, 이미 도착한 다음 요청이 없으면 연결을 대기 풀로 넘기고 워커를 놓아줌"""
+        if self.idle_connections is None:
+            super().handle()
+            return
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self.has_buffered_request():
+                self.keep_alive_idle = True
+                return
+            self.handle_one_request()
+    
+    def handle_one_request(self):
+        """요청 한 건을 처리하고 경로별 요청 수, 처리 시간, 응답 크기를 기록"""
+        self.response_status = None
+        self.response_bytes = 0
+        self.league_name = DEFAULT_LEAGUE
+        self._league = None
+        started = time.perf_counter()
+        try:
+            super().handle_one_request()
+        finally:
+            if self._league is not None:
+                self.server.leagues.release(self._league)
+                self._league = None
+        if self.response_status is None:
+            return
+        # 요청 줄을 해석하기 전에 400으로 끝난 경우에는 path가 없음
+        route = route_label(getattr(self, 'path', ''))
+        method = self.command if self.command in ('GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'OPTIONS') else 'other'
+        METRICS.observe('sync_request_duration_seconds', time.perf_counter() - started, route=route)
+        METRICS.inc('sync_requests_total', route=route, method=method, status=self.response_status)
+        if self.response_bytes:
+            METRICS.inc('sync_response_bytes_total', self.response_bytes, route=route)
+    
+    def send_response(self, code, message=None):
+        self.response_status = code
+        super().send_response(code, message)
+    
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length':
+            self.response_bytes = int(value)
+        super().send_header(keyword, value)
+    
+    def has_buffered_request(self):
+        """다음 요청(파이프라이닝)이 이미 도착했는지 기다리지 않고 확인"""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
     
     def end_headers(self):
+        if not self.close_connection and self.server_limits_connection():
+            self.send_header('Connection', 'close')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
         super().end_headers()
     
     def do_GET(self):
-        if self.path == '/api/data':
+        if not self.require_league():
+            return
+        if urlparse(self.path).path == '/api/data':
             self.handle_get_data()
+        elif self.path == '/api/events':
+            self.handle_events()
         elif self.path.startswith('/api/sync'):
             self.handle_sync_check()
+        elif urlparse(self.path).path == '/api/games':
+            self.handle_list_games()
+        elif self.path == '/api/years':
+            self.handle_years()
+        elif self.path.startswith('/api/rankings/'):
+            self.handle_rankings()
         elif self.path == '/api/recalculate':
+            # 저장 요청과 같은 그룹 커밋 경로에서 재계산
             self.handle_recalculate()
-        elif self.path == '/api/export':
+        elif urlparse(self.path).path == '/api/export':
             self.handle_export()
-        else:
-            super().do_GET()  # 정적 파일 서빙
+        elif urlparse(self.path).path == '/api/export/stream':
+            self.handle_export_stream()
+        elif self.path == '/api/metrics':
+            self.handle_metrics()
+        elif self.path.startswith('/api/players/'):
+            self.handle_player_games()
+        elif self.path == '/api/ratings':
+            self.handle_ratings()
+        elif self.path.startswith('/api/ratings/'):
+            self.handle_rating_history()
+        elif self.path.startswith('/api/head-to-head/'):
+            self.handle_head_to_head()
+        elif not self.send_static():
+            super().do_GET()  # 캐시 대상이 아닌 파일은 기존 방식으로 서빙
     
     def do_POST(self):
         parsed_path = urlparse(self.path)
-        if parsed_path.path == '/api/data':
+        if parsed_path.path not in ('/api/data', '/api/games'):
+            self.send_error(404)
+        elif not self.require_league(create=True):
+            return
+        elif parsed_path.path == '/api/data':
             self.handle_post_data()
+        else:
+            self.handle_game_change('add')
+    
+    def do_PUT(self):
+        if not self.require_league():
+            return
+        game_id = self.parse_game_id()
+        if game_id is not None:
+            self.handle_game_change('update', game_id)
+        else:
+            self.send_error(404)
+    
+    def do_DELETE(self):
+        if not self.require_league():
+            return
+        game_id = self.parse_game_id()
+        if game_id is not None:
+            self.handle_game_change('delete', game_id)
         else:
             self.send_error(404)
     
+    def parse_game_id(self):
+        """/api/games/<id> 경로에서 게임 id 추출 (숫자 id는 정수로)"""
+        path = urlparse(self.path).path
+        prefix = '/api/games/'
+        if not path.startswith(prefix) or len(path) == len(prefix):
+            return None
+        game_id = unquote(path[len(prefix):])
+        return int(game_id) if game_id.lstrip('-').isdigit() else game_id
+    
+    def read_json_body(self):
+        content_length = int(self.headers['Content-Length'])
+        body = self.rfile.read(content_length)
+        with METRICS.time('sync_json_decode_seconds', source='request'):
+            return json.loads(body.decode('utf-8'))
+    
+    def send_body(self, status, body, content_type='application/json'):
+        """Content-Length를 붙여 응답 전송 (keep-alive 연결에서 응답 끝을 알 수 있도록)"""
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_json(self, status, response):
+        with METRICS.time('sync_json_encode_seconds', target='response'):
+            body = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        self.send_body(status, body)
+    
+    def send_error(self, code, message=None, explain=None):
+        """상태 줄에는 latin-1만 쓸 수 있으므로 한글 메시지는 본문 설명으로 보냄"""
+        if message is not None:
+            try:
+                message.encode('latin-1')
+            except UnicodeEncodeError:
+                message, explain = None, message
+        super().send_error(code, message, explain)
+    
+    def send_json_error(self, status, message):
+        """JSON 오류 응답 (send_error는 상태 줄에 한글 메시지를 쓸 수 없음)"""
+        self.send_json(status, {'success': False, 'message': message})
+    
+    def send_versioned_json(self, kind, since=None):
+        """캐시된 응답을 버전 기반 ETag/304와 gzip/deflate 압축을 적용해 전송. 데이터가 없으면 False"""
+        encoding = choose_encoding(self.headers.get('Accept-Encoding', ''))
+        version, body, encoding = self.store.get_response(kind, encoding, since)
+        if body is None:
+            return False
+        
+        tag = f'v{version}-{kind}' if since is None else f'v{version}-{kind}{since}'
+        etag = f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+        not_modified = etag_matches(self.headers.get('If-None-Match'), tag)
+        
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        # 브라우저가 캐시를 쓰기 전에 항상 ETag로 재검증하도록 함
+        self.send_header('Cache-Control', 'no-cache')
+        if not not_modified:
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(body)
+        return True
+    
+    def send_static(self):
+        """캐시된 정적 파일을 ETag/304, 미리 압축한 gzip, sendfile로 전송. 캐시 대상이 아니면 False"""
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            # 끝에 /가 없는 디렉토리 주소는 기존 방식대로 리다이렉트
+            if not urlparse(self.path).path.endswith('/'):
+                return False
+            path = os.path.join(path, 'index.html')
+        asset = self.server.static_assets.get(path)
+        if asset is None:
+            return False
+        
+        encoding = None
+        if asset.gzipped is not None and choose_encoding(self.headers.get('Accept-Encoding', '')) == 'gzip':
+            encoding = 'gzip'
+        etag = f'"{asset.tag}-gzip"' if encoding else f'"{asset.tag}"'
+        not_modified = etag_matches(self.headers.get('If-None-Match'), asset.tag)
+        
+        self.send_response(304 if not_modified else 200)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', asset.last_modified)
+        self.send_header('Cache-Control', asset.cache_control)
+        if asset.gzipped is not None:
+            self.send_header('Vary', 'Accept-Encoding')
+        if not_modified:
+            self.end_headers()
+            return True
+        
+        body = asset.gzipped if encoding else asset.content
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Length', str(len(body) if body is not None else asset.size))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
+        else:
+            # 메모리에 올리지 않은 큰 파일은 커널에서 바로 소켓으로 복사
+            with open(asset.path, 'rb') as f:
+                self.wfile.flush()
+                self.connection.sendfile(f, 0, asset.size)
+        return True
+    
+    def handle_game_change(self, op, game_id=None):
+        """게임 한 건 추가(POST /api/games), 수정(PUT)/삭제(DELETE /api/games/<id>)"""
+        try:
+            game = None
+            if op != 'delete':
+                try:
+                    game = self.read_json_body()
+                except (ValueError, TypeError):
+                    # 본문이 JSON/UTF-8이 아니거나 Content-Length가 없는 경우
+                    self.send_json_error(400, "요청 본문이 올바른 JSON이 아닙니다")
+                    return
+                if not isinstance(game, dict) or not isinstance(game.get('results'), list):
+                    self.send_json_error(400, "게임 데이터에 results 목록이 필요합니다")
+                    return
+            
+            try:
+                data, game = self.store.apply_game_change(op, game_id, game)
+            except KeyError:
+                self.send_json_error(404, "게임을 찾을 수 없습니다")
+                return
+            
+            response = {
+                'success': True,
+                'message': {'add': 'Game added', 'update': 'Game updated', 'delete': 'Game deleted'}[op],
+                'game': game,
+                'lastUpdated': data['lastUpdated'],
+                'version': data['dataVersion'],
+                'totalGames': len(data['games'])
+            }
+            self.send_json(201 if op == 'add' else 200, response)
+        except Exception as e:
+            print(f"게임 변경 처리 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
     def handle_get_data(self):
+        """GET /api/data - 플레이어에는 통계와 게임 id(gameIds)만 담김
+
+        ?expand=playerGames이면 예전 형식처럼 플레이어마다 결과 목록(games)을 채워서 보냄.
+        """
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                data = {'players': [], 'games': [], 'lastUpdated': datetime.now().isoformat()}
+            query_params = parse_qs(urlparse(self.path).query)
+            kind = 'data-player-games' if query_params.get('expand', [''])[0] == 'playerGames' else 'data'
+            if self.send_versioned_json(kind):
+                return
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+            data = {'players': [], 'games': [], 'lastUpdated': datetime.now().isoformat()}
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            self.send_body(200, body)
         except Exception as e:
             self.send_error(500, str(e))
     
     def handle_post_data(self):
         try:
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            
-            # 타임스탬프 추가
-            data['lastUpdated'] = datetime.now().isoformat()
+            data = self.read_json_body()
             
-            # 기존 데이터가 있으면 백업 생성
-            if os.path.exists(self.data_file):
-                self.create_backup()
-            
-            # 데이터 저장
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 데이터 저장 (동시에 들어온 저장은 한 번에 기록, 백업은 커밋 훅에서 생성)
+            data = self.store.save(data)
             
             # 개별 게임 파일 저장 비활성화 (통합 파일만 사용)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
             response = {
                 'success': True, 
                 'message': 'Data updated',
                 'lastUpdated': data['lastUpdated'],
+                'version': data['dataVersion'],
                 'totalGames': len(data.get('games', [])),
                 'totalPlayers': len(data.get('players', []))
             }
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.send_json(200, response)
         except Exception as e:
             self.send_error(500, str(e))
     
@@ -109,163 +553,263 @@ class SyncHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             parsed_path = urlparse(self.path)
             query_params = parse_qs(parsed_path.query)
             client_timestamp = query_params.get('timestamp', [None])[0]
+            client_version = query_params.get('since', [None])[0]
             
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
+            data = self.store.get_data()
+            
+            if data is not None and client_version is not None:
+                # 버전 기반 동기화: since 이후 변경된 게임/플레이어만 전송
+                try:
+                    since = int(client_version)
+                except ValueError:
+                    self.send_json_error(400, "since 값이 올바르지 않습니다")
+                    return
+                if self.send_versioned_json('delta', since):
+                    return
+                body = json.dumps({'needsUpdate': False, 'data': None}).encode('utf-8')
+            elif data is not None:
                 server_timestamp = data.get('lastUpdated', '')
                 
                 # 클라이언트 타임스탬프와 서버 타임스탬프 비교
                 needs_update = client_timestamp != server_timestamp
                 
-                response = {
-                    'needsUpdate': needs_update,
-                    'serverTimestamp': server_timestamp,
-                    'data': data if needs_update else None
-                }
+                # 미리 직렬화/압축해 둔 응답 바이트 재사용
+                if needs_update and self.send_versioned_json('sync'):
+                    return
+                else:
+                    response = {
+                        'needsUpdate': False,
+                        'serverTimestamp': server_timestamp,
+                        'version': self.store.get_version(),
+                        'data': None
+                    }
+                    body = json.dumps(response, ensure_ascii=False).encode('utf-8')
             else:
                 response = {
                     'needsUpdate': False,
                     'serverTimestamp': datetime.now().isoformat(),
                     'data': None
                 }
+                body = json.dumps(response, ensure_ascii=False).encode('utf-8')
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
+            self.send_body(200, body)
         except Exception as e:
             self.send_error(500, str(e))
     
-    def do_OPTIONS(self):
-        self.send_response(200)
-        self.end_headers()
-    
-    def create_backup(self):
-        """기존 데이터 파일의 백업 생성"""
+    def handle_events(self):
+        """Server-Sent Events 구독: 데이터가 저장될 때마다 sync 이벤트를 푸시"""
         try:
-            if os.path.exists(self.data_file):
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                backup_file = os.path.join(self.backup_dir, f'game_data_backup_{timestamp}.json')
-                
-                with open(self.data_file, 'r', encoding='utf-8') as src:
-                    with open(backup_file, 'w', encoding='utf-8') as dst:
-                        dst.write(src.read())
-                
-                print(f"백업 생성: {backup_file}")
-                
-                # 오래된 백업 파일 정리 (최근 10개만 유지)
-                self.cleanup_old_backups()
-        except Exception as e:
-            print(f"백업 생성 중 오류: {e}")
-    
-    def cleanup_old_backups(self):
-        """오래된 백업 파일 정리"""
-        try:
-            backup_files = []
-            for file in os.listdir(self.backup_dir):
-                if file.startswith('game_data_backup_') and file.endswith('.json'):
-                    file_path = os.path.join(self.backup_dir, file)
-                    backup_files.append((file_path, os.path.getctime(file_path)))
+            events = self.server.events
+            if events.is_full():
+                self.send_error(503, "구독자 수가 너무 많습니다")
+                return
             
-            # 생성 시간 순으로 정렬
-            backup_files.sort(key=lambda x: x[1], reverse=True)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            # 이 연결은 이벤트 전용이므로 다른 요청에 재사용하지 않음
+            self.send_header('Connection', 'close')
+            self.end_headers()
             
-            # 최근 10개를 제외하고 삭제
-            for file_path, _ in backup_files[10:]:
-                os.remove(file_path)
-                print(f"오래된 백업 삭제: {file_path}")
+            # 현재 상태를 첫 이벤트로 보내고 소켓을 브로드캐스터에 넘김
+            # (저장 잠금 안에서 넘겨야 그 사이의 변경 알림을 놓치지 않음)
+            with self.store.lock:
+                initial = events.format_event('sync', {
+                    'lastUpdated': self.store.get_last_updated(),
+                    'version': self.store.get_version()
+                })
+                self.server.detach_request(self.request)
+                events.subscribe(self.request, initial, self.league_name)
+            self.close_connection = True
         except Exception as e:
-            print(f"백업 정리 중 오류: {e}")
+            print(f"이벤트 구독 처리 중 오류: {e}")
+    
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
     
     def handle_sync(self):
         """동기화 상태 확인"""
         try:
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
             response = {
                 'status': 'connected',
                 'timestamp': datetime.now().isoformat(),
                 'message': '동기화 연결됨'
             }
-            self.wfile.write(json.dumps(response).encode('utf-8'))
+            self.send_json(200, response)
             
         except Exception as e:
             print(f"동기화 확인 중 오류: {e}")
             self.send_error(500, str(e))
     
+    def handle_list_games(self):
+        """GET /api/games - 최신 게임부터 페이지 단위로 (player/map/corporation/year/from/to 필터, cursor/limit)"""
+        try:
+            parsed = self.read_date_range()
+            if parsed is None:
+                return
+            (start, end), query_params = parsed
+            try:
+                limit = min(max(int(query_params.get('limit', ['20'])[0]), 1), MAX_PAGE_SIZE)
+                cursor = query_params.get('cursor', [None])[0]
+                cursor = decode_cursor(cursor) if cursor else None
+            except ValueError:
+                self.send_json_error(400, "limit 또는 cursor 값이 올바르지 않습니다")
+                return
+            
+            filters = []
+            for name in ('player', 'map', 'corporation'):
+                if name in query_params:
+                    value = query_params[name][0]
+                    filters.append((name, normalize_corporation(value) if name == 'corporation' else value))
+            
+            def find_page(data):
+                games, next_cursor = self.league.date_index.page(filters, start, end, cursor, limit)
+                return {
+                    'games': games,
+                    'count': len(games),
+                    'nextCursor': next_cursor,
+                    'version': data.get('dataVersion', 0)
+                }
+            
+            response = self.store.query(find_page) or {'games': [], 'count': 0, 'nextCursor': None, 'version': 0}
+            self.send_json(200, response)
+        except Exception as e:
+            print(f"게임 조회 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
+    def handle_player_games(self):
+        """GET /api/players/<이름>/games - 플레이어의 게임 결과 목록 (게임 id 색인으로 필요할 때만 만듦)"""
+        try:
+            parts = urlparse(self.path).path.split('/')
+            if len(parts) != 5 or parts[4] != 'games' or not parts[3]:
+                self.send_json_error(404, "지원하지 않는 경로입니다")
+                return
+            name = unquote(parts[3])
+            
+            def find_games(data):
+                player = next((p for p in data.get('players', []) if p.get('name') == name), None)
+                if player is None:
+                    return None
+                games = player_games(player, self.league.date_index.games)
+                return {'player': name, 'games': games, 'count': len(games), 'version': data.get('dataVersion', 0)}
+            
+            response = self.store.query(find_games)
+            if response is None:
+                self.send_json_error(404, "플레이어를 찾을 수 없습니다")
+                return
+            self.send_json(200, response)
+        except Exception as e:
+            print(f"플레이어 게임 조회 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
+    def handle_metrics(self):
+        """/api/metrics - 요청/저장/캐시 지표 (Prometheus 텍스트 형식)"""
+        body = METRICS.render().encode('utf-8')
+        self.send_body(200, body, 'text/plain; version=0.0.4; charset=utf-8')
+    
+    def handle_years(self):
+        """GET /api/years - 연도별 게임 수/참여 인원 요약"""
+        try:
+            if not self.send_versioned_json('years'):
+                self.send_json(200, {'years': []})
+        except Exception as e:
+            print(f"연도별 요약 조회 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
+    def handle_rankings(self):
+        """/api/rankings/players|corporations|maps - 미리 집계해 둔 랭킹 표"""
+        try:
+            view = 'rankings-' + urlparse(self.path).path[len('/api/rankings/'):]
+            if view not in self.store.views:
+                self.send_json_error(404, "지원하지 않는 랭킹입니다")
+                return
+            if not self.send_versioned_json(view):
+                self.send_json(200, {'rankings': []})
+        except Exception as e:
+            print(f"랭킹 조회 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
+    def handle_ratings(self):
+        """GET /api/ratings - 게임 날짜 순으로 계산한 플레이어 Elo 레이팅 순위"""
+        try:
+            if not self.send_versioned_json('ratings'):
+                self.send_json(200, {'ratings': []})
+        except Exception as e:
+            print(f"레이팅 조회 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
+    def handle_rating_history(self):
+        """GET /api/ratings/<이름> - 플레이어의 게임별 레이팅 변화"""
+        try:
+            name = unquote(urlparse(self.path).path[len('/api/ratings/'):])
+            ratings = self.league.ratings
+            
+            def find_history(data):
+                if name not in ratings.ratings:
+                    return None
+                return {
+                    'name': name,
+                    'rating': round(ratings.ratings[name], 1),
+                    'history': ratings.history(name),
+                    'version': data.get('dataVersion', 0)
+                }
+            
+            response = self.store.query(find_history)
+            if response is None:
+                self.send_json_error(404, "레이팅 기록이 없는 플레이어입니다")
+                return
+            self.send_json(200, response)
+        except Exception as e:
+            print(f"레이팅 기록 조회 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
+    def handle_head_to_head(self):
+        """GET /api/head-to-head/<이름>[/<상대>] - 같은 테이블에서의 상대 전적 (상대를 빼면 모든 상대)"""
+        try:
+            parts = [unquote(part) for part in urlparse(self.path).path[len('/api/head-to-head/'):].split('/')]
+            if len(parts) > 2 or not all(parts):
+                self.send_json_error(404, "지원하지 않는 경로입니다")
+                return
+            matrix = self.league.head_to_head
+            
+            def find_record(data):
+                if len(parts) == 2:
+                    record = matrix.pair(parts[0], parts[1])
+                    if record is None:
+                        return None
+                    return dict(record, player=parts[0], version=data.get('dataVersion', 0))
+                rows = matrix.row(parts[0])
+                if rows is None:
+                    return None
+                return {'player': parts[0], 'opponents': rows, 'version': data.get('dataVersion', 0)}
+            
+            response = self.store.query(find_record)
+            if response is None:
+                self.send_json_error(404, "같이 한 게임이 없습니다")
+                return
+            self.send_json(200, response)
+        except Exception as e:
+            print(f"상대 전적 조회 중 오류: {e}")
+            self.send_json_error(500, str(e))
+    
     def handle_recalculate(self):
         """플레이어 통계 재계산"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 플레이어 통계 초기화
-                for player in data.get('players', []):
-                    player['games'] = []
-                    player['stats'] = {
-                        'totalGames': 0,
-                        'totalScore': 0,
-                        'averageScore': 0,
-                        'wins': 0,
-                        'seconds': 0,
-                        'thirds': 0,
-                        'fourths': 0
-                    }
-                
-                # 게임 데이터로부터 통계 재계산
-                for game in data.get('games', []):
-                    for result in game.get('results', []):
-                        # 플레이어 이름으로 찾기
-                        player = None
-                        for p in data['players']:
-                            if p['name'] == result['playerName']:
-                                player = p
-                                break
-                        
-                        if player:
-                            player['games'].append(result)
-                            player['stats']['totalGames'] += 1
-                            player['stats']['totalScore'] += result['score']
-                            
-                            # 순위별 카운트
-                            if result['rank'] == 1:
-                                player['stats']['wins'] += 1
-                            elif result['rank'] == 2:
-                                player['stats']['seconds'] += 1
-                            elif result['rank'] == 3:
-                                player['stats']['thirds'] += 1
-                            elif result['rank'] == 4:
-                                player['stats']['fourths'] += 1
-                
-                # 평균 점수 계산
-                for player in data['players']:
-                    if player['stats']['totalGames'] > 0:
-                        player['stats']['averageScore'] = round(
-                            player['stats']['totalScore'] / player['stats']['totalGames'], 1
-                        )
-                
-                # 업데이트된 데이터 저장
-                data['lastUpdated'] = datetime.now().isoformat()
-                with open(self.data_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
+            if self.store.get_data() is not None:
+                data, mismatches = self.store.rebuild_player_stats()
                 
                 response = {
                     'success': True,
                     'message': '통계 재계산 완료',
                     'players': len(data['players']),
-                    'games': len(data['games'])
+                    'games': len(data['games']),
+                    # 증분으로 유지하던 통계와 재계산 결과가 달랐던 플레이어 수 (정상이면 0)
+                    'mismatches': mismatches
                 }
-                self.wfile.write(json.dumps(response).encode('utf-8'))
-                print("플레이어 통계 재계산 완료")
+                self.send_json(200, response)
+                print(f"플레이어 통계 재계산 완료 (불일치 {mismatches}명)")
                 
             else:
                 self.send_error(404, "데이터 파일을 찾을 수 없습니다")
@@ -274,85 +818,180 @@ class SyncHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             print(f"통계 재계산 중 오류: {e}")
             self.send_error(500, str(e))
     
+    def read_date_range(self):
+        """?year=&from=&to= 를 날짜 서수 범위로 변환 (양끝 포함, 없으면 None)
+
+        잘못된 값이면 400 응답 후 None 반환. 성공하면 ((start, end), 쿼리 파라미터)
+        """
+        query_params = parse_qs(urlparse(self.path).query)
+        start = end = None
+        try:
+            if 'year' in query_params:
+                start, end = self.league.date_index.year_range(int(query_params['year'][0]))
+            if 'from' in query_params:
+                start = max(start or 0, parse_date_bound(query_params['from'][0]))
+            if 'to' in query_params:
+                bound = parse_date_bound(query_params['to'][0])
+                end = bound if end is None else min(end, bound)
+        except ValueError:
+            self.send_json_error(400, "year는 숫자, from/to는 YYYY-MM-DD 형식이어야 합니다")
+            return None
+        return (start, end), query_params
+    
+    def select_games(self, start, end):
+        """날짜 색인으로 범위 안의 게임을 날짜 순으로 조회. (데이터, 게임 목록) 또는 데이터가 없으면 None"""
+        return self.store.query(lambda data: (data, self.league.date_index.range(start, end)))
+    
     def handle_export(self):
-        """데이터를 games 디렉토리에 내보내기"""
+        """데이터를 games 디렉토리에 내보내기 (?year=&from=&to= 필터, ?gzip=1 이면 .json.gz)"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # 게임 날짜 범위 계산
-                games = data.get('games', [])
-                if not games:
-                    self.send_error(400, "내보낼 게임 데이터가 없습니다")
-                    return
-                
-                game_dates = [game['date'] for game in games]
-                game_dates.sort()
-                
-                # 날짜 형식 변환 (YYYYMMDD)
-                def format_date_for_filename(date_str):
-                    # "2019. 02. 22." 형식을 "20190222"로 변환
-                    import re
-                    numbers = re.findall(r'\d+', date_str)
-                    if len(numbers) >= 3:
-                        year = numbers[0].zfill(4)
-                        month = numbers[1].zfill(2)
-                        day = numbers[2].zfill(2)
-                        return f"{year}{month}{day}"
-                    return "unknown"
-                
-                first_date = format_date_for_filename(game_dates[0])
-                last_date = format_date_for_filename(game_dates[-1])
-                
-                date_range = first_date if len(games) == 1 else f"{first_date}-{last_date}"
-                
-                # 레거시 데이터 생성
-                legacy_data = {
-                    'players': data.get('players', []),
-                    'games': games,
-                    'exportDate': datetime.now().isoformat(),
-                    'version': '1.0',
-                    'description': '테라포밍 마스 레거시 데이터',
-                    'gameCount': len(games),
-                    'dateRange': {
-                        'start': game_dates[0],
-                        'end': game_dates[-1]
-                    }
-                }
-                
-                # games 디렉토리에 파일 저장
-                games_dir = os.path.join(self.data_dir, 'games')
-                os.makedirs(games_dir, exist_ok=True)
-                
-                filename = f"terraforming_mars_legacy_{date_range}.json"
-                export_path = os.path.join(games_dir, filename)
-                
-                with open(export_path, 'w', encoding='utf-8') as f:
-                    json.dump(legacy_data, f, ensure_ascii=False, indent=2)
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                
-                response = {
-                    'success': True,
-                    'message': f'데이터가 games 디렉토리에 저장되었습니다',
-                    'filename': filename,
-                    'path': export_path,
-                    'gameCount': len(games),
-                    'dateRange': date_range
-                }
-                self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8'))
-                print(f"레거시 데이터 내보내기 완료: {export_path}")
-                
-            else:
-                self.send_error(404, "데이터 파일을 찾을 수 없습니다")
+            parsed = self.read_date_range()
+            if parsed is None:
+                return
+            (start, end), query_params = parsed
+            
+            selected = self.select_games(start, end)
+            if selected is None:
+                self.send_json_error(404, "데이터 파일을 찾을 수 없습니다")
+                return
+            data, games = selected
+            
+            # 게임을 읽는 대로 파일에 써 나가므로 전체 내보내기 데이터를 메모리에 만들지 않음
+            compress = query_params.get('gzip', ['0'])[0] == '1'
+            export_path, summary = export_to_file(
+                os.path.join(self.league.data_dir, 'games'), data.get('players', []), games, compress)
+            if not summary.game_count:
+                os.remove(export_path)
+                self.send_json_error(400, "내보낼 게임 데이터가 없습니다")
+                return
+            
+            response = {
+                'success': True,
+                'message': f'데이터가 games 디렉토리에 저장되었습니다',
+                'filename': os.path.basename(export_path),
+                'path': export_path,
+                'gameCount': summary.game_count,
+                'dateRange': summary.file_date_range()
+            }
+            self.send_json(200, response)
+            print(f"레거시 데이터 내보내기 완료: {export_path}")
                 
         except Exception as e:
             print(f"데이터 내보내기 중 오류: {e}")
-            self.send_error(500, str(e))
+            self.send_json_error(500, str(e))
     
+    def handle_export_stream(self):
+        """/api/export/stream?format=ndjson|json - 게임을 읽는 대로 chunked 응답으로 전송"""
+        try:
+            parsed = self.read_date_range()
+            if parsed is None:
+                return
+            (start, end), query_params = parsed
+            output_format = query_params.get('format', ['ndjson'])[0]
+            if output_format not in ('ndjson', 'json'):
+                self.send_json_error(400, "format은 ndjson 또는 json 이어야 합니다")
+                return
+            
+            data, games = self.select_games(start, end) or ({'players': [], 'games': []}, [])
+            summary = ExportSummary()
+            if output_format == 'ndjson':
+                parts = iter_ndjson(games, summary)
+                content_type = 'application/x-ndjson'
+            else:
+                parts = iter_legacy_json(data.get('players', []), games, summary)
+                content_type = 'application/json'
+            
+            # 전체 길이를 미리 알 수 없으므로 HTTP/1.1 chunked 전송 (1.0 클라이언트는 연결 종료로 끝을 알림)
+            chunked = self.request_version == 'HTTP/1.1'
+            if chunked:
+                self.protocol_version = 'HTTP/1.1'
+            self.close_connection = True
+            encoding = 'gzip' if choose_encoding(self.headers.get('Accept-Encoding', '')) == 'gzip' else None
+            
+            self.send_response(200)
+            self.send_header('Content-type', f'{content_type}; charset=utf-8')
+            if chunked:
+                self.send_header('Transfer-Encoding', 'chunked')
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if encoding else None
+            for chunk in buffered(parts):
+                self.write_chunk(compressor.compress(chunk) if compressor else chunk, chunked)
+            if compressor:
+                self.write_chunk(compressor.flush(), chunked)
+            if chunked:
+                self.wfile.write(b'0\r\n\r\n')
+            print(f"스트리밍 내보내기 완료: 게임 {summary.game_count}개 ({output_format})")
+        except (BrokenPipeError, ConnectionResetError):
+            print("스트리밍 내보내기 중 클라이언트 연결이 끊어졌습니다")
+        except Exception as e:
+            print(f"스트리밍 내보내기 중 오류: {e}")
+    
+    def write_chunk(self, chunk, chunked):
+        if not chunk:
+            return
+        if chunked:
+            self.wfile.write(f'{len(chunk):X}\r\n'.encode('ascii') + chunk + b'\r\n')
+        else:
+            self.wfile.write(chunk)
+        self.response_bytes += len(chunk)
+    
+
+def route_label(path):
+    """지표용 경로 이름 (게임 id, 쿼리, 정적 파일 이름은 묶어서 종류 수를 제한)"""
+    path = urlparse(path).path
+    if path.startswith('/api/games/'):
+        return '/api/games/<id>'
+    if path.startswith('/api/players/'):
+        return '/api/players/<name>/games'
+    if path.startswith('/api/ratings/'):
+        return '/api/ratings/<name>'
+    if path.startswith('/api/head-to-head/'):
+        return '/api/head-to-head/<name>'
+    if path in API_ROUTES:
+        return path
+    if path.startswith('/api/'):
+        return '/api/other'
+    return 'static'
+
+
+def choose_encoding(accept_encoding):
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (gzip 우선, 없으면 None)"""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ('gzip', 'deflate'):
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def etag_matches(if_none_match, tag):
+    """If-None-Match 헤더에 같은 버전의 ETag(압축 방식은 무관)가 있는지 확인"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        candidate = candidate.strip('"')
+        if candidate in (tag, f'{tag}-gzip', f'{tag}-deflate'):
+            return True
+    return False
+
 
 def signal_handler(signum, frame):
     """Graceful shutdown을 위한 시그널 핸들러"""
@@ -360,8 +999,156 @@ def signal_handler(signum, frame):
     print("📝 서버를 안전하게 종료합니다...")
     sys.exit(0)
 
+def parse_args():
+    """명령행 옵션 파싱"""
+    parser = argparse.ArgumentParser(description='테라포밍 마스 동기화 서버')
+    parser.add_argument('--port', type=int, default=3010, help='서버 포트 (기본값: 3010)')
+    parser.add_argument('--mode', choices=['pool', 'single'], default='pool',
+                        help='pool: 워커 스레드 풀로 동시 처리, single: 요청을 하나씩 처리 (기존 방식)')
+    parser.add_argument('--workers', type=int, default=16, help='pool 모드의 워커 스레드 수 (기본값: 16)')
+    parser.add_argument('--keep-alive-timeout', type=int, default=15,
+                        help='pool 모드에서 keep-alive 연결이 다음 요청을 기다리는 최대 시간(초), 0이면 요청마다 연결 종료 (기본값: 15)')
+    parser.add_argument('--max-connections-per-client', type=int, default=8,
+                        help='pool 모드에서 클라이언트(IP)별 최대 연결 수, 넘으면 유휴 연결부터 닫음 (기본값: 8)')
+    parser.add_argument('--storage', choices=['json', 'sqlite', 'columnar'], default='json',
+                        help='저장 방식: json (game_data.json + 저널), sqlite, columnar (game_data.tfmc + 저널) (기본값: json)')
+    parser.add_argument('--db-file', default=DB_FILE, help=f'sqlite 저장 방식의 DB 파일 (기본값: {DB_FILE})')
+    parser.add_argument('--compact-interval', type=int, default=300,
+                        help='저널을 스냅샷으로 합치는 주기(초) (기본값: 300)')
+    parser.add_argument('--compact-threshold', type=int, default=500,
+                        help='저널이 이 건수를 넘으면 바로 스냅샷으로 합침 (기본값: 500)')
+    parser.add_argument('--max-loaded-leagues', type=int, default=32,
+                        help='기본 리그 외에 메모리에 올려 둘 리그(/api/<리그>/...) 수, 넘으면 가장 오래 안 쓴 리그부터 내림 (기본값: 32)')
+    parser.add_argument('--league-idle-timeout', type=int, default=600,
+                        help='이 시간(초) 동안 요청이 없던 리그는 메모리에서 내림 (기본값: 600)')
+    parser.add_argument('--commit-window-ms', type=int, default=10,
+                        help='동시에 들어온 저장 요청을 모아서 한 번에 기록할 대기 시간(ms), 0이면 대기 없음 (기본값: 10)')
+    parser.add_argument('--static-memory-limit', type=int, default=512,
+                        help='이 크기(KB) 이하의 정적 파일만 메모리에 캐시, 큰 파일은 sendfile로 전송 (기본값: 512)')
+    parser.add_argument('--backup-keep-recent', type=int, default=10, help='항상 남길 최근 백업 수 (기본값: 10)')
+    parser.add_argument('--backup-keep-hourly', type=int, default=24, help='시간별로 남길 백업 수 (기본값: 24)')
+    parser.add_argument('--backup-keep-daily', type=int, default=14, help='일별로 남길 백업 수 (기본값: 14)')
+    parser.add_argument('--backup-keep-weekly', type=int, default=8, help='주별로 남길 백업 수 (기본값: 8)')
+    return parser.parse_args()
+
+def create_server(args):
+    """옵션에 맞는 서버 인스턴스 생성"""
+    if args.mode == 'single':
+        httpd = ReusableTCPServer(("0.0.0.0", args.port), SyncHTTPRequestHandler)
+    else:
+        httpd = ThreadPoolTCPServer(
+            ("0.0.0.0", args.port), SyncHTTPRequestHandler,
+            workers=max(1, args.workers),
+            keep_alive_timeout=max(0, args.keep_alive_timeout),
+            max_connections_per_client=max(1, args.max_connections_per_client)
+        )
+    
+    os.makedirs(DATA_DIR, exist_ok=True)
+    
+    # 정적 파일(index.html, script/*.js 등)은 시작할 때 읽어서 해시/압축해 둠
+    httpd.static_assets = StaticAssetCache(os.getcwd(), max_memory_size=args.static_memory_limit * 1024)
+    print(f"📦 정적 파일 {httpd.static_assets.preload()}개를 캐시했습니다")
+    
+    # /api/events 구독자에게 저장 완료를 푸시 (리그별 채널로 구분)
+    httpd.events = SyncEventBroadcaster()
+    
+    # 리그별 데이터셋 캐시: 기본 리그(/api/...)는 항상 올려 두고, 나머지 리그는 처음 요청될 때 불러옴
+    httpd.leagues = LeagueRegistry(
+        lambda name: create_league(args, name, httpd.events),
+        exists=lambda name: os.path.isdir(os.path.join(LEAGUES_DIR, name)),
+        max_loaded=max(1, args.max_loaded_leagues),
+        idle_timeout=max(1, args.league_idle_timeout),
+        compact_interval=args.compact_interval
+    )
+    httpd.leagues.start()
+    httpd.store = httpd.leagues.default.store
+    
+    # /api/metrics에서 함께 보여 줄 현재 상태 (데이터 관련 값은 기본 리그 기준)
+    METRICS.add_gauge('sync_data_version', '현재 데이터 버전', httpd.store.get_version)
+    METRICS.add_gauge('sync_games', '저장된 게임 수',
+                      lambda: httpd.store.query(lambda data: len(data.get('games', []))) or 0)
+    METRICS.add_gauge('sync_loaded_leagues', '메모리에 올라와 있는 리그 수 (기본 리그 제외)', httpd.leagues.loaded_count)
+    if getattr(httpd, 'idle_connections', None) is not None:
+        METRICS.add_gauge('sync_idle_connections', '다음 요청을 기다리는 keep-alive 연결 수',
+                          httpd.idle_connections.idle_count)
+    METRICS.add_gauge('sync_event_subscribers', '/api/events 구독자 수', lambda: httpd.events.subscriber_count)
+    return httpd
+
+def create_backend(args, name, data_dir):
+    """리그의 저장 방식에 맞는 backend (기본 리그는 기존 경로와 --db-file 사용)"""
+    data_file = os.path.join(data_dir, os.path.basename(DATA_FILE))
+    if args.storage == 'sqlite':
+        from sqlite_store import SqliteBackend
+        db_file = args.db_file if name == DEFAULT_LEAGUE else os.path.join(data_dir, os.path.basename(DB_FILE))
+        backend = SqliteBackend(db_file)
+        if backend.change_key() is None and os.path.exists(data_file):
+            print(f"⚠️  SQLite DB가 비어 있습니다. 기존 데이터를 옮기려면: python3 sqlite_store.py migrate --db {db_file}")
+    elif args.storage == 'columnar':
+        from columnar_store import ColumnarFileBackend
+        columnar_file = os.path.join(data_dir, os.path.basename(COLUMNAR_FILE))
+        backend = ColumnarFileBackend(columnar_file)
+        if backend.change_key() is None and os.path.exists(data_file):
+            print(f"⚠️  컬럼형 스냅샷이 없습니다. 기존 데이터를 옮기려면: python3 columnar_store.py build {data_file} -o {columnar_file}")
+    else:
+        backend = JsonFileBackend(data_file)
+    return backend
+
+def create_league(args, name, events):
+    """리그 하나의 저장소, 색인, 랭킹, 백업, 변경 알림 구성 (기본 리그는 data/, 나머지는 data/leagues/<리그>/)"""
+    data_dir = DATA_DIR if name == DEFAULT_LEAGUE else os.path.join(LEAGUES_DIR, name)
+    os.makedirs(data_dir, exist_ok=True)
+    league = League(name, data_dir)
+    
+    # 저널 압축은 LeagueRegistry가 주기적으로 실행
+    store = league.store = GameStore(create_backend(args, name, data_dir), compact_threshold=args.compact_threshold,
+                                     commit_window=max(0, args.commit_window_ms) / 1000)
+    
+    # 전체 저장으로 스냅샷을 덮어쓰기 전에 이전 데이터 백업 (압축/중복 제거는 백그라운드 스레드에서)
+    league.backups = BackupStore(
+        os.path.join(data_dir, 'backups'),
+        keep_recent=args.backup_keep_recent,
+        keep_hourly=args.backup_keep_hourly,
+        keep_daily=args.backup_keep_daily,
+        keep_weekly=args.backup_keep_weekly
+    )
+    league.backups.start()
+    store.add_commit_hook(league.backups.submit)
+    
+    # 게임 날짜 색인 (범위 조회, 연도별 요약, 내보내기 범위)
+    date_index = league.date_index = DateIndex()
+    store.add_index(date_index)
+    store.add_view('years', date_index.year_summaries)
+    # player.games를 읽는 예전 클라이언트용 응답 (요청이 있을 때 버전마다 한 번만 만듦)
+    store.add_view('data-player-games',
+                   lambda data: expand_player_games(data, date_index.games), versioned=False)
+    
+    # 게임이 저장될 때마다 증분 갱신되는 랭킹 집계
+    rankings = RankingIndex()
+    store.add_index(rankings)
+    store.add_view('rankings-players', player_rankings)
+    store.add_view('rankings-corporations', rankings.corporation_rankings)
+    store.add_view('rankings-maps', rankings.map_rankings)
+    
+    # 게임 날짜 순 Elo 레이팅 (최근 게임 추가는 증분, 과거 게임 변경은 체크포인트부터 다시 계산)
+    ratings = league.ratings = RatingIndex()
+    store.add_index(ratings)
+    store.add_view('ratings', ratings.leaderboard)
+    
+    # 플레이어 id x id 상대 전적 행렬 (게임 단위 증분 갱신)
+    league.head_to_head = HeadToHeadIndex()
+    store.add_index(league.head_to_head)
+    
+    store.add_listener(
+        lambda data: events.publish('sync', {
+            'lastUpdated': data.get('lastUpdated', ''),
+            'version': data.get('dataVersion', 0)
+        }, name)
+    )
+    return league
+
 if __name__ == "__main__":
-    PORT = 3010
+    args = parse_args()
+    PORT = args.port
     
     # 시그널 핸들러 등록 (Ctrl+C, 종료 시그널 처리)
     signal.signal(signal.SIGINT, signal_handler)
@@ -369,15 +1156,26 @@ if __name__ == "__main__":
     
     try:
         # 포트 재사용이 가능한 서버 사용
-        with ReusableTCPServer(("0.0.0.0", PORT), SyncHTTPRequestHandler) as httpd:
+        with create_server(args) as httpd:
             print(f"🚀 테라포밍 마스 동기화 서버가 시작되었습니다!")
             print(f"📱 로컬 접속: http://localhost:{PORT}")
             print(f"🌐 네트워크 접속: http://172.30.1.30:{PORT}")
             print(f"⚡ 실시간 동기화 활성화됨")
             print(f"🔄 포트 재사용 활성화됨")
+            if args.mode == 'pool':
+                print(f"🧵 동시 처리 모드: 워커 {httpd.workers}개")
+                if httpd.idle_connections is not None:
+                    print(f"🔗 keep-alive: 유휴 {args.keep_alive_timeout}초, 클라이언트당 연결 {httpd.max_connections_per_client}개")
+            else:
+                print(f"🧵 단일 처리 모드")
+            print(f"💾 저장 방식: {httpd.store.backend.name}")
             print(f"💡 서버 종료: Ctrl+C")
             
-            httpd.serve_forever()
+            try:
+                httpd.serve_forever()
+            finally:
+                # 대기 중인 백업을 마저 기록
+                httpd.leagues.close()
             
     except OSError as e:
         if e.errno == 48:  # Address already in use
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분 갱신 결과가 전체 재계산/다시 읽기와 같은지 확인하는 테스트
+
+저장 방식(json, sqlite, columnar)마다 무작위 게임 추가/수정/삭제와 가끔의 전체 저장,
+저널 압축을 GameStore로 실행한 뒤 다음을 비교한다.
+- 플레이어 통계와 gameIds: PlayerStatsAggregator.rebuild
+- DateIndex, RankingIndex, RatingIndex, HeadToHeadIndex: 같은 데이터로 새로 만든 색인
+- 메모리의 데이터: 같은 파일을 새 GameStore로 다시 읽은 데이터 (스냅샷 + 저널 복원)
+
+    python3 -m unittest discover tests
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar_store import ColumnarFileBackend
+from date_index import DateIndex, decode_cursor
+from game_store import GameStore, JsonFileBackend
+from head_to_head import HeadToHeadIndex
+from player_stats import PlayerStatsAggregator
+from rankings import RankingIndex
+from ratings import RatingIndex
+from sqlite_store import SqliteBackend
+
+PLAYERS = ['강보석', '김기훈', '이연로', '박서준', '최민지', '정하늘']
+MAPS = ['THARSIS', 'HELLAS', 'ELYSIUM']
+CORPORATIONS = ['CREDICOR', 'ECOLINE', 'HELION', 'INVENTRIX', 'THORGATE', 'NONE']
+
+BACKENDS = {
+    'json': lambda work_dir: JsonFileBackend(os.path.join(work_dir, 'game_data.json')),
+    'sqlite': lambda work_dir: SqliteBackend(os.path.join(work_dir, 'game_data.sqlite3')),
+    'columnar': lambda work_dir: ColumnarFileBackend(os.path.join(work_dir, 'game_data.tfmc'))
+}
+
+
+def make_game(rng, game_id=None):
+    """2~4인 게임 한 건 (점수 순으로 순위 지정, 날짜는 일부러 몇 개 안 되게 겹치도록)"""
+    names = rng.sample(PLAYERS, rng.randint(2, 4))
+    results = [
+        {
+            'playerName': name,
+            'corporation': rng.choice(CORPORATIONS),
+            'score': rng.randint(50, 120),
+            'megacredits': rng.randint(0, 30)
+        }
+        for name in names
+    ]
+    results.sort(key=lambda result: (result['score'], result['megacredits']), reverse=True)
+    for rank, result in enumerate(results, 1):
+        result['rank'] = rank
+    game = {
+        'date': f'{rng.choice([2021, 2022])}-{rng.randint(1, 12):02d}-{rng.randint(1, 3):02d}',
+        'map': rng.choice(MAPS),
+        'results': results
+    }
+    if game_id is not None:
+        game['id'] = game_id
+    return game
+
+
+def make_dataset(rng, game_count):
+    data = {
+        'players': [{'id': i + 1, 'name': name} for i, name in enumerate(PLAYERS)],
+        'games': [make_game(rng, i + 1) for i in range(game_count)]
+    }
+    return PlayerStatsAggregator().rebuild(data)
+
+
+def create_indexes():
+    return {
+        'dates': DateIndex(),
+        'rankings': RankingIndex(),
+        # 체크포인트를 자주 만들어서 중간부터 다시 계산하는 경로도 거치게 함
+        'ratings': RatingIndex(checkpoint_interval=7),
+        'head_to_head': HeadToHeadIndex()
+    }
+
+
+def snapshot_indexes(indexes, data):
+    """색인의 조회 결과 (증분 색인과 새로 만든 색인 비교용)"""
+    dates = indexes['dates']
+    rankings = indexes['rankings']
+    ratings = indexes['ratings']
+    head_to_head = indexes['head_to_head']
+    pages = []
+    cursor = None
+    while True:
+        games, cursor = dates.page(cursor=cursor and decode_cursor(cursor), limit=7)
+        pages.append([game.get('id') for game in games])
+        if cursor is None:
+            break
+    return {
+        'range': [game.get('id') for game in dates.range()],
+        'pages': pages,
+        'player_page': [game.get('id') for game in dates.page(filters=[('player', PLAYERS[0])], limit=50)[0]],
+        'years': dates.year_summaries(),
+        'corporations': rankings.corporation_rankings(data),
+        'maps': rankings.map_rankings(data),
+        'ratings': ratings.leaderboard(),
+        'rating_history': {name: ratings.history(name) for name in PLAYERS},
+        'head_to_head': {name: head_to_head.row(name) for name in PLAYERS}
+    }
+
+
+class IncrementalStoreTest(unittest.TestCase):
+    """무작위 변경 후 증분 상태 == 전체 재계산 == 다시 읽은 상태"""
+
+    operations = 150
+
+    def make_work_dir(self):
+        work_dir = tempfile.mkdtemp(prefix='tfm-test-')
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        return work_dir
+
+    def open_store(self, storage, work_dir, indexes=None):
+        store = GameStore(BACKENDS[storage](work_dir), compact_threshold=40, commit_window=0)
+        for index in (indexes or {}).values():
+            store.add_index(index)
+        return store
+
+    def run_random_changes(self, storage, work_dir, seed):
+        rng = random.Random(seed)
+        indexes = create_indexes()
+        store = self.open_store(storage, work_dir, indexes)
+        store.save(make_dataset(rng, 30))
+        # 색인을 현재 데이터에 맞춰 두어야 이후 변경이 증분으로 반영됨
+        store.query(lambda data: None)
+
+        for _ in range(self.operations):
+            game_ids = [game['id'] for game in store.get_data()['games']]
+            choice = rng.random()
+            if choice < 0.4 or not game_ids:
+                store.apply_game_change('add', None, make_game(rng))
+            elif choice < 0.7:
+                store.apply_game_change('update', rng.choice(game_ids), make_game(rng))
+            elif choice < 0.92:
+                store.apply_game_change('delete', rng.choice(game_ids))
+            elif choice < 0.96:
+                store.compact()
+            else:
+                # 전체 저장 (클라이언트처럼 통계를 다시 계산해서 보냄): 색인은 다음 조회 때 전체 재구성
+                data = store.get_data()
+                games = data['games'] + [make_game(rng, max(game_ids) + 1)]
+                store.save(PlayerStatsAggregator().rebuild(dict(data, games=games)))
+            store.query(lambda data: None)
+        return store, indexes
+
+    def check_store(self, storage, seed):
+        work_dir = self.make_work_dir()
+        store, indexes = self.run_random_changes(storage, work_dir, seed)
+        live = store.query(lambda data: data)
+
+        # 플레이어 통계와 gameIds
+        rebuilt = PlayerStatsAggregator().rebuild(live)
+        self.assertEqual(live['players'], rebuilt['players'])
+
+        # 색인
+        fresh = create_indexes()
+        for index in fresh.values():
+            index.rebuild(live)
+        self.assertEqual(snapshot_indexes(indexes, live), snapshot_indexes(fresh, live))
+
+        # 스냅샷 + 저널을 다시 읽은 결과 (GameStore.close는 저널을 압축하므로 연결만 닫음)
+        close = getattr(store.backend, 'close', None)
+        if close is not None:
+            close()
+        reloaded_store = self.open_store(storage, work_dir)
+        reloaded = reloaded_store.get_data()
+        reloaded_store.close()
+        self.assertEqual(reloaded['games'], live['games'])
+        self.assertEqual(reloaded['players'], live['players'])
+        self.assertEqual(reloaded['dataVersion'], live['dataVersion'])
+
+    def test_json_backend(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                self.check_store('json', seed)
+
+    def test_sqlite_backend(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                self.check_store('sqlite', seed)
+
+    def test_columnar_backend(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                self.check_store('columnar', seed)
+
+    def test_failed_write_keeps_previous_state(self):
+        """저널 기록에 실패하면 버전, 변경 로그, 색인, 캐시가 그대로여야 함"""
+        rng = random.Random(7)
+        indexes = create_indexes()
+        store = self.open_store('json', self.make_work_dir(), indexes)
+        store.save(make_dataset(rng, 10))
+        store.apply_game_change('add', None, make_game(rng))
+        before = store.query(lambda data: data)
+        before_indexes = snapshot_indexes(indexes, before)
+        version = store.get_version()
+        change_log = list(store.change_log)
+
+        def fail(entry, players=()):
+            raise OSError('disk full')
+
+        store.backend.append_change = fail
+        with self.assertRaises(OSError):
+            store.apply_game_change('delete', before['games'][0]['id'])
+
+        self.assertEqual(store.get_version(), version)
+        self.assertEqual(list(store.change_log), change_log)
+        self.assertIs(store.query(lambda data: data), before)
+        self.assertEqual(snapshot_indexes(indexes, before), before_indexes)
+
+
+class GamesWithoutIdTest(unittest.TestCase):
+    """id가 없는 예전 게임도 수정/삭제 후 색인에 남지 않아야 함"""
+
+    def test_indexes_forget_games_without_id(self):
+        rng = random.Random(3)
+        games = [make_game(rng, i + 1 if i % 2 else None) for i in range(40)]
+        indexes = create_indexes()
+        for index in indexes.values():
+            index.rebuild({'games': games})
+
+        for step in range(30):
+            position = rng.randrange(len(games))
+            old_game = games[position]
+            if step % 2:
+                new_game = make_game(rng, 1000 + step)
+                games[position] = new_game
+            else:
+                new_game = None
+                del games[position]
+            for index in indexes.values():
+                index.apply_game(old_game, new_game)
+
+        data = {'games': games}
+        fresh = create_indexes()
+        for index in fresh.values():
+            index.rebuild(data)
+        self.assertEqual(len(indexes['dates'].entries), len(games))
+        self.assertEqual(snapshot_indexes(indexes, data), snapshot_indexes(fresh, data))
+
+
+if __name__ == '__main__':
+    unittest.main()